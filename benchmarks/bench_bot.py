@@ -0,0 +1,323 @@
+"""
+Offline benchmark for the bot's hot paths.
+
+Drives ``on_message`` (including ticket DMs and keyword auto-responses),
+``on_member_join`` (with and without raid mode), ``AnnouncementModal.on_submit``,
+``/reply-in-channel`` and ``check_social_updates`` against the fake Discord layer in ``fake_discord`` and
+the local platform stubs in ``stubs``. No Discord token, YouTube key or
+internet access is needed.
+
+    python benchmarks/bench_bot.py --guilds 20 --trackers 10 --iterations 200
+    python benchmarks/bench_bot.py --json results.json   # keep for release comparisons
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name, samples, wall):
+    return {
+        "name": name,
+        "count": len(samples),
+        "throughput_per_s": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+    }
+
+
+async def timed(samples, coro):
+    started = time.perf_counter()
+    await coro
+    samples.append(time.perf_counter() - started)
+
+
+async def bench_on_message(main, fake, iterations, concurrency):
+    results = []
+    for label, factory in (
+        ("on_message (DM auto-reply)", lambda i: fake.dm_message(f"help {i}")),
+        ("on_message (guild chat)", lambda i: fake.guild_message(fake.guilds[i % len(fake.guilds)], f"gg {i}")),
+    ):
+        samples = []
+        started = time.perf_counter()
+        for offset in range(0, iterations, concurrency):
+            batch = [factory(i) for i in range(offset, min(iterations, offset + concurrency))]
+            await asyncio.gather(*(timed(samples, main.on_message(message)) for message in batch))
+        results.append(summarize(label, samples, time.perf_counter() - started))
+    return results
+
+
+async def bench_auto_responses(main, fake, iterations, concurrency, triggers=500):
+    """Guild chat matched against hundreds of triggers per guild; one message in ten hits one"""
+    import random
+
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12))) for _ in range(triggers)]
+    main.auto_responses.replace({
+        str(guild.id): [
+            {"id": index + 1, "trigger": word, "response": f"Answer {index}", "cooldown": 0}
+            for index, word in enumerate(words)
+        ]
+        for guild in fake.guilds
+    })
+    samples = []
+    started = time.perf_counter()
+    for offset in range(0, iterations, concurrency):
+        messages = []
+        for i in range(offset, min(iterations, offset + concurrency)):
+            content = "hey does anyone know when the next scrim starts tonight"
+            if i % 10 == 0:
+                content += f" {words[i % triggers]}?"
+            messages.append(fake.guild_message(fake.guilds[i % len(fake.guilds)], content))
+        await asyncio.gather(*(timed(samples, main.on_message(message)) for message in messages))
+    results = [summarize(f"on_message (guild chat, {triggers} triggers)", samples, time.perf_counter() - started)]
+    main.auto_responses.replace({})
+    return results
+
+
+async def bench_member_join(main, fake, iterations, concurrency):
+    results = []
+    # A threshold above the join count keeps every guild out of raid mode for the first run
+    for label, threshold in (("on_member_join (welcome + DM)", iterations + 1), ("on_member_join (raid mode, batched)", 2)):
+        main.join_monitor.guilds.clear()
+        main.guild_configs.replace({
+            str(guild.id): {
+                "welcome_channel": guild.text_channels[0].id,
+                "welcome_dm": "Welcome to the benchmark server!",
+                "raid_threshold": threshold,
+            }
+            for guild in fake.guilds
+        })
+        samples = []
+        started = time.perf_counter()
+        for offset in range(0, iterations, concurrency):
+            members = [
+                fake.member(fake.guilds[i % len(fake.guilds)], created_days_ago=30)
+                for i in range(offset, min(iterations, offset + concurrency))
+            ]
+            await asyncio.gather(*(timed(samples, main.on_member_join(member)) for member in members))
+        results.append(summarize(label, samples, time.perf_counter() - started))
+
+    # Let raid mode flush its batched welcomes and wind down
+    main.RAID_BATCH_INTERVAL = 0.01
+    main.RAID_COOLDOWN = 0
+    for joins in main.join_monitor.guilds.values():
+        joins.rate = main.JoinRate(main.RAID_WINDOW)
+    while any(joins.task for joins in main.join_monitor.guilds.values()):
+        await asyncio.sleep(0.01)
+    return results
+
+
+async def bench_announcements(main, fake, iterations, concurrency):
+    results = []
+    for label, with_attachment in (("AnnouncementModal (text)", False), ("AnnouncementModal (attachment)", True)):
+        samples = []
+        started = time.perf_counter()
+        for offset in range(0, iterations, concurrency):
+            submissions = []
+            for i in range(offset, min(iterations, offset + concurrency)):
+                guild = fake.guilds[i % len(fake.guilds)]
+                attachment = fake.attachment() if with_attachment else None
+                modal = main.AnnouncementModal(guild.text_channels[-1], False, False, attachment)
+                modal.message._value = f"Check-in for round {i} opens now."
+                submissions.append(modal.on_submit(fake.interaction(guild)))
+            await asyncio.gather(*(timed(samples, submission) for submission in submissions))
+        results.append(summarize(label, samples, time.perf_counter() - started))
+    return results
+
+
+async def bench_reply_in_channel(main, fake, iterations, concurrency):
+    results = []
+    for label, seen in (("reply-in-channel (cached reference)", True), ("reply-in-channel (fetched reference)", False)):
+        samples = []
+        started = time.perf_counter()
+        for offset in range(0, iterations, concurrency):
+            replies = []
+            for i in range(offset, min(iterations, offset + concurrency)):
+                guild = fake.guilds[i % len(fake.guilds)]
+                message = fake.guild_message(guild, f"need help {i}")
+                if seen:
+                    # The gateway delivered it, so the reference cache knows it
+                    await main.on_message(message)
+                interaction = fake.interaction(guild, member=fake.owner(guild))
+                replies.append(main.reply_in_channel.callback(interaction, interaction.user, "On it!", str(message.id)))
+            await asyncio.gather(*(timed(samples, reply) for reply in replies))
+        results.append(summarize(label, samples, time.perf_counter() - started))
+    return results
+
+
+async def bench_tickets(main, fake, iterations, concurrency, burst=4):
+    """Bursts of DMs from many users, relayed into ticket threads in batches"""
+    import dataclasses
+
+    guild = fake.guilds[0]
+    main.guild_configs.swap(
+        str(guild.id),
+        lambda config: dataclasses.replace(config, ticket_channel=guild.text_channels[-1].id),
+        default=main.GuildConfig(),
+    )
+    main.ticket_relay.window = 0.05
+    relayed_before = main.ticket_relay.relayed
+    users = [fake.member(guild).id for _ in range(max(1, iterations // burst))]
+    total = len(users) * burst
+
+    samples = []
+    started = time.perf_counter()
+    for round_index in range(burst):
+        for offset in range(0, len(users), concurrency):
+            messages = [fake.dm_message(f"help {round_index}", author_id=user_id) for user_id in users[offset:offset + concurrency]]
+            await asyncio.gather(*(timed(samples, main.on_message(message)) for message in messages))
+    while main.ticket_relay.relayed - relayed_before < total:
+        await asyncio.sleep(0.001)
+    wall = time.perf_counter() - started
+    return [
+        summarize(f"on_message (ticket DM, bursts of {burst})", samples, wall),
+        {"name": f"  relayed into {len(users)} ticket threads", "count": total, "throughput_per_s": total / wall,
+         "p50_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0},
+    ]
+
+
+async def bench_social_sweep(main, fake, stub, trackers_per_guild, sweeps, production_limits=False):
+    main.youtube_quota.configure(["benchmark"], api_endpoint=stub.base_url)
+    main.PLATFORM_PROVIDERS["instagram"].base_url = stub.base_url
+    if not production_limits:
+        # Measure the sweep engine itself rather than the per-platform politeness limits
+        main.SOCIAL_CHECK_INTERVAL = 0
+        main.youtube_quota.daily_quota = 10 ** 9
+        for provider in main.PLATFORM_PROVIDERS.values():
+            provider.cache_ttl = 0
+            provider.limiter = main.RateLimiter(10_000, 10_000)
+    all_trackers = {}
+    for guild_index, guild in enumerate(fake.guilds):
+        trackers = []
+        for index in range(trackers_per_guild):
+            post_channel = str(guild.text_channels[index % len(guild.text_channels)].id)
+            if index % 2 == 0:
+                channel_id = f"UCbench{guild_index}x{index}"
+                trackers.append({
+                    "platform": "youtube",
+                    "url": f"https://www.youtube.com/channel/{channel_id}",
+                    "channel_id": channel_id,
+                    "account_name": channel_id,
+                    "last_count": 0,
+                    "post_channel": post_channel,
+                })
+            else:
+                username = f"bench{guild_index}x{index}"
+                trackers.append({
+                    "platform": "instagram",
+                    "url": f"https://www.instagram.com/{username}/",
+                    "account_name": username,
+                    "last_count": 0,
+                    "post_channel": post_channel,
+                })
+        all_trackers[str(guild.id)] = trackers
+    main.social_trackers.replace(all_trackers)
+
+    total = len(fake.guilds) * trackers_per_guild
+    samples = []
+    started = time.perf_counter()
+    for _ in range(sweeps):
+        await timed(samples, main.check_social_updates())
+    wall = time.perf_counter() - started
+    sweep = summarize(f"check_social_updates ({total} trackers/sweep)", samples, wall)
+    sweep["trackers_per_s"] = total * len(samples) / wall if wall else 0.0
+    return [sweep]
+
+
+def print_report(meta, results):
+    print(
+        f"\nNexus bot benchmark  python={meta['python']}  guilds={meta['guilds']}  "
+        f"trackers/guild={meta['trackers']}  discord_rtt={meta['latency_ms']}ms"
+    )
+    header = f"{'scenario':<48} {'n':>6} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['name']:<48} {row['count']:>6} {row['throughput_per_s']:>10.1f} {row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+        if "trackers_per_s" in row:
+            print(f"{'  trackers checked per second':<48} {'':>6} {row['trackers_per_s']:>10.1f}")
+
+
+async def run(args):
+    from fake_discord import FakeDiscord
+    from stubs import PlatformStub
+
+    import main
+
+    fake = FakeDiscord(main.bot, latency=args.latency / 1000).install()
+    if not args.production_limits:
+        # Without real 429s there is nothing to pace against; measure handler cost instead
+        main.send_queue = main.MessageQueue(channel_rate=10_000, channel_burst=10_000, global_rate=10_000)
+    for _ in range(args.guilds):
+        fake.add_guild(channels=3)
+
+    results = []
+    results += await bench_on_message(main, fake, args.iterations, args.concurrency)
+    results += await bench_auto_responses(main, fake, args.iterations, args.concurrency)
+    results += await bench_member_join(main, fake, args.iterations, args.concurrency)
+    results += await bench_announcements(main, fake, args.iterations, args.concurrency)
+    results += await bench_reply_in_channel(main, fake, args.iterations, args.concurrency)
+    results += await bench_tickets(main, fake, args.iterations, args.concurrency)
+    with PlatformStub() as stub:
+        results += await bench_social_sweep(main, fake, stub, args.trackers, args.sweeps, args.production_limits)
+    for name, samples in sorted(main.handler_timings.items()):
+        results.append(summarize(f"first response: {name}", list(samples), 0))
+    results.append({"name": "discord REST calls", "count": sum(fake.http.calls.values()), "throughput_per_s": 0.0,
+                    "p50_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0})
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=10, help="number of fake guilds (N)")
+    parser.add_argument("--trackers", type=int, default=10, help="social trackers per guild (M)")
+    parser.add_argument("--iterations", type=int, default=200, help="events per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="events dispatched at once")
+    parser.add_argument("--sweeps", type=int, default=3, help="tracker sweeps to time")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Discord round trip in ms")
+    parser.add_argument("--production-limits", action="store_true",
+                        help="keep send pacing, provider rate limits and count caching")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args()
+
+    # The bot reads and writes its JSON state in the working directory
+    workdir = tempfile.mkdtemp(prefix="nexus-bench-")
+    os.chdir(workdir)
+    os.environ.pop("YOUTUBE_API_KEY", None)
+    os.environ.pop("YOUTUBE_API_KEYS", None)
+
+    results = asyncio.run(run(args))
+    meta = {
+        "python": platform.python_version(),
+        "guilds": args.guilds,
+        "trackers": args.trackers,
+        "latency_ms": args.latency,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    print_report(meta, results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
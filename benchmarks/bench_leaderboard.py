@@ -0,0 +1,75 @@
+"""
+Leaderboard cost in a large guild: counting a point, answering /leaderboard
+and /rank from the incrementally sorted counter versus sorting every member
+per request, and one batched save of the changed counts.
+
+    python benchmarks/bench_leaderboard.py --members 100000 --events 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=200_000, help="points counted between saves")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="nexus-activity-"))
+    rng = random.Random(args.seed)
+
+    import main
+
+    stored = {str(index): [rng.randint(0, 5000), rng.randint(0, 20000)] for index in range(args.members)}
+    main.activity_store.replace({"1": stored})
+    main.activity_store.flush()
+    tracker = main.ActivityTracker(main.activity_store)
+    started = time.perf_counter()
+    guild = tracker.guild("1")
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Chat is skewed towards a few regulars
+    users = [str(int(rng.paretovariate(1.2)) % (args.members * 2)) for _ in range(args.events)]
+    started = time.perf_counter()
+    for user_id in users:
+        guild.messages[user_id] = guild.messages.get(user_id, 0) + 1
+        guild.dirty.add(user_id)
+        guild.points.increment(user_id)
+    increment_us = (time.perf_counter() - started) / len(users) * 1e6
+
+    points = guild.points
+    sample = users[:1000]
+    rows = [
+        ("count a point", increment_us),
+        ("top 10 (sorted counter)", timed(lambda: points.top(10), 1000)),
+        ("top 10 (sort per request)", timed(lambda: sorted(points.scores.items(), key=lambda item: -item[1])[:10], 5)),
+        ("rank (sorted counter)", timed(lambda: [points.rank(user_id) for user_id in sample], 10) / len(sample)),
+        ("rank (scan per request)", timed(lambda: sum(1 for score in points.scores.values() if score > 2500), 5)),
+    ]
+    dirty = len(guild.dirty)
+    started = time.perf_counter()
+    tracker.flush()
+    flush_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{len(points):,} members loaded in {build_ms:.0f} ms")
+    print(f"{'operation':<28} {'µs':>12}")
+    for label, micros in rows:
+        print(f"{label:<28} {micros:>12.2f}")
+    print(f"batched save of {dirty:,} changed members: {flush_ms:.0f} ms on the loop")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,70 @@
+"""
+Link filter cost against a large blocklist: how long the lists take to load
+and how long one message takes to scan, for clean chat, messages with
+allowed links and messages with blocked links.
+
+    python benchmarks/bench_link_filter.py --domains 200000 --messages 20000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_domain(rng):
+    labels = rng.randint(1, 3)
+    name = ".".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12))) for _ in range(labels))
+    return f"{name}.{rng.choice(('com', 'net', 'ru', 'xyz', 'gift', 'io'))}"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", type=int, default=200_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="nexus-links-"))
+    rng = random.Random(args.seed)
+
+    blocked = [random_domain(rng) for _ in range(args.domains)]
+    with open("link_blocklist.txt", "w") as f:
+        # Mixed formats, as merged community lists usually are
+        for index, domain in enumerate(blocked):
+            f.write(("0.0.0.0 {}\n", "||{}^\n", "{}\n")[index % 3].format(domain))
+    with open("link_allowlist.txt", "w") as f:
+        f.write("safe.gift\n")
+
+    import main
+
+    link_filter = main.LinkFilter("link_blocklist.txt", "link_allowlist.txt")
+    started = time.perf_counter()
+    link_filter.load()
+    load_ms = (time.perf_counter() - started) * 1000
+
+    words = "hey did anyone see the stream last night it was great lol".split()
+    samples = {
+        "no links": lambda: " ".join(rng.choices(words, k=12)),
+        "allowed links": lambda: (
+            f"{' '.join(rng.choices(words, k=6))} https://www.youtube.com/watch?v=abc "
+            f"and cdn.safe.gift/{rng.randint(0, 999)}"
+        ),
+        "blocked links": lambda: f"free nitro at https://claim.{rng.choice(blocked)}/login now",
+    }
+
+    print(f"{len(link_filter.lists[0]):,} blocked domains loaded in {load_ms:.0f} ms")
+    print(f"{'messages':<14} {'µs/message':>11} {'removed':>8}")
+    for label, build in samples.items():
+        messages = [build() for _ in range(args.messages)]
+        started = time.perf_counter()
+        removed = sum(1 for content in messages if link_filter.scan(content)[0])
+        elapsed = time.perf_counter() - started
+        print(f"{label:<14} {elapsed / len(messages) * 1e6:>11.2f} {removed:>8}")
+
+
+if __name__ == "__main__":
+    main_cli()
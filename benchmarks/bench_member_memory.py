@@ -0,0 +1,102 @@
+"""
+Resident memory per 10k guild members with MEMORY_OPTIMIZED off and on.
+
+Each mode runs in a fresh interpreter. The default mode receives the members
+the way startup chunking delivers them (cached); the optimised mode receives
+the same members as GUILD_MEMBER_ADD events, which it dispatches to
+on_member_join but does not cache.
+
+    python benchmarks/bench_member_memory.py --members 50000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+
+def rss_bytes():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def measure(members):
+    from fake_discord import FakeDiscord, member_payload, snowflake
+
+    import main
+
+    fake = FakeDiscord(main.bot).install()
+    guild = fake.add_guild(channels=1)
+    # Built lazily so the payloads themselves aren't counted
+    payloads = (member_payload(snowflake(), f"user-{index}") for index in range(members))
+    # Count member_join dispatches instead of scheduling 10k welcome tasks
+    joins = []
+    fake.state.dispatch = lambda event, *args: joins.append(event)
+
+    gc.collect()
+    tracemalloc.start()
+    rss_before = rss_bytes()
+    state = fake.state
+    if state.member_cache_flags.joined:
+        # What chunk_guilds_at_startup does: every member ends up in guild._members
+        for payload in payloads:
+            guild._add_member(main.discord.Member(data=payload, guild=guild, state=state))
+    else:
+        for payload in payloads:
+            payload["guild_id"] = str(guild.id)
+            state.parse_guild_member_add(payload)
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    rss_after = rss_bytes()
+    return {
+        "memory_optimized": main.MEMORY_OPTIMIZED,
+        "cached_members": len(guild._members),
+        "join_events": len(joins),
+        "traced_bytes": traced,
+        "rss_bytes": rss_after - rss_before,
+    }
+
+
+def run_child(members):
+    os.chdir(tempfile.mkdtemp(prefix="nexus-memory-"))
+    print(json.dumps(asyncio.run(measure(members))))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=50_000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.members)
+
+    per = 10_000 / args.members
+    print(f"{'mode':<22} {'cached':>8} {'traced MiB/10k':>15} {'RSS MiB/10k':>12}")
+    for optimized in ("0", "1"):
+        env = dict(os.environ, MEMORY_OPTIMIZED=optimized)
+        env.pop("MEMBER_CACHE", None)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--members", str(args.members)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        label = "MEMORY_OPTIMIZED=1" if result["memory_optimized"] else "default"
+        print(
+            f"{label:<22} {result['cached_members']:>8} "
+            f"{result['traced_bytes'] * per / 2**20:>15.2f} {result['rss_bytes'] * per / 2**20:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,100 @@
+"""
+Memory per tracker and per guild config: the JSON dicts the bot used to keep
+in memory versus the slotted ``Tracker`` / ``GuildConfig`` records.
+
+Both sides are built from the same JSON text, the way the stores load them,
+and measured with tracemalloc.
+
+    python benchmarks/bench_tracker_memory.py --guilds 2000 --trackers 10
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLATFORMS = ("youtube", "instagram", "twitch", "tiktok", "x")
+
+
+def tracker_file(guilds, trackers_per_guild):
+    data = {}
+    for guild_index in range(guilds):
+        guild_id = 1_100_000_000_000_000_000 + guild_index * 1000
+        trackers = []
+        for index in range(trackers_per_guild):
+            platform = PLATFORMS[index % len(PLATFORMS)]
+            # Popular accounts are tracked by many guilds
+            account = f"account{(guild_index * trackers_per_guild + index) % 5000}"
+            tracker = {
+                "platform": platform,
+                "url": f"https://example.com/{platform}/{account}",
+                "account_name": account.title(),
+                "last_count": 10_000 + index,
+                "post_channel": str(guild_id + 1 + index % 3),
+            }
+            if platform == "youtube":
+                tracker["channel_id"] = f"UC{account}"
+                tracker["upload_alerts"] = True
+                tracker["last_video_published"] = "2024-01-01T00:00:00+00:00"
+            elif platform != "instagram":
+                tracker["account_id"] = account
+            trackers.append(tracker)
+        data[str(guild_id)] = trackers
+    return json.dumps(data)
+
+
+def config_file(guilds):
+    return json.dumps({
+        str(1_100_000_000_000_000_000 + guild_index * 1000): {
+            "announcement_role": 1_200_000_000_000_000_000 + guild_index,
+            "welcome_channel": 1_300_000_000_000_000_000 + guild_index,
+            "welcome_dm": "Welcome to the server!",
+        }
+        for guild_index in range(guilds)
+    })
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--trackers", type=int, default=10, help="trackers per guild")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="nexus-records-"))
+
+    import main
+
+    trackers_json = tracker_file(args.guilds, args.trackers)
+    configs_json = config_file(args.guilds)
+    total = args.guilds * args.trackers
+
+    rows = []
+    for label, count, text, decode in (
+        ("tracker", total, trackers_json, main.decode_trackers),
+        ("guild config", args.guilds, configs_json, main.decode_configs),
+    ):
+        _, dict_bytes = traced(lambda: json.loads(text))
+        # The parsed dicts are dropped once decoded; only what the records keep is counted
+        _, record_bytes = traced(lambda: decode(json.loads(text)))
+        rows.append((label, count, dict_bytes / count, record_bytes / count))
+
+    print(f"{'per item':<14} {'count':>8} {'dict bytes':>11} {'record bytes':>13} {'saved':>7}")
+    for label, count, dict_size, record_size in rows:
+        print(f"{label:<14} {count:>8} {dict_size:>11.0f} {record_size:>13.0f} {1 - record_size / dict_size:>7.0%}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,108 @@
+"""
+End-to-end check of the WebSub upload pipeline against a local fake hub.
+
+Starts ``YouTubeFeedReceiver`` on a local port, lets it subscribe every tracked
+channel on ``FakeHub``, then publishes uploads and measures the time from the
+hub's push to the notification reaching the fake Discord channel. A push with
+a bad signature must be ignored.
+
+    python benchmarks/bench_websub.py --channels 20 --pushes 100
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_bot import percentile  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("condition not met in time")
+        await asyncio.sleep(0.001)
+
+
+async def run(args):
+    from fake_discord import FakeDiscord
+    from fake_hub import FakeHub
+
+    import main
+
+    fake = FakeDiscord(main.bot).install()
+    guild = fake.add_guild(channels=2)
+    channel_ids = [f"UCwebsub{index:04d}" for index in range(args.channels)]
+    main.social_trackers.replace({str(guild.id): [
+        {
+            "platform": "youtube",
+            "url": f"https://www.youtube.com/channel/{channel_id}",
+            "channel_id": channel_id,
+            "account_name": channel_id,
+            "last_count": 0,
+            "post_channel": str(guild.text_channels[0].id),
+            "last_video_published": "2000-01-01T00:00:00+00:00",
+        }
+        for channel_id in channel_ids
+    ]})
+
+    hub = await FakeHub().start()
+    port = free_port()
+    receiver = main.YouTubeFeedReceiver(
+        callback_url=f"http://127.0.0.1:{port}/websub", hub_url=hub.url, port=port, secret="bench-secret"
+    )
+    await receiver.start()
+    main.bot.youtube_feed = receiver
+
+    started = time.perf_counter()
+    await receiver.sync_subscriptions()
+    await wait_for(lambda: all(receiver.is_subscribed(channel_id) for channel_id in channel_ids))
+    print(f"subscribed {len(channel_ids)} channels in {(time.perf_counter() - started) * 1000:.1f}ms "
+          f"({hub.verifications} verifications)")
+
+    sent_before = len(fake.http.sent)
+    await hub.publish(channel_ids[0], "forgedVideo1", secret_override="wrong-secret")
+    await asyncio.sleep(0.05)
+    assert len(fake.http.sent) == sent_before, "forged push was announced"
+    print("forged push ignored")
+
+    samples = []
+    for index in range(args.pushes):
+        expected = len(fake.http.sent) + 1
+        pushed_at = time.perf_counter()
+        await hub.publish(channel_ids[index % len(channel_ids)], f"video{index:06d}", title=f"Match {index}")
+        await wait_for(lambda: len(fake.http.sent) >= expected)
+        samples.append(time.perf_counter() - pushed_at)
+
+    print(f"push -> Discord notification over {len(samples)} uploads: "
+          f"p50={percentile(samples, 50) * 1000:.2f}ms p99={percentile(samples, 99) * 1000:.2f}ms")
+
+    await receiver.stop()
+    await hub.stop()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--pushes", type=int, default=100)
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="nexus-websub-"))
+    os.environ.pop("YOUTUBE_API_KEY", None)
+    os.environ.pop("YOUTUBE_API_KEYS", None)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,315 @@
+"""
+Fake Discord HTTP and gateway layer for offline benchmarks.
+
+Every REST call the bot makes goes through ``FakeHTTPClient.request`` and every
+interaction response or followup goes through ``FakeWebhookAdapter.request``.
+Both record the route and reply with a canned payload after a configurable
+simulated round trip, so handlers run through the real discord.py code paths
+without a token or network access.
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import discord
+from discord.http import HTTPClient
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+_snowflakes = itertools.count(1_100_000_000_000_000_000)
+
+
+def snowflake():
+    return next(_snowflakes)
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def user_payload(user_id, name="member", bot=False, discriminator="0"):
+    return {
+        "id": str(user_id),
+        "username": name,
+        "discriminator": discriminator,
+        "global_name": name,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id, name="member", roles=(), joined_at=None):
+    return {
+        "user": user_payload(user_id, name),
+        "roles": [str(role_id) for role_id in roles],
+        "joined_at": joined_at or _now_iso(),
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def message_payload(channel_id, content="", author=None, guild_id=None, embeds=()):
+    payload = {
+        "id": str(snowflake()),
+        "channel_id": str(channel_id),
+        "type": 0,
+        "content": content,
+        "author": author or user_payload(snowflake(), "sender"),
+        "timestamp": _now_iso(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": list(embeds),
+        "pinned": False,
+    }
+    if guild_id is not None:
+        payload["guild_id"] = str(guild_id)
+    return payload
+
+
+class FakeHTTPClient(HTTPClient):
+    """HTTPClient whose requests never leave the process."""
+
+    def __init__(self, loop, latency=0.0):
+        super().__init__(loop)
+        self.latency = latency
+        self.calls = Counter()
+        self.sent = []
+        self.guild_ids = {}  # channel_id -> guild_id, for thread payloads
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        self.calls[(route.method, route.path)] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        params = route.__dict__
+        if route.method == "POST" and route.path == "/channels/{channel_id}/messages":
+            payload = kwargs.get("json") or {}
+            if form:
+                for part in form:
+                    if part.get("name") == "payload_json":
+                        payload = discord.utils._from_json(part["value"])
+            self.sent.append((params.get("channel_id"), payload))
+            return message_payload(
+                params.get("channel_id"),
+                content=payload.get("content") or "",
+                author=user_payload(BOT_USER_ID, "Nexus", bot=True),
+                embeds=payload.get("embeds") or (),
+            )
+        if route.method == "POST" and route.path == "/users/@me/channels":
+            recipient = kwargs["json"]["recipient_id"]
+            return {"id": str(snowflake()), "type": 1, "recipients": [user_payload(recipient)], "last_message_id": None}
+        if route.method == "POST" and route.path == "/channels/{channel_id}/messages/{message_id}/threads":
+            return {
+                "id": str(snowflake()),
+                "type": 11,
+                "guild_id": str(params.get("guild_id") or self.guild_ids.get(params.get("channel_id"), 0)),
+                "parent_id": str(params.get("channel_id")),
+                "owner_id": str(BOT_USER_ID),
+                "name": kwargs["json"]["name"],
+                "message_count": 0,
+                "member_count": 1,
+                "thread_metadata": {
+                    "archived": False,
+                    "auto_archive_duration": kwargs["json"].get("auto_archive_duration", 1440),
+                    "archive_timestamp": _now_iso(),
+                    "locked": False,
+                },
+            }
+        if route.method == "GET" and route.path == "/guilds/{guild_id}/members/{member_id}":
+            payload = member_payload(int(route.url.rsplit("/", 1)[1]))
+            payload["guild_id"] = str(params.get("guild_id"))
+            return payload
+        if route.method == "GET" and route.path == "/channels/{channel_id}/messages/{message_id}":
+            payload = message_payload(params.get("channel_id"))
+            # Route only keeps the major parameters, so take the message ID from the URL
+            payload["id"] = route.url.rsplit("/", 1)[1]
+            return payload
+        return {}
+
+    async def get_from_cdn(self, url):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048
+
+
+class FakeWebhookAdapter(AsyncWebhookAdapter):
+    """Interaction responses and followups, answered locally."""
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = Counter()
+
+    async def request(self, route, session, **kwargs):
+        self.calls[(route.method, route.path)] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if route.method == "POST" and route.path.endswith("/callback"):
+            return {"interaction": {"id": str(route.webhook_id), "type": 2}}
+        if route.method == "POST" and route.path.startswith("/webhooks/"):
+            return message_payload(snowflake(), author=user_payload(BOT_USER_ID, "Nexus", bot=True))
+        return {}
+
+
+BOT_USER_ID = 1_000_000_000_000_000_001
+
+
+class FakeDiscord:
+    """
+    Wires a ``commands.Bot`` to the fake HTTP layer and builds guilds, members,
+    messages and interactions from gateway-shaped payloads.
+    """
+
+    def __init__(self, bot, latency=0.0):
+        self.bot = bot
+        self.latency = latency
+        self.guilds = []
+        self.http = None
+        self.adapter = None
+
+    def install(self):
+        loop = asyncio.get_running_loop()
+        state = self.bot._connection
+        self.http = FakeHTTPClient(loop, self.latency)
+        self.bot.http = self.http
+        state.http = self.http
+        state.loop = loop
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID, "Nexus", bot=True))
+        state.application_id = BOT_USER_ID
+        self.adapter = FakeWebhookAdapter(self.latency)
+        async_context.set(self.adapter)
+        return self
+
+    @property
+    def state(self):
+        return self.bot._connection
+
+    def add_guild(self, channels=2, members=0, name=None):
+        guild_id = snowflake()
+        owner_id = snowflake()
+        channel_payloads = [
+            {
+                "id": str(snowflake()),
+                "type": 0,
+                "name": f"channel-{index}",
+                "position": index,
+                "permission_overwrites": [],
+                "nsfw": False,
+                "parent_id": None,
+                "guild_id": str(guild_id),
+            }
+            for index in range(channels)
+        ]
+        data = {
+            "id": str(guild_id),
+            "name": name or f"guild-{len(self.guilds)}",
+            "owner_id": str(owner_id),
+            "roles": [
+                {
+                    "id": str(guild_id),
+                    "name": "@everyone",
+                    "permissions": str(discord.Permissions.general().value),
+                    "position": 0,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                }
+            ],
+            "channels": channel_payloads,
+            "members": [member_payload(snowflake(), f"user-{index}") for index in range(members)],
+            "member_count": members,
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+            "icon": None,
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "mfa_level": 0,
+            "premium_tier": 0,
+            "preferred_locale": "en-US",
+        }
+        for channel in channel_payloads:
+            self.http.guild_ids[int(channel["id"])] = guild_id
+        guild = discord.Guild(data=data, state=self.state)
+        self.state._add_guild(guild)
+        self.guilds.append(guild)
+        return guild
+
+    def member(self, guild, roles=(), created_days_ago=None):
+        user_id = snowflake()
+        if created_days_ago is not None:
+            created_ms = int((time.time() - created_days_ago * 86400) * 1000) - discord.utils.DISCORD_EPOCH
+            user_id = (created_ms << 22) | (user_id & 0x3FFFFF)
+        payload = member_payload(user_id, f"user-{user_id % 10000}", roles=roles)
+        payload["guild_id"] = str(guild.id)
+        return discord.Member(data=payload, guild=guild, state=self.state)
+
+    def owner(self, guild):
+        """The guild owner, who passes every guild_permissions check"""
+        payload = member_payload(guild.owner_id, "owner")
+        payload["guild_id"] = str(guild.id)
+        return discord.Member(data=payload, guild=guild, state=self.state)
+
+    def dm_message(self, content="hello", author_id=None):
+        author = user_payload(author_id or snowflake(), "dm-user")
+        channel = discord.DMChannel(
+            me=self.state.user,
+            state=self.state,
+            data={"id": str(snowflake()), "type": 1, "recipients": [author], "last_message_id": None},
+        )
+        return discord.Message(state=self.state, channel=channel, data=message_payload(channel.id, content, author))
+
+    def guild_message(self, guild, content="hello", channel=None):
+        channel = channel or guild.text_channels[0]
+        author = member_payload(snowflake(), "chatter")
+        data = message_payload(channel.id, content, author["user"], guild_id=guild.id)
+        data["member"] = {key: value for key, value in author.items() if key != "user"}
+        return discord.Message(state=self.state, channel=channel, data=data)
+
+    def interaction(self, guild, member=None, permissions=None, data=None):
+        member = member or self.member(guild)
+        perms = permissions if permissions is not None else discord.Permissions.all()
+        member_data = member_payload(member.id, member.name, roles=[role.id for role in member.roles[1:]])
+        member_data["permissions"] = str(perms.value)
+        payload = {
+            # Time-based so interaction.created_at (and time-to-first-response) is meaningful
+            "id": str(discord.utils.time_snowflake(datetime.now(timezone.utc)) + snowflake() % 4096),
+            "application_id": str(BOT_USER_ID),
+            "type": 5,
+            "token": "fake-interaction-token",
+            "version": 1,
+            "guild_id": str(guild.id),
+            "channel_id": str(guild.text_channels[0].id),
+            "channel": {"id": str(guild.text_channels[0].id), "type": 0, "guild_id": str(guild.id)},
+            "member": member_data,
+            "data": data or {"custom_id": "modal", "components": []},
+            "locale": "en-US",
+            "guild_locale": "en-US",
+            "app_permissions": str(discord.Permissions.all().value),
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "entitlements": [],
+            "authorizing_integration_owners": {},
+            "context": 0,
+        }
+        return discord.Interaction(data=payload, state=self.state)
+
+    def attachment(self, filename="banner.png", size=2056):
+        return discord.Attachment(
+            data={
+                "id": str(snowflake()),
+                "filename": filename,
+                "size": size,
+                "url": f"https://cdn.discordapp.com/attachments/0/0/{filename}",
+                "proxy_url": f"https://media.discordapp.net/attachments/0/0/{filename}",
+                "content_type": "image/png",
+            },
+            state=self.state,
+        )
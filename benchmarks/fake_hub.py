@@ -0,0 +1,109 @@
+"""
+Local stand-in for the YouTube WebSub (PubSubHubbub) hub.
+
+Accepts subscribe/unsubscribe requests, verifies them against the
+subscriber's callback with a challenge like the real hub, and can publish
+signed Atom notifications for a channel to every verified subscriber.
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timezone
+
+import aiohttp
+from aiohttp import web
+
+FEED_TEMPLATE = """<?xml version='1.0' encoding='UTF-8'?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+  <title>YouTube video feed</title>
+  <updated>{updated}</updated>
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{channel_id}</yt:channelId>
+    <title>{title}</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+    <author>
+      <name>Channel {channel_id}</name>
+      <uri>https://www.youtube.com/channel/{channel_id}</uri>
+    </author>
+    <published>{published}</published>
+    <updated>{updated}</updated>
+  </entry>
+</feed>
+"""
+
+
+class FakeHub:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.subscriptions = {}  # topic -> {callback: secret}
+        self.verifications = 0
+        self.rejected = 0
+        self._runner = None
+        self._session = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/subscribe"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/subscribe", self._handle_subscribe)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._session = aiohttp.ClientSession()
+        return self
+
+    async def stop(self):
+        await self._session.close()
+        await self._runner.cleanup()
+
+    async def _handle_subscribe(self, request):
+        form = await request.post()
+        asyncio.get_running_loop().create_task(self._verify(dict(form)))
+        return web.Response(status=202)
+
+    async def _verify(self, form):
+        challenge = secrets.token_hex(8)
+        params = {
+            "hub.mode": form["hub.mode"],
+            "hub.topic": form["hub.topic"],
+            "hub.challenge": challenge,
+            "hub.lease_seconds": form.get("hub.lease_seconds", "432000"),
+        }
+        async with self._session.get(form["hub.callback"], params=params) as response:
+            body = await response.text()
+        if response.status != 200 or body != challenge:
+            self.rejected += 1
+            return
+        self.verifications += 1
+        callbacks = self.subscriptions.setdefault(form["hub.topic"], {})
+        if form["hub.mode"] == "subscribe":
+            callbacks[form["hub.callback"]] = form.get("hub.secret", "")
+        else:
+            callbacks.pop(form["hub.callback"], None)
+
+    async def publish(self, channel_id, video_id, title="New video", published=None, secret_override=None):
+        """Push a notification to every subscriber of the channel's feed; returns delivery count"""
+        now = datetime.now(timezone.utc).isoformat()
+        body = FEED_TEMPLATE.format(
+            video_id=video_id, channel_id=channel_id, title=title, published=published or now, updated=now
+        ).encode()
+        topic = f"https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+        delivered = 0
+        for callback, secret in self.subscriptions.get(topic, {}).items():
+            key = (secret_override if secret_override is not None else secret).encode()
+            signature = "sha1=" + hmac.new(key, body, hashlib.sha1).hexdigest()
+            async with self._session.post(
+                callback, data=body, headers={"Content-Type": "application/atom+xml", "X-Hub-Signature": signature}
+            ) as response:
+                if response.status < 300:
+                    delivered += 1
+        return delivered
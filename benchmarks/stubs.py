@@ -0,0 +1,155 @@
+"""
+Local HTTP stubs for the platforms the social tracker polls.
+
+``PlatformStub`` serves YouTube Data API ``channels`` JSON under
+``/youtube/v3/channels``, Twitch Helix under ``/helix`` (with a token
+endpoint at ``/oauth2/token``), X API v2 ``users/by`` under ``/x/2``, TikTok
+profile pages under ``/@<username>`` and Instagram profile HTML under
+``/<username>/``. Counts grow on every request so each sweep has something
+to announce.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, content_type):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        stub.hits += 1
+        if url.path.startswith("/youtube/v3/channels"):
+            query = parse_qs(url.query)
+            ids = []
+            for value in query.get("id", []):
+                ids.extend(part for part in value.split(",") if part)
+            for handle in query.get("forHandle", []):
+                ids.append(f"UC{handle.lstrip('@')}")
+            items = []
+            for channel_id in ids:
+                count = stub.bump(channel_id)
+                items.append({
+                    "kind": "youtube#channel",
+                    "id": channel_id,
+                    "snippet": {"title": f"Channel {channel_id}"},
+                    "statistics": {"subscriberCount": str(count), "videoCount": "10", "viewCount": "1000"},
+                })
+            return self._reply(200, json.dumps({"kind": "youtube#channelListResponse", "items": items}), "application/json")
+
+        query = parse_qs(url.query)
+        if url.path == "/helix/users":
+            users = [
+                {"id": f"tw-{login}", "login": login, "display_name": login.title()}
+                for login in query.get("login", [])
+            ]
+            return self._reply(200, json.dumps({"data": users}), "application/json")
+        if url.path == "/helix/channels/followers":
+            count = stub.bump(query.get("broadcaster_id", [""])[0])
+            return self._reply(200, json.dumps({"total": count, "data": []}), "application/json")
+        if url.path == "/x/2/users/by":
+            users = []
+            for value in query.get("usernames", []):
+                for username in filter(None, value.split(",")):
+                    users.append({
+                        "id": f"x-{username}",
+                        "username": username,
+                        "name": username.title(),
+                        "public_metrics": {"followers_count": stub.bump(f"x:{username.lower()}")},
+                    })
+            return self._reply(200, json.dumps({"data": users}), "application/json")
+        if url.path.startswith("/@"):
+            username = url.path[2:].split("/")[0]
+            data = {"__DEFAULT_SCOPE__": {"webapp.user-detail": {"userInfo": {
+                "user": {"uniqueId": username, "nickname": username.title()},
+                "stats": {"followerCount": stub.bump(f"tiktok:{username}")},
+            }}}}
+            html = (
+                '<html><body><script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+                f"{json.dumps(data)}</script></body></html>"
+            )
+            return self._reply(200, html, "text/html; charset=utf-8")
+
+        username = url.path.strip("/").split("/")[0]
+        if username:
+            count = stub.bump(username)
+            html = (
+                "<html><head>"
+                f'<meta property="og:description" content="{count:,} Followers, 12 Following, 80 Posts - '
+                f'See Instagram photos and videos from {username} (@{username})">'
+                "</head><body></body></html>"
+            )
+            return self._reply(200, html, "text/html; charset=utf-8")
+
+        self._reply(404, "{}", "application/json")
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.hits += 1
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if urlparse(self.path).path == "/oauth2/token":
+            return self._reply(200, json.dumps({"access_token": "stub-token", "expires_in": 3600}), "application/json")
+        self._reply(404, "{}", "application/json")
+
+
+class PlatformStub:
+    """Threaded HTTP server standing in for every platform the tracker polls."""
+
+    def __init__(self, host="127.0.0.1", port=0, growth=7):
+        self.growth = growth
+        self.hits = 0
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def bump(self, key):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 1000) + self.growth
+            return self._counts[key]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    # Standalone, e.g. for `python main.py sweep --endpoint http://127.0.0.1:8765`
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Serve stub endpoints for every tracked platform")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    with PlatformStub(port=args.port) as stub:
+        print(f"Platform stub listening on {stub.base_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -3,88 +3,952 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import Modal, TextInput
 import os
+import sys
 import json
-from datetime import datetime
+import re
+import time
+import heapq
+import hmac
+import hashlib
+import secrets
+import argparse
+import cProfile
+import pstats
+import bisect
+import threading
+import traceback
+import logging
+import queue
+import copy
+import atexit
+import random
+import io
+import csv
+import dataclasses
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
 from typing import Optional
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from xml.etree import ElementTree
 import asyncio
+import functools
+import itertools
+import aiohttp
+from aiohttp import web
 import requests
+import httplib2
 from bs4 import BeautifulSoup
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from PIL import Image, ImageDraw, ImageFont
+
+# Logging: records are queued and written by a background thread, so the event loop never waits on stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")  # Per subsystem, e.g. "tracker=DEBUG,websub=WARNING,discord=WARNING"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json (one object per line) or text
+LOG_REPEAT_WINDOW = float(os.getenv("LOG_REPEAT_WINDOW", "60"))  # Seconds over which identical records are counted
+LOG_REPEAT_BURST = int(os.getenv("LOG_REPEAT_BURST", "5"))  # Identical records let through per window
+LOG_REPEAT_SAMPLE = int(os.getenv("LOG_REPEAT_SAMPLE", "100"))  # Past the burst, 1 in this many still goes out
+LOG_FIELDS = ('guild', 'channel', 'user', 'platform', 'tracker', 'latency_ms', 'count', 'error_class', 'error', 'suppressed')
+
+class RepeatFilter(logging.Filter):
+    """
+    Rate-limits identical records: same logger, message template and error
+    class. The first LOG_REPEAT_BURST per window go out, then a sample; the
+    next record out carries how many were suppressed.
+    """
+
+    def __init__(self, window: float, burst: int, sample: int, max_keys: int = 1024):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.sample = max(1, sample)
+        self.max_keys = max_keys
+        self._seen = OrderedDict()  # key -> [window start, records this window, suppressed since the last one out]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        error = getattr(record, 'error', None) or (record.exc_info[1] if record.exc_info else None)
+        key = (record.name, record.msg, type(error).__name__ if error is not None else None)
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is None or now - state[0] >= self.window:
+                state = self._seen[key] = [now, 0, state[2] if state else 0]
+            self._seen.move_to_end(key)
+            if len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+            state[1] += 1
+            if state[1] > self.burst and (state[1] - self.burst) % self.sample:
+                state[2] += 1
+                return False
+            if state[2]:
+                record.suppressed = state[2]
+                state[2] = 0
+        return True
+
+class LogQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs in the logging thread: render the message and traceback while args and frames exist
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.error = getattr(record, 'error', None) or record.exc_info[1]
+            record.exc_info = None
+        error = getattr(record, 'error', None)
+        if isinstance(error, BaseException):
+            record.error_class = type(error).__name__
+            record.error = str(error)
+        return record
+
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['traceback'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class TextLogFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s%(fields)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{field}={getattr(record, field)}" for field in LOG_FIELDS if getattr(record, field, None) is not None)
+        record.fields = f" [{fields}]" if fields else ""
+        return super().format(record)
+
+def setup_logging() -> QueueListener:
+    """Route the bot's and discord.py's logs through one queue to a writer thread"""
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonLogFormatter() if LOG_FORMAT == "json" else TextLogFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = LogQueueHandler(log_queue)
+    handler.addFilter(RepeatFilter(LOG_REPEAT_WINDOW, LOG_REPEAT_BURST, LOG_REPEAT_SAMPLE))
+    for name in ("nexus", "discord"):
+        logger = logging.getLogger(name)
+        logger.addHandler(handler)
+        logger.propagate = False
+    logging.getLogger("nexus").setLevel(LOG_LEVEL)
+    logging.getLogger("discord").setLevel(logging.INFO)
+    for item in filter(None, (part.strip() for part in LOG_LEVELS.split(","))):
+        name, _, level = item.partition("=")
+        name = name.strip()
+        if name.split(".")[0] not in ("nexus", "discord"):
+            name = f"nexus.{name}"
+        logging.getLogger(name).setLevel(level.strip().upper())
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Drain the queue on exit
+    return listener
+
+log_listener = setup_logging()
+log = logging.getLogger("nexus")  # Startup and guild lifecycle
+storage_log = logging.getLogger("nexus.storage")
+watchdog_log = logging.getLogger("nexus.watchdog")
+tracker_log = logging.getLogger("nexus.tracker")
+youtube_log = logging.getLogger("nexus.youtube")
+websub_log = logging.getLogger("nexus.websub")
+send_log = logging.getLogger("nexus.send")
+tickets_log = logging.getLogger("nexus.tickets")
+scheduler_log = logging.getLogger("nexus.scheduler")
+welcome_log = logging.getLogger("nexus.welcome")
+moderation_log = logging.getLogger("nexus.moderation")
 
 # Get token from environment
 token = os.getenv("DISCORD_TOKEN")
-if not token:
-    print("❌ CRITICAL ERROR: Missing DISCORD_TOKEN")
-    exit(1)
 
-# YouTube API setup
-YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
-youtube_service = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY) if YOUTUBE_API_KEY else None
+# YouTube API setup: YOUTUBE_API_KEYS is a comma-separated pool whose quotas are used in turn
+YOUTUBE_API_KEYS = list(dict.fromkeys(
+    key.strip()
+    for key in (os.getenv("YOUTUBE_API_KEYS", "") + "," + os.getenv("YOUTUBE_API_KEY", "")).split(",")
+    if key.strip()
+))
+
+# Memory-optimised mode: only on_member_join needs member events, so don't cache or chunk members
+MEMORY_OPTIMIZED = os.getenv("MEMORY_OPTIMIZED", "").lower() in ("1", "true", "yes")
+MEMBER_CACHE = os.getenv("MEMBER_CACHE", "none" if MEMORY_OPTIMIZED else "all")  # all, none or e.g. "joined,voice"
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "100" if MEMORY_OPTIMIZED else "1000"))
 
 # Configure intents
 intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+intents.message_content = os.getenv("MESSAGE_CONTENT_INTENT", "1").lower() in ("1", "true", "yes")
+intents.members = True  # Required for on_member_join
+if not intents.message_content:
+    log.warning(
+        "Message Content intent is off (MESSAGE_CONTENT_INTENT=0): auto-responses, "
+        "link filtering and staff replies in ticket threads won't see message text"
+    )
+
+def build_member_cache_flags(spec: str) -> discord.MemberCacheFlags:
+    """Build MemberCacheFlags from 'all', 'none' or a comma separated list of flag names"""
+    spec = spec.strip().lower()
+    if spec == "all":
+        return discord.MemberCacheFlags.from_intents(intents)
+    flags = discord.MemberCacheFlags.none()
+    for name in filter(None, (part.strip() for part in spec.split(","))):
+        if name == "none":
+            continue
+        if name not in discord.MemberCacheFlags.VALID_FLAGS:
+            log.error(
+                "Unknown MEMBER_CACHE flag %r ignored (valid: all, none, %s)",
+                name, ", ".join(discord.MemberCacheFlags.VALID_FLAGS)
+            )
+            continue
+        setattr(flags, name, True)
+    return flags
 
 bot = commands.Bot(
     command_prefix='!',
-    intents=intents
+    intents=intents,
+    member_cache_flags=build_member_cache_flags(MEMBER_CACHE),
+    chunk_guilds_at_startup=not MEMORY_OPTIMIZED,
+    max_messages=MESSAGE_CACHE_SIZE or None
 )
 
 # Global command sync flag
 commands_synced = False
 
 # Configuration storage
-CONFIG_FILE = "bot_config.json"
-guild_configs = {}
+CONFIG_WATCH_INTERVAL = float(os.getenv("CONFIG_WATCH_INTERVAL", "2"))  # Seconds between checks for hand edits
 
-def load_config():
-    global guild_configs
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                guild_configs = json.load(f)
-    except Exception as e:
-        print(f"⚠️ Error loading config: {e}")
-        guild_configs = {}
+def freeze(value):
+    """Read-only deep copy of JSON data: dicts become mappingproxies, lists become tuples"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
 
-def save_config():
-    try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(guild_configs, f, indent=2)
-    except Exception as e:
-        print(f"⚠️ Error saving config: {e}")
+def thaw(value):
+    """Mutable deep copy of frozen data"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+class VersionedStore:
+    """
+    Copy-on-write JSON store keyed by guild ID.
+
+    Readers take snapshot() (or use the mapping methods) and get an immutable
+    view that never changes under them, so they don't need a lock. Writers get a
+    mutable copy of the entries they touch and publish a new version by swapping
+    one reference; untouched entries are shared between versions. Saves happen
+    on a background thread through a temp file and os.replace(), and
+    reload_if_changed() picks up edits made to the file by hand.
+
+    decode turns the file's JSON into the frozen in-memory form and encode
+    turns it back; by default entries are plain frozen JSON. Setting path to
+    None keeps later versions in memory only.
+    """
+
+    def __init__(self, path: Optional[str], label: str, decode=freeze, encode=thaw):
+        self.path = path
+        self.label = label
+        self.decode = decode
+        self.encode = encode
+        self.version = 0
+        self._data = MappingProxyType({})
+        self._write_lock = threading.Lock()  # Writers on the loop and the reload thread
+        self._io_lock = threading.Lock()  # File writes vs reload checks
+        self._saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"save-{label}")
+        self._pending = None
+        self._file_stat = None
+
+    def snapshot(self) -> MappingProxyType:
+        return self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        return self._data.items()
+
+    def values(self):
+        return self._data.values()
+
+    def _publish(self, data: MappingProxyType):
+        self._data = data
+        self.version += 1
+
+    def update(self, key, mutator, default=dict):
+        """Run mutator on a mutable copy of one entry and publish it; returns what mutator returned"""
+        return self.update_many({key: mutator}, default)[key]
+
+    def update_many(self, mutators: dict, default=dict) -> dict:
+        """Apply several entry mutators as a single version; entries left empty are removed"""
+        with self._write_lock:
+            data = dict(self._data)
+            results = {}
+            for key, mutator in mutators.items():
+                current = data.get(key)
+                entry = thaw(current) if current is not None else default()
+                results[key] = mutator(entry)
+                if entry:
+                    data[key] = freeze(entry)
+                else:
+                    data.pop(key, None)
+            self._publish(MappingProxyType(data))
+            self._schedule_save()
+        return results
+
+    def swap(self, key, transform, default=None):
+        """Publish transform(entry) in place of one entry, for immutable records; None removes it"""
+        with self._write_lock:
+            data = dict(self._data)
+            value = transform(data.get(key, default))
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = freeze(value)
+            self._publish(MappingProxyType(data))
+            self._schedule_save()
+        return value
+
+    def remove(self, key) -> bool:
+        with self._write_lock:
+            if key not in self._data:
+                return False
+            data = dict(self._data)
+            del data[key]
+            self._publish(MappingProxyType(data))
+            self._schedule_save()
+        return True
+
+    def replace(self, data: dict):
+        """Publish data given in the file's format"""
+        decoded = self.decode(data)
+        with self._write_lock:
+            self._publish(decoded)
+            self._schedule_save()
+
+    def _schedule_save(self):
+        # Caller holds _write_lock. Only the newest version is written if saves pile up.
+        if self.path is None:
+            return
+        queued = self._pending is not None
+        self._pending = self._data
+        if not queued:
+            self._saver.submit(self._flush)
+
+    def _flush(self):
+        with self._write_lock:
+            data, self._pending = self._pending, None
+        with self._io_lock:
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(self.encode(data), f, indent=2)
+                os.replace(temp_path, self.path)
+                self._file_stat = self._stat()
+            except Exception as e:
+                storage_log.error("Error saving %s", self.label, extra={'error': e})
+
+    def flush(self):
+        """Block until every published version is on disk"""
+        self._saver.submit(lambda: None).result()
+
+    def _stat(self):
+        if self.path is None:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> MappingProxyType:
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("top level must be an object")
+        return self.decode(data)
+
+    def load(self):
+        try:
+            with self._io_lock:
+                self._file_stat = self._stat()
+                data = self._read() if self._file_stat else MappingProxyType({})
+        except Exception as e:
+            storage_log.error("Error loading %s", self.label, extra={'error': e})
+            data = MappingProxyType({})
+        with self._write_lock:
+            self._publish(data)
+
+    def reload_if_changed(self) -> bool:
+        """Publish the file's contents if something other than this store wrote it (blocking)"""
+        with self._io_lock:
+            stat = self._stat()
+            if stat is None or stat == self._file_stat:
+                return False
+            self._file_stat = stat
+            if self._pending is not None:
+                storage_log.warning("%s changed while a save was pending; keeping the bot's copy", self.path)
+                return False
+            try:
+                data = self._read()
+            except Exception as e:
+                # Often a half-written file; the next complete write has a new mtime
+                storage_log.warning("Ignoring edit to %s", self.path, extra={'error': e})
+                return False
+            with self._write_lock:
+                self._publish(data)
+        storage_log.info("Reloaded %s from %s (version %d)", self.label, self.path, self.version)
+        return True
+
+class Platform(str, Enum):
+    """Trackable platforms. Members are singletons, so every tracker shares one object per platform"""
+    YOUTUBE = "youtube"
+    INSTAGRAM = "instagram"
+    TWITCH = "twitch"
+    TIKTOK = "tiktok"
+    X = "x"
+
+    def __str__(self):
+        return self.value
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Tracker:
+    """One tracked account posting to one channel"""
+    id: int  # Unique within the guild and never reused, unlike the tracker's position in the list
+    platform: Platform
+    account_id: str  # What the provider looks accounts up by: YouTube channel ID, username or user ID
+    account_name: str
+    url: str
+    post_channel: int
+    last_count: int = 0
+    upload_alerts: bool = False  # YouTube only
+    last_video_published: Optional[str] = None
+    last_live_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Tracker':
+        return cls(
+            id=int(data.get('id', 0)),
+            platform=Platform(data['platform']),
+            account_id=sys.intern(data.get('channel_id') or data.get('account_id') or data['account_name']),
+            account_name=data['account_name'],
+            url=data['url'],
+            post_channel=int(data['post_channel']),
+            last_count=int(data.get('last_count', 0)),
+            upload_alerts=data.get('upload_alerts', False),
+            last_video_published=data.get('last_video_published'),
+            last_live_id=data.get('last_live_id')
+        )
+
+    def to_dict(self) -> dict:
+        data = {'id': self.id, 'platform': self.platform.value, 'url': self.url}
+        if self.platform is Platform.YOUTUBE:
+            data['channel_id'] = self.account_id
+            data['upload_alerts'] = self.upload_alerts
+        else:
+            data['account_id'] = self.account_id
+        data['account_name'] = self.account_name
+        data['last_count'] = self.last_count
+        data['post_channel'] = str(self.post_channel)
+        if self.last_video_published is not None:
+            data['last_video_published'] = self.last_video_published
+        if self.last_live_id is not None:
+            data['last_live_id'] = self.last_live_id
+        return data
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GuildConfig:
+    announcement_role: Optional[int] = None
+    welcome_channel: Optional[int] = None
+    welcome_dm: Optional[str] = None
+    dm_attachment_url: Optional[str] = None
+    ticket_channel: Optional[int] = None
+    raid_alert_channel: Optional[int] = None
+    raid_threshold: Optional[int] = None  # Joins per RAID_WINDOW; RAID_JOIN_THRESHOLD when unset
+    link_filter: Optional[str] = None  # 'delete' or 'quarantine'; off when unset
+    quarantine_channel: Optional[int] = None
+    block_invites: Optional[bool] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GuildConfig':
+        fields = {field.name for field in dataclasses.fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+    def to_dict(self) -> dict:
+        return {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+            if getattr(self, field.name) is not None
+        }
+
+def add_trackers(trackers: list, new_trackers: list) -> list:
+    """Append new_trackers with the next free IDs, for use in a social_trackers mutator"""
+    next_id = max((tracker.id for tracker in trackers), default=0) + 1
+    added = [dataclasses.replace(tracker, id=next_id + offset) for offset, tracker in enumerate(new_trackers)]
+    trackers.extend(added)
+    return added
+
+def decode_trackers(data: dict) -> MappingProxyType:
+    decoded = {}
+    for guild_id, entries in data.items():
+        trackers = [Tracker.from_dict(tracker) for tracker in entries]
+        # Files written before trackers had IDs (or edited by hand) get them in list order
+        if not all(tracker.id for tracker in trackers):
+            ids = itertools.count(max((tracker.id for tracker in trackers), default=0) + 1)
+            trackers = [tracker if tracker.id else dataclasses.replace(tracker, id=next(ids)) for tracker in trackers]
+        decoded[guild_id] = trackers
+    return freeze(decoded)
+
+def encode_trackers(data) -> dict:
+    return {guild_id: [tracker.to_dict() for tracker in trackers] for guild_id, trackers in data.items()}
+
+def decode_configs(data: dict) -> MappingProxyType:
+    return freeze({guild_id: GuildConfig.from_dict(config) for guild_id, config in data.items()})
+
+def encode_configs(data) -> dict:
+    return {guild_id: config.to_dict() for guild_id, config in data.items()}
+
+CONFIG_FILE = "bot_config.json"
+guild_configs = VersionedStore(CONFIG_FILE, "config", decode=decode_configs, encode=encode_configs)
 
 # Social tracker storage
 SOCIAL_FILE = "social_trackers.json"
-social_trackers = {}
+social_trackers = VersionedStore(SOCIAL_FILE, "social trackers", decode=decode_trackers, encode=encode_trackers)
 
-def load_social_trackers():
-    global social_trackers
-    try:
-        if os.path.exists(SOCIAL_FILE):
-            with open(SOCIAL_FILE, 'r') as f:
-                social_trackers = json.load(f)
-    except Exception as e:
-        print(f"⚠️ Error loading social trackers: {e}")
-        social_trackers = {}
+# Account URL resolutions shared by every guild: "platform:key" -> {'fields', 'resolved_at'}
+RESOLVE_CACHE_FILE = "resolved_accounts.json"
+RESOLVE_CACHE_TTL = float(os.getenv("RESOLVE_CACHE_TTL", str(7 * 86400)))  # Seconds before an entry is revalidated
+resolved_accounts = VersionedStore(RESOLVE_CACHE_FILE, "resolved accounts")
 
-def save_social_trackers():
-    try:
-        with open(SOCIAL_FILE, 'w') as f:
-            json.dump(social_trackers, f, indent=2)
-    except Exception as e:
-        print(f"⚠️ Error saving social trackers: {e}")
+# Scheduled announcement storage: job ID -> job
+SCHEDULE_FILE = "scheduled_announcements.json"
+scheduled_announcements = VersionedStore(SCHEDULE_FILE, "scheduled announcements")
+
+# Support ticket storage (user ID -> open ticket)
+TICKET_FILE = "tickets.json"
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Ticket:
+    user_id: int
+    guild_id: int
+    thread_id: int
+    dm_channel_id: int  # Lets staff replies go out without looking the user up
+    opened_at: float
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Ticket':
+        return cls(
+            user_id=int(data['user_id']),
+            guild_id=int(data['guild_id']),
+            thread_id=int(data['thread_id']),
+            dm_channel_id=int(data['dm_channel_id']),
+            opened_at=float(data['opened_at'])
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'user_id': str(self.user_id),
+            'guild_id': str(self.guild_id),
+            'thread_id': str(self.thread_id),
+            'dm_channel_id': str(self.dm_channel_id),
+            'opened_at': self.opened_at
+        }
+
+def decode_tickets(data: dict) -> MappingProxyType:
+    return freeze({user_id: Ticket.from_dict(ticket) for user_id, ticket in data.items()})
+
+def encode_tickets(data) -> dict:
+    return {user_id: ticket.to_dict() for user_id, ticket in data.items()}
+
+tickets = VersionedStore(TICKET_FILE, "tickets", decode=decode_tickets, encode=encode_tickets)
+
+# Tournament storage (guild ID -> current tournament)
+TOURNAMENT_FILE = "tournaments.json"
+BYE = 0  # Stands in for a missing player in a bracket slot
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Match:
+    id: int
+    bracket: str  # 'W' winners, 'L' losers, 'F' grand final
+    round: int
+    players: tuple = (None, None)  # User IDs, BYE, or None until the feeding match is decided
+    winner: Optional[int] = None
+    winner_to: Optional[tuple] = None  # (match id, slot) the winner moves to
+    loser_to: Optional[tuple] = None  # Same for the loser in double elimination
+
+    @property
+    def ready(self) -> bool:
+        return self.winner is None and None not in self.players and BYE not in self.players
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Match':
+        return cls(
+            id=data['id'],
+            bracket=data['bracket'],
+            round=data['round'],
+            players=tuple(int(player) if player is not None else None for player in data['players']),
+            winner=int(data['winner']) if data.get('winner') is not None else None,
+            winner_to=tuple(data['winner_to']) if data.get('winner_to') else None,
+            loser_to=tuple(data['loser_to']) if data.get('loser_to') else None
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'bracket': self.bracket,
+            'round': self.round,
+            'players': [str(player) if player is not None else None for player in self.players],
+            'winner': str(self.winner) if self.winner is not None else None,
+            'winner_to': list(self.winner_to) if self.winner_to else None,
+            'loser_to': list(self.loser_to) if self.loser_to else None
+        }
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Tournament:
+    id: str
+    name: str
+    capacity: int
+    double_elimination: bool
+    created_by: int
+    status: str = 'registration'  # 'registration', 'running' or 'finished'
+    participants: MappingProxyType = dataclasses.field(default_factory=lambda: MappingProxyType({}))  # User ID -> name, seed order once started
+    matches: tuple = ()
+    champion: Optional[int] = None
+    revision: int = 0  # Bumped on every change; keys the bracket image cache
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Tournament':
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            capacity=data['capacity'],
+            double_elimination=data['double_elimination'],
+            created_by=int(data['created_by']),
+            status=data['status'],
+            participants=MappingProxyType({int(user_id): name for user_id, name in data['participants'].items()}),
+            matches=tuple(Match.from_dict(match) for match in data.get('matches', ())),
+            champion=int(data['champion']) if data.get('champion') is not None else None,
+            revision=data.get('revision', 0)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'capacity': self.capacity,
+            'double_elimination': self.double_elimination,
+            'created_by': str(self.created_by),
+            'status': self.status,
+            'participants': {str(user_id): name for user_id, name in self.participants.items()},
+            'matches': [match.to_dict() for match in self.matches],
+            'champion': str(self.champion) if self.champion is not None else None,
+            'revision': self.revision
+        }
+
+def decode_tournaments(data: dict) -> MappingProxyType:
+    return freeze({guild_id: Tournament.from_dict(tournament) for guild_id, tournament in data.items()})
+
+def encode_tournaments(data) -> dict:
+    return {guild_id: tournament.to_dict() for guild_id, tournament in data.items()}
+
+tournaments = VersionedStore(TOURNAMENT_FILE, "tournaments", decode=decode_tournaments, encode=encode_tournaments)
+
+# Keyword auto-responses
+AUTO_RESPONSE_FILE = "auto_responses.json"
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AutoResponse:
+    id: int
+    trigger: str  # Casefolded
+    response: str
+    cooldown: int = 60  # Seconds before the trigger answers again in the same channel
+    whole_word: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AutoResponse':
+        return cls(
+            id=data['id'],
+            trigger=data['trigger'],
+            response=data['response'],
+            cooldown=data.get('cooldown', 60),
+            whole_word=data.get('whole_word', True)
+        )
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+def decode_auto_responses(data: dict) -> MappingProxyType:
+    return freeze({
+        guild_id: [AutoResponse.from_dict(response) for response in responses]
+        for guild_id, responses in data.items()
+    })
+
+def encode_auto_responses(data) -> dict:
+    return {guild_id: [response.to_dict() for response in responses] for guild_id, responses in data.items()}
+
+auto_responses = VersionedStore(AUTO_RESPONSE_FILE, "auto-responses", decode=decode_auto_responses, encode=encode_auto_responses)
+
+# Activity leaderboard storage
+ACTIVITY_FILE = "activity.json"
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ActivityCounts:
+    """One guild's counts. A record rather than JSON so a save copies the mapping instead of re-freezing every member"""
+    counts: MappingProxyType  # user_id -> (points, messages)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ActivityCounts':
+        return cls(MappingProxyType({user_id: tuple(counts) for user_id, counts in data.items()}))
+
+    def to_dict(self) -> dict:
+        return {user_id: list(counts) for user_id, counts in self.counts.items()}
+
+def decode_activity(data: dict) -> MappingProxyType:
+    return MappingProxyType({guild_id: ActivityCounts.from_dict(counts) for guild_id, counts in data.items()})
+
+def encode_activity(data) -> dict:
+    return {guild_id: counts.to_dict() for guild_id, counts in data.items()}
+
+activity_store = VersionedStore(ACTIVITY_FILE, "activity", decode=decode_activity, encode=encode_activity)
+
+# Sent announcements, so they can be edited or retracted later
+ANNOUNCEMENT_FILE = "announcements.json"
+ANNOUNCEMENT_HISTORY = 100  # Most recent announcements remembered per guild
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Announcement:
+    id: int
+    author: int
+    sent_at: float
+    text: Optional[str]  # None for attachment-only announcements
+    copies: tuple  # (channel_id, message_id) for every message carrying it
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Announcement':
+        return cls(
+            id=data['id'],
+            author=int(data['author']),
+            sent_at=data['sent_at'],
+            text=data.get('text'),
+            copies=tuple((int(channel_id), int(message_id)) for channel_id, message_id in data['copies'])
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'author': self.author,
+            'sent_at': self.sent_at,
+            'text': self.text,
+            'copies': [list(copy) for copy in self.copies]
+        }
+
+def decode_announcements(data: dict) -> MappingProxyType:
+    return freeze({
+        guild_id: [Announcement.from_dict(entry) for entry in entries]
+        for guild_id, entries in data.items()
+    })
+
+def encode_announcements(data) -> dict:
+    return {guild_id: [entry.to_dict() for entry in entries] for guild_id, entries in data.items()}
+
+announcements = VersionedStore(ANNOUNCEMENT_FILE, "announcements", decode=decode_announcements, encode=encode_announcements)
+
+# Self-assign role menus: reactions or buttons on a message that grant roles
+ROLE_MENU_FILE = "role_menus.json"
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RoleBinding:
+    role_id: int
+    channel_id: int
+    message_id: int
+    style: str  # 'reaction' or 'button'
+    emoji: Optional[str] = None  # As typed: a unicode emoji or <:name:id>
+    label: Optional[str] = None  # Buttons only
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RoleBinding':
+        return cls(
+            role_id=int(data['role_id']),
+            channel_id=int(data['channel_id']),
+            message_id=int(data['message_id']),
+            style=data['style'],
+            emoji=data.get('emoji'),
+            label=data.get('label')
+        )
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in dataclasses.asdict(self).items() if value is not None}
+
+def decode_role_menus(data: dict) -> MappingProxyType:
+    return freeze({
+        guild_id: [RoleBinding.from_dict(binding) for binding in bindings]
+        for guild_id, bindings in data.items()
+    })
+
+def encode_role_menus(data) -> dict:
+    return {guild_id: [binding.to_dict() for binding in bindings] for guild_id, bindings in data.items()}
+
+role_menus = VersionedStore(ROLE_MENU_FILE, "role menus", decode=decode_role_menus, encode=encode_role_menus)
 
 # Load configs on startup
-load_config()
-load_social_trackers()
+guild_configs.load()
+social_trackers.load()
+resolved_accounts.load()
+scheduled_announcements.load()
+tickets.load()
+tournaments.load()
+auto_responses.load()
+activity_store.load()
+announcements.load()
+role_menus.load()
+
+# Event loop watchdog settings
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000
+LOOP_PROFILE_FILE = os.getenv("LOOP_PROFILE_FILE")  # Enables the sampling profiler
+LOOP_PROFILE_INTERVAL = float(os.getenv("LOOP_PROFILE_INTERVAL_MS", "10")) / 1000
+
+class LoopWatchdog:
+    """Measures event loop scheduling delay and reports what was blocking it"""
+
+    def __init__(self, threshold: float = LOOP_LAG_THRESHOLD, tick: float = 0.1,
+                 profile_file: Optional[str] = LOOP_PROFILE_FILE,
+                 profile_interval: float = LOOP_PROFILE_INTERVAL):
+        self.threshold = threshold
+        self.tick = tick
+        self.profile_file = profile_file
+        self.profile_interval = profile_interval
+        self.lag_samples = deque(maxlen=3000)
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.hot_stacks = Counter()
+        self._last_tick = time.monotonic()
+        self._stall_reported = False
+        self._loop_thread_id = None
+        self._task = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.dump_profile()
+
+    async def _heartbeat(self):
+        # A sleep that wakes up late means something else held the loop
+        while True:
+            expected = time.monotonic() + self.tick
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_tick = now
+            self._stall_reported = False
+            self.lag_samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.stalls += 1
+                watchdog_log.warning("Event loop lag", extra={'latency_ms': round(lag * 1000)})
+
+    def _monitor(self):
+        interval = min(self.threshold / 4, self.profile_interval if self.profile_file else 1.0)
+        last_dump = time.monotonic()
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            if self.profile_file:
+                self.hot_stacks[self._fold(frame)] += 1
+                if time.monotonic() - last_dump > 60:
+                    self.dump_profile()
+                    last_dump = time.monotonic()
+
+            stalled = time.monotonic() - self._last_tick - self.tick
+            if stalled > self.threshold and not self._stall_reported:
+                # Capture the stack while the offender is still running
+                self._stall_reported = True
+                stack = traceback.extract_stack(frame)
+                watchdog_log.warning(
+                    "Event loop blocked in handler '%s':\n%s",
+                    self._handler_name(stack), "".join(traceback.format_list(stack[-12:])).rstrip(),
+                    extra={'latency_ms': round(stalled * 1000)}
+                )
+
+    @staticmethod
+    def _handler_name(stack) -> str:
+        """Find the first frame below asyncio/discord.py dispatch, i.e. our own handler"""
+        library_dirs = (os.path.dirname(asyncio.__file__), os.path.dirname(discord.__file__))
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index].filename.startswith(library_dirs):
+                for entry in stack[index + 1:]:
+                    if not entry.filename.startswith(library_dirs):
+                        return entry.name
+                break
+        return stack[-1].name if stack else "unknown"
+
+    @staticmethod
+    def _fold(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def dump_profile(self):
+        """Write aggregated stacks in folded format (flamegraph.pl / speedscope)"""
+        if not self.profile_file or not self.hot_stacks:
+            return
+        try:
+            with open(self.profile_file, 'w') as f:
+                for stack, count in self.hot_stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except Exception as e:
+            watchdog_log.error("Error writing loop profile", extra={'error': e})
+
+    def stats(self) -> dict:
+        samples = sorted(self.lag_samples)
+        if not samples:
+            return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "stalls": 0}
+        return {
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": self.max_lag * 1000,
+            "stalls": self.stalls
+        }
 
 @bot.event
 async def on_ready():
     global commands_synced
-    print(f"✅ Bot ready! Logged in as {bot.user}")
+    log.info("Bot ready, logged in as %s", bot.user)
     
     # Print invite link with proper scopes
     invite_url = discord.utils.oauth_url(
@@ -96,1353 +960,5648 @@ async def on_ready():
             read_message_history=True,
             mention_everyone=True,
             manage_messages=True,
-            attach_files=True
+            attach_files=True,
+            add_reactions=True,
+            manage_roles=True
         ),
         scopes=("bot", "applications.commands")
     )
-    print(f"\n🔗 Add bot to other servers using this link (MUST include 'applications.commands' scope):\n{invite_url}\n")
+    log.info("Add the bot to other servers with this link (it must include the 'applications.commands' scope): %s", invite_url)
     
     if not commands_synced:
         try:
             synced = await bot.tree.sync()
             commands_synced = True
-            print(f"✅ Synced {len(synced)} command(s) globally")
+            log.info("Synced %d command(s) globally", len(synced))
+        except Exception as e:
+            log.error("Command sync failed", extra={'error': e})
+    
+    # Start event loop watchdog
+    if not hasattr(bot, 'loop_watchdog'):
+        bot.loop_watchdog = LoopWatchdog().start()
+        mode = f", profiling to {LOOP_PROFILE_FILE}" if LOOP_PROFILE_FILE else ""
+        log.info("Started event loop watchdog (%.0fms threshold%s)", LOOP_LAG_THRESHOLD * 1000, mode)
+    
+    # Start WebSub receiver for push upload notifications
+    if WEBSUB_CALLBACK_URL and not hasattr(bot, 'youtube_feed'):
+        try:
+            bot.youtube_feed = await YouTubeFeedReceiver().start()
+            log.info("Started YouTube WebSub receiver on port %d", WEBSUB_PORT)
         except Exception as e:
-            print(f"❌ Command sync failed: {e}")
+            log.error("WebSub receiver failed to start", extra={'error': e})
+    
+    # Start announcement scheduler
+    if not hasattr(bot, 'announcement_scheduler'):
+        bot.announcement_scheduler = AnnouncementScheduler(scheduled_announcements).start()
+        log.info("Started announcement scheduler (%d pending)", len(scheduled_announcements))
+    
+    # Start activity count flusher
+    if not hasattr(bot, 'activity_flusher'):
+        bot.activity_flusher = activity.start()
+        log.info("Saving activity counts every %.0fs", ACTIVITY_FLUSH_INTERVAL)
+    
+    # Start config file watcher
+    if not hasattr(bot, 'config_watcher'):
+        bot.config_watcher = bot.loop.create_task(watch_config_files())
+        log.info("Watching %s and %s for edits", CONFIG_FILE, SOCIAL_FILE)
     
     # Start social task
     if not hasattr(bot, 'social_task'):
         bot.social_task = bot.loop.create_task(social_update_task())
-        print("✅ Started social media tracking task")
+        log.info("Started social media tracking task")
+
+# Hot reload of hand-edited config files
+async def watch_config_files():
+    while not bot.is_closed():
+        await asyncio.sleep(CONFIG_WATCH_INTERVAL)
+        for store in (guild_configs, social_trackers):
+            try:
+                reloaded = await asyncio.to_thread(store.reload_if_changed)
+                # New YouTube channels in a hand-edited file need push subscriptions too
+                receiver = getattr(bot, 'youtube_feed', None)
+                if reloaded and store is social_trackers and receiver:
+                    await receiver.sync_subscriptions()
+            except Exception as e:
+                storage_log.error("Error reloading %s", store.label, extra={'error': e})
+        try:
+            await link_filter.reload_if_changed()
+        except Exception as e:
+            moderation_log.error("Error reloading link lists", extra={'error': e})
 
 # Background task for social updates
+SOCIAL_CHECK_INTERVAL = 300  # Every 5 minutes; YouTube stretches this when its quota runs low
+
 async def social_update_task():
     await bot.wait_until_ready()
     while not bot.is_closed():
         try:
             await check_social_updates()
-        except Exception as e:
-            print(f"⚠️ Social update error: {e}")
-        await asyncio.sleep(300)  # Check every 5 minutes
+        except Exception:
+            tracker_log.exception("Social update error")
+        try:
+            await check_youtube_uploads()
+        except Exception:
+            youtube_log.exception("YouTube upload check error")
+        await asyncio.sleep(SOCIAL_CHECK_INTERVAL)
+
+# Social platform providers
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class TrackerSetupError(Exception):
+    """Raised when an account URL can't be resolved into a tracker"""
+
+    def __init__(self, title: str, description: str):
+        super().__init__(description)
+        self.title = title
+        self.description = description
+
+class RateLimiter:
+    """Token bucket shared by every request to one platform"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def parse_compact_count(text: str) -> int:
+    """Convert counts like '1,234', '12.5K' or '3M' into an int"""
+    text = text.strip().replace(',', '')
+    multipliers = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+    suffix = text[-1:].upper()
+    if suffix in multipliers:
+        return int(float(text[:-1]) * multipliers[suffix])
+    return int(float(text))
+
+def account_slug(url: str, marker: str) -> str:
+    """Return the path segment following marker, e.g. the username in instagram.com/<name>/"""
+    return url.split(marker, 1)[1].split("/")[0].split("?")[0].lstrip("@")
+
+class SocialProvider:
+    """
+    Base class for a trackable platform.
+
+    Subclasses implement resolve() to turn a profile URL into tracker fields and
+    fetch_counts() to fetch current counts for up to batch_size accounts at once.
+    Both are blocking and are run in worker threads; the sweep engine handles
+    batching, parallelism, rate limiting and caching for every provider.
+    """
+    name = ""
+    label = ""
+    unit = "followers"
+    embed_title = ""
+    color = discord.Color.blue()
+    thumbnail = None
+    batch_size = 1
+    concurrency = 4
+    rate = 2.0
+    burst = 2
+    cache_ttl = 60
+    disabled_reason = ""
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update(BROWSER_HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(self.concurrency, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter = RateLimiter(self.rate, self.burst)
+        self._cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.resolve_hits = 0
+
+    def enabled(self) -> bool:
+        return True
+
+    def due(self, account_count: int) -> bool:
+        """Whether this sweep should check the platform; quota-limited platforms sit some out"""
+        return True
 
-async def check_social_updates():
-    for guild_id, trackers in list(social_trackers.items()):
-        for tracker in trackers[:]:  # Use copy for safe iteration
+    def resolve(self, url: str) -> dict:
+        raise NotImplementedError
+
+    def redirect(self, endpoint: str):
+        """Send every request to endpoint (e.g. benchmarks/stubs.py) instead of the platform, with stand-in credentials"""
+        raise NotImplementedError
+
+    def resolution_key(self, url: str) -> Optional[str]:
+        """Normalised handle or ID a URL points at, for the resolution cache; None to always resolve"""
+        return None
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        """Return {account_id: (count, display_name or None)} for the accounts found"""
+        raise NotImplementedError
+
+    def resolve_chunks(self, urls: list) -> list:
+        """Group URLs into the chunks resolve_batch() takes; one per call unless the API looks up several at once"""
+        return [[url] for url in urls]
+
+    def resolve_batch(self, urls: list) -> dict:
+        """Resolve one chunk of URLs: {url: fields, or the exception resolving it raised}"""
+        results = {}
+        for url in urls:
             try:
-                if tracker['platform'] == 'youtube':
-                    await check_youtube_update(guild_id, tracker)
-                elif tracker['platform'] == 'instagram':
-                    await check_instagram_update(guild_id, tracker)
+                results[url] = self.resolve(url)
             except Exception as e:
-                print(f"⚠️ Error checking {tracker['platform']} tracker: {e}")
+                results[url] = e
+        return results
 
-async def check_youtube_update(guild_id, tracker):
-    if not youtube_service:
-        return
+    async def resolve_account(self, url: str) -> dict:
+        """
+        Resolve a URL, reusing what any guild resolved within RESOLVE_CACHE_TTL.
+        Stale entries are revalidated, and still served if that fails.
+        """
+        key = self.resolution_key(url)
+        cache_key = f"{self.name}:{key}" if key else None
+        cached = resolved_accounts.get(cache_key) if cache_key else None
+        if cached and time.time() - cached['resolved_at'] < RESOLVE_CACHE_TTL:
+            self.resolve_hits += 1
+            return self._with_latest_count(thaw(cached['fields']))
         
-    try:
-        request = youtube_service.channels().list(
-            part='statistics,snippet',
-            id=tracker['channel_id']
-        )
-        response = request.execute()
+        await self.limiter.acquire()
+        try:
+            fields = await asyncio.to_thread(self.resolve, url)
+        except Exception as e:
+            if cached is None:
+                raise
+            tracker_log.warning("Couldn't revalidate %s, using the cached resolution", cache_key, extra={'platform': str(self.name), 'error': e})
+            return self._with_latest_count(thaw(cached['fields']))
         
-        if not response.get('items'):
-            return
+        self._remember({url: fields})
+        return fields
+
+    async def resolve_accounts(self, urls: list) -> dict:
+        """
+        resolve_account() for many URLs at once. Chunks from resolve_chunks()
+        run on up to concurrency worker threads under the platform's rate
+        limit. Returns {url: fields, or the exception resolving it raised}.
+        """
+        results = {}
+        stale = {}
+        missing = []
+        now = time.time()
+        for url in dict.fromkeys(urls):
+            key = self.resolution_key(url)
+            cached = resolved_accounts.get(f"{self.name}:{key}") if key else None
+            if cached and now - cached['resolved_at'] < RESOLVE_CACHE_TTL:
+                self.resolve_hits += 1
+                results[url] = self._with_latest_count(thaw(cached['fields']))
+                continue
+            if cached:
+                stale[url] = cached
+            missing.append(url)
         
-        stats = response['items'][0]['statistics']
-        current_subs = int(stats['subscriberCount'])
-        last_subs = tracker.get('last_count', 0)
+        pool = asyncio.Semaphore(self.concurrency)
         
-        if current_subs > last_subs:
-            # Get channel name
-            channel_name = response['items'][0]['snippet']['title']
-            
-            # Calculate growth
-            growth = current_subs - last_subs
-            
-            # Update tracker
-            tracker['last_count'] = current_subs
-            save_social_trackers()
-            
-            # Send notification
-            channel = bot.get_channel(int(tracker['post_channel']))
-            if channel:
-                embed = discord.Embed(
-                    title="🎉 YouTube Milestone Reached!",
-                    description=(
-                        f"**{channel_name}** just hit **{current_subs:,} subscribers**!\n"
-                        f"`+{growth:,}` since last update"
-                    ),
-                    color=discord.Color.red(),
-                    url=tracker['url']
-                )
-                embed.set_thumbnail(url="https://i.imgur.com/krKzGz0.png")
-                embed.set_footer(text="Nexus Esports Social Tracker")
-                await channel.send(embed=embed)
-    except HttpError as e:
-        print(f"YouTube API error: {e}")
-    except Exception as e:
-        print(f"General YouTube error: {e}")
-
-async def check_instagram_update(guild_id, tracker):
-    # Instagram requires web scraping - use carefully
-    try:
-        response = requests.get(tracker['url'], headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        async def resolve_chunk(chunk: list) -> dict:
+            async with pool:
+                await self.limiter.acquire()
+                try:
+                    return await asyncio.to_thread(self.resolve_batch, chunk)
+                except Exception as e:
+                    return dict.fromkeys(chunk, e)
         
-        # Find follower count in meta tags
-        meta_tag = soup.find('meta', property='og:description')
-        if meta_tag:
-            content = meta_tag.get('content', '')
-            # Extract follower count from string like "1M Followers, 500 Following..."
-            if 'Followers' in content:
-                followers_str = content.split(' Followers')[0].split(' ')[-1]
-                # Convert to number
-                if followers_str.endswith('K'):
-                    current_followers = int(float(followers_str.replace('K', '')) * 1000)
-                elif followers_str.endswith('M'):
-                    current_followers = int(float(followers_str.replace('M', '')) * 1000000)
+        resolved = {}
+        for chunk in await asyncio.gather(*(resolve_chunk(chunk) for chunk in self.resolve_chunks(missing))):
+            for url, fields in chunk.items():
+                if not isinstance(fields, Exception):
+                    resolved[url] = results[url] = fields
+                elif url in stale:
+                    results[url] = self._with_latest_count(thaw(stale[url]['fields']))
                 else:
-                    current_followers = int(followers_str.replace(',', ''))
+                    results[url] = fields
+        self._remember(resolved)
+        return results
+
+    def _remember(self, resolved: dict):
+        """Cache {url: fields}, under the canonical ID as well so the channel URL and the handle share an entry"""
+        mutators = {}
+        now = time.time()
+        for url, fields in resolved.items():
+            entry = {'fields': fields, 'resolved_at': now}
+            for name in {self.resolution_key(url), self.resolution_key(fields['url'])}:
+                if name:
+                    mutators[f"{self.name}:{name}"] = functools.partial(dict.update, **entry)
+        if mutators:
+            resolved_accounts.update_many(mutators)
+
+    def _with_latest_count(self, fields: dict) -> dict:
+        """A cached resolution's count can be days old; use what the sweeps saw since, when there is one"""
+        account_id = fields.get('channel_id') or fields.get('account_id') or fields['account_name']
+        swept = self.cached_count(account_id)
+        if swept is not None:
+            fields['last_count'] = swept[0]
+            return fields
+        for trackers in social_trackers.values():
+            for tracker in trackers:
+                if tracker.platform == self.name and tracker.account_id == account_id:
+                    fields['last_count'] = max(fields['last_count'], tracker.last_count)
+        return fields
+
+    def cached_count(self, account_id: str, now: Optional[float] = None):
+        """The (count, name) fetched within cache_ttl seconds, or None"""
+        cached = self._cache.get(account_id)
+        if cached and (now if now is not None else time.monotonic()) - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+
+    async def get_counts(self, account_ids: list) -> dict:
+        """Fetch counts, reusing results fetched within cache_ttl seconds"""
+        now = time.monotonic()
+        results = {}
+        missing = []
+        for account_id in account_ids:
+            cached = self.cached_count(account_id, now)
+            if cached is not None:
+                results[account_id] = cached
             else:
-                return
-        else:
-            return
-        
-        last_followers = tracker.get('last_count', 0)
-        
-        if current_followers > last_followers:
-            # Update tracker
-            tracker['last_count'] = current_followers
-            save_social_trackers()
-            
-            # Send notification
-            channel = bot.get_channel(int(tracker['post_channel']))
-            if channel:
-                growth = current_followers - last_followers
-                embed = discord.Embed(
-                    title="📸 Instagram Growth!",
-                    description=(
-                        f"**{tracker['account_name']}** now has **{current_followers:,} followers**!\n"
-                        f"`+{growth:,}` since last update"
-                    ),
-                    color=discord.Color.purple(),
-                    url=tracker['url']
-                )
-                embed.set_thumbnail(url="https://i.imgur.com/vn8M9aO.png")
-                embed.set_footer(text="Nexus Esports Social Tracker")
-                await channel.send(embed=embed)
-    except Exception as e:
-        print(f"Instagram scraping failed: {e}")
+                missing.append(account_id)
+        self.cache_hits += len(results)
+        self.cache_misses += len(missing)
+        if missing:
+            await self.limiter.acquire()
+            fetched = await asyncio.to_thread(self.fetch_counts, missing)
+            fetched_at = time.monotonic()
+            for account_id, value in fetched.items():
+                self._cache[account_id] = (fetched_at, value)
+            results.update(fetched)
+        return results
 
-# Auto-reply to DMs
-@bot.event
-async def on_message(message):
-    # Check if it's a DM and not from the bot itself
-    if isinstance(message.channel, discord.DMChannel) and message.author != bot.user:
-        # Create professional response embed
+    def growth_embed(self, tracker: Tracker, name: str, count: int, growth: int) -> discord.Embed:
         embed = discord.Embed(
-            title="📬 Nexus Esports Support",
+            title=self.embed_title,
             description=(
-                "Thank you for your message!\n\n"
-                "For official support, please contact:\n"
-                "• **@acroneop** in our Official Server\n"
-                "• Join: https://discord.gg/xPGJCWpMbM\n\n"
-                "We'll assist you as soon as possible!"
+                f"**{name}** now has **{count:,} {self.unit}**!\n"
+                f"`+{growth:,}` since last update"
             ),
-            color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            color=self.color,
+            url=tracker.url
         )
-        # Set footer with required text
-        embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-        
-        # Try to send the response
-        try:
-            await message.channel.send(embed=embed)
-        except discord.Forbidden:
-            # Can't send message back (user blocked bot or closed DMs)
-            pass
-    
-    # Process commands (important for command functionality)
-    await bot.process_commands(message)
+        if self.thumbnail:
+            embed.set_thumbnail(url=self.thumbnail)
+        embed.set_footer(text="Nexus Esports Social Tracker")
+        return embed
 
-def create_embed(title: str = None, description: str = None, color: discord.Color = discord.Color(0x3e0000)) -> discord.Embed:
-    """Helper function to create consistent embeds"""
-    embed = discord.Embed(
-        title=title,
-        description=description,
-        color=color,
-        timestamp=datetime.utcnow()
-    )
-    # Set footer with required text
-    embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-    return embed
+# YouTube Data API quota
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))  # Units per key per Pacific day
+YOUTUBE_QUOTA_RESERVE = float(os.getenv("YOUTUBE_QUOTA_RESERVE", "0.1"))  # Share of each key only tracker setup and live checks may use
+YOUTUBE_QUOTA_COSTS = {'channels': 1, 'videos': 1, 'search': 100}  # Units per list() call
+YOUTUBE_QUOTA_FILE = "youtube_quota.json"
 
-def has_announcement_permission(interaction: discord.Interaction) -> bool:
-    """Check if user has announcement permissions through role or manage_messages"""
-    if not interaction.guild:
-        return False
-    
-    guild_id = str(interaction.guild.id)
-    
+try:
+    PACIFIC = ZoneInfo("America/Los_Angeles")  # Quota resets at midnight Pacific
+except ZoneInfoNotFoundError:
+    PACIFIC = timezone(timedelta(hours=-8))  # No tzdata: resets are an hour off during daylight saving
+
+class QuotaExhausted(Exception):
+    """Raised when no YouTube API key has quota left for a call"""
+
+class YouTubeQuota:
+    """
+    Counts the units every YouTube API call spends against each key's daily
+    quota, persisted so restarts don't forget what was spent. Calls go to the
+    key with the most units left, and a key the API reports as exhausted is
+    retired until the next reset. Background sweeps leave a reserve untouched
+    for tracker setup and live checks, and are spread out so the rest of the
+    day's budget lasts until midnight Pacific.
+    """
+
+    def __init__(self, keys: list, daily_quota: int, path: str):
+        self.daily_quota = daily_quota
+        self.usage = VersionedStore(path, "YouTube quota")  # Key fingerprint -> {'day', 'used'}
+        self.refused = 0
+        self.interval = SOCIAL_CHECK_INTERVAL
+        self.last_sweep = None
+        self._lock = threading.Lock()  # Calls are charged from worker threads
+        self.configure(keys)
+
+    def configure(self, keys: list, api_endpoint: Optional[str] = None):
+        # Usage is stored under a fingerprint so the keys themselves never hit the disk
+        options = {'api_endpoint': api_endpoint} if api_endpoint else None
+        self.services = {
+            hashlib.sha256(key.encode()).hexdigest()[:12]: build(
+                'youtube', 'v3', developerKey=key, client_options=options, static_discovery=True
+            )
+            for key in keys
+        }
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(PACIFIC).date().isoformat()
+
+    @staticmethod
+    def seconds_until_reset() -> float:
+        now = datetime.now(PACIFIC)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=PACIFIC)
+        return max(1.0, midnight.timestamp() - time.time())
+
+    def used(self, fingerprint: str, day: Optional[str] = None) -> int:
+        entry = self.usage.get(fingerprint)
+        return entry['used'] if entry and entry['day'] == (day or self.today()) else 0
+
+    def remaining(self) -> int:
+        day = self.today()
+        return sum(max(0, self.daily_quota - self.used(fingerprint, day)) for fingerprint in self.services)
+
+    def _charge(self, day: str, units: int, entry: dict):
+        if entry.get('day') != day:
+            entry.update(day=day, used=0)
+        entry['used'] += units
+
+    def acquire(self, units: int, interactive: bool):
+        """Charge a call to the key with the most quota left; returns (fingerprint, service)"""
+        floor = 0 if interactive else int(self.daily_quota * YOUTUBE_QUOTA_RESERVE)
+        day = self.today()
+        with self._lock:
+            left, fingerprint = max(
+                ((self.daily_quota - self.used(fingerprint, day), fingerprint) for fingerprint in self.services),
+                default=(0, None)
+            )
+            if fingerprint is None or left - units < floor:
+                self.refused += 1
+                raise QuotaExhausted(f"YouTube quota exhausted until midnight Pacific ({self.remaining():,} units left)")
+            self.usage.update(fingerprint, functools.partial(self._charge, day, units))
+        return fingerprint, self.services[fingerprint]
+
+    def exhaust(self, fingerprint: str):
+        """The API says this key is out of quota, whatever our count says"""
+        day = self.today()
+        youtube_log.warning("YouTube key %s hit its quota; rotating to the next key", fingerprint)
+        with self._lock:
+            self.usage.update(fingerprint, functools.partial(self._charge, day, max(0, self.daily_quota - self.used(fingerprint, day))))
+
+    def sweep_due(self, calls: int) -> bool:
+        """
+        Whether a sweep needing `calls` units should run now. The interval
+        stretches beyond SOCIAL_CHECK_INTERVAL when the budget left today
+        can't afford a sweep that often until the reset.
+        """
+        reserve = int(self.daily_quota * YOUTUBE_QUOTA_RESERVE) * len(self.services)
+        budget = self.remaining() - reserve
+        until_reset = self.seconds_until_reset()
+        sweeps = budget // max(1, calls)
+        self.interval = until_reset if sweeps <= 0 else max(SOCIAL_CHECK_INTERVAL, until_reset / sweeps)
+        now = time.monotonic()
+        if sweeps <= 0 or (self.last_sweep is not None and now - self.last_sweep < self.interval):
+            return False
+        self.last_sweep = now
+        return True
+
+    def summary(self) -> str:
+        total = self.daily_quota * len(self.services)
+        return (
+            f"{self.remaining():,}/{total:,} units left on {len(self.services)} keys • "
+            f"resets <t:{int(time.time() + self.seconds_until_reset())}:R> • "
+            f"sweeping every {self.interval / 60:.0f} min • {self.refused} calls refused"
+        )
+
+youtube_quota = YouTubeQuota(YOUTUBE_API_KEYS, YOUTUBE_DAILY_QUOTA, YOUTUBE_QUOTA_FILE)
+youtube_quota.usage.load()
+
+def is_quota_error(error: HttpError) -> bool:
+    return error.resp.status == 403 and any(
+        reason in error.content for reason in (b'quotaExceeded', b'dailyLimitExceeded')
+    )
+
+class YouTubeProvider(SocialProvider):
+    name = Platform.YOUTUBE
+    label = "YouTube"
+    unit = "subscribers"
+    embed_title = "🎉 YouTube Milestone Reached!"
+    color = discord.Color.red()
+    thumbnail = "https://i.imgur.com/krKzGz0.png"
+    batch_size = 50  # channels().list accepts up to 50 IDs per call
+    concurrency = 2
+    rate = 5.0
+    burst = 5
+    disabled_reason = "YouTube API key not configured"
+
+    def __init__(self):
+        super().__init__()
+        # The API client's shared httplib2 connection isn't thread-safe, so each worker gets its own
+        self._local = threading.local()
+
+    def enabled(self) -> bool:
+        return bool(youtube_quota.services)
+
+    def redirect(self, endpoint: str):
+        # A key of its own, so stub calls aren't charged to the real keys' quota
+        youtube_quota.configure(["sweep-stub"], api_endpoint=endpoint)
+
+    def due(self, account_count: int) -> bool:
+        return youtube_quota.sweep_due(-(-account_count // self.batch_size) * YOUTUBE_QUOTA_COSTS['channels'])
+
+    def _execute(self, resource: str, interactive: bool = False, **params):
+        """Run resource().list(**params) on the key with the most quota left, moving on from exhausted keys"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=10)
+        while True:
+            fingerprint, service = youtube_quota.acquire(YOUTUBE_QUOTA_COSTS[resource], interactive)
+            try:
+                return getattr(service, resource)().list(**params).execute(http=http)
+            except HttpError as e:
+                if not is_quota_error(e):
+                    raise
+                youtube_quota.exhaust(fingerprint)
+
+    def _execute_interactive(self, resource: str, **params):
+        # Tracker setup may use the reserve; when even that is gone, say so instead of failing
+        try:
+            return self._execute(resource, interactive=True, **params)
+        except QuotaExhausted as e:
+            raise TrackerSetupError("❌ YouTube Quota Exhausted", f"{e}. Try again after the reset.")
+
+    def resolution_key(self, url: str) -> Optional[str]:
+        if "youtube.com/channel/" in url:
+            return account_slug(url, "youtube.com/channel/")
+        if "youtube.com/@" in url:
+            return "@" + account_slug(url, "youtube.com/@").lower()  # Handles are case-insensitive
+        return None
+
+    def resolve(self, url: str) -> dict:
+        # One call either way: forHandle returns the same parts as a lookup by ID
+        if "youtube.com/channel/" in url:
+            response = self._execute_interactive(
+                'channels',
+                part='id,statistics,snippet',
+                id=account_slug(url, "youtube.com/channel/")
+            )
+        elif "youtube.com/@" in url:
+            response = self._execute_interactive(
+                'channels',
+                part='id,statistics,snippet',
+                forHandle=account_slug(url, "youtube.com/@")
+            )
+        else:
+            raise TrackerSetupError("❌ Invalid URL", "Please provide a valid YouTube channel URL")
+        if not response.get('items'):
+            raise TrackerSetupError("❌ Channel Not Found", "Couldn't find YouTube channel")
+        return self._channel_fields(response['items'][0])
+
+    def _channel_fields(self, item: dict) -> dict:
+        return {
+            'url': f"https://www.youtube.com/channel/{item['id']}",
+            'channel_id': item['id'],
+            'account_name': item['snippet']['title'],
+            'last_count': int(item['statistics'].get('subscriberCount', 0))
+        }
+
+    def resolve_chunks(self, urls: list) -> list:
+        # Channel IDs are looked up batch_size per call; handles only one at a time
+        by_id = [url for url in urls if "youtube.com/channel/" in url]
+        chunks = [by_id[start:start + self.batch_size] for start in range(0, len(by_id), self.batch_size)]
+        return chunks + [[url] for url in urls if "youtube.com/channel/" not in url]
+
+    def resolve_batch(self, urls: list) -> dict:
+        if len(urls) == 1:
+            return super().resolve_batch(urls)
+        channel_ids = {url: account_slug(url, "youtube.com/channel/") for url in urls}
+        response = self._execute_interactive(
+            'channels',
+            part='id,statistics,snippet',
+            id=",".join(set(channel_ids.values())),
+            maxResults=self.batch_size
+        )
+        items = {item['id']: item for item in response.get('items', [])}
+        return {
+            url: self._channel_fields(items[channel_id]) if channel_id in items
+            else TrackerSetupError("❌ Channel Not Found", "Couldn't find YouTube channel")
+            for url, channel_id in channel_ids.items()
+        }
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        response = self._execute(
+            'channels',
+            part='statistics,snippet',
+            id=",".join(account_ids),
+            maxResults=len(account_ids)
+        )
+        return {
+            item['id']: (int(item['statistics']['subscriberCount']), item['snippet']['title'])
+            for item in response.get('items', [])
+            if 'subscriberCount' in item.get('statistics', {})
+        }
+
+    def growth_embed(self, tracker: Tracker, name: str, count: int, growth: int) -> discord.Embed:
+        embed = super().growth_embed(tracker, name, count, growth)
+        embed.description = (
+            f"**{name}** just hit **{count:,} subscribers**!\n"
+            f"`+{growth:,}` since last update"
+        )
+        return embed
+
+class InstagramProvider(SocialProvider):
+    # Instagram requires web scraping - use carefully
+    name = Platform.INSTAGRAM
+    label = "Instagram"
+    embed_title = "📸 Instagram Growth!"
+    color = discord.Color.purple()
+    thumbnail = "https://i.imgur.com/vn8M9aO.png"
+    concurrency = 2
+    rate = 1.0
+    burst = 2
+    base_url = "https://www.instagram.com"
+
+    def profile_url(self, username: str) -> str:
+        return f"{self.base_url}/{username}/"
+
+    def redirect(self, endpoint: str):
+        self.base_url = endpoint
+
+    def _fetch_followers(self, username: str) -> Optional[int]:
+        response = self.session.get(self.profile_url(username), timeout=10)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # Find follower count in meta tags, e.g. "1M Followers, 500 Following..."
+        meta_tag = soup.find('meta', property='og:description')
+        if not meta_tag:
+            return None
+        content = meta_tag.get('content', '')
+        if 'Followers' not in content:
+            return None
+        return parse_compact_count(content.split(' Followers')[0].split(' ')[-1])
+
+    def resolution_key(self, url: str) -> Optional[str]:
+        return account_slug(url, "instagram.com/").lower() if "instagram.com/" in url else None
+
+    def resolve(self, url: str) -> dict:
+        if "instagram.com/" not in url:
+            raise TrackerSetupError("❌ Invalid URL", "Please provide a valid Instagram profile URL")
+        username = account_slug(url, "instagram.com/")
+        
+        # Get initial follower count (approximate)
+        try:
+            followers = self._fetch_followers(username)
+        except ValueError as e:
+            tracker_log.warning("Instagram follower parse error", extra={'platform': 'instagram', 'tracker': username, 'error': e})
+            followers = 0
+        if followers is None:
+            raise TrackerSetupError("❌ Account Not Found", "Couldn't fetch Instagram data")
+        return {
+            'url': f"https://www.instagram.com/{username}/",
+            'account_name': username,
+            'last_count': followers
+        }
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        counts = {}
+        for username in account_ids:
+            followers = self._fetch_followers(username)
+            if followers is not None:
+                counts[username] = (followers, None)
+        return counts
+
+class TwitchProvider(SocialProvider):
+    name = Platform.TWITCH
+    label = "Twitch"
+    embed_title = "🟣 Twitch Growth!"
+    color = discord.Color(0x9146FF)
+    concurrency = 4
+    rate = 10.0
+    burst = 10
+    disabled_reason = "Twitch client ID/secret not configured"
+    api_url = "https://api.twitch.tv/helix"
+    token_url = "https://id.twitch.tv/oauth2/token"
+
+    def __init__(self):
+        super().__init__()
+        self.client_id = os.getenv("TWITCH_CLIENT_ID")
+        self.client_secret = os.getenv("TWITCH_CLIENT_SECRET")
+        self._token = None
+        self._token_expires = 0.0
+        self._token_lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return bool(self.client_id and self.client_secret)
+
+    def redirect(self, endpoint: str):
+        self.api_url = f"{endpoint}/helix"
+        self.token_url = f"{endpoint}/oauth2/token"
+        self.client_id = self.client_secret = "sweep-stub"
+        self._token = None
+
+    def _headers(self) -> dict:
+        # App access tokens last ~60 days; refresh a minute early
+        with self._token_lock:
+            if not self._token or time.time() > self._token_expires - 60:
+                response = self.session.post(self.token_url, data={
+                    'client_id': self.client_id,
+                    'client_secret': self.client_secret,
+                    'grant_type': 'client_credentials'
+                }, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+                self._token = data['access_token']
+                self._token_expires = time.time() + data.get('expires_in', 3600)
+            return {'Client-Id': self.client_id, 'Authorization': f"Bearer {self._token}"}
+
+    def _get(self, path: str, params) -> dict:
+        response = self.session.get(f"{self.api_url}/{path}", params=params, headers=self._headers(), timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def resolve(self, url: str) -> dict:
+        if "twitch.tv/" not in url:
+            raise TrackerSetupError("❌ Invalid URL", "Please provide a valid Twitch channel URL")
+        login = account_slug(url, "twitch.tv/").lower()
+        users = self._get("users", {'login': login}).get('data', [])
+        if not users:
+            raise TrackerSetupError("❌ Channel Not Found", "Couldn't find Twitch channel")
+        user = users[0]
+        followers = self._get("channels/followers", {'broadcaster_id': user['id'], 'first': 1})
+        return {
+            'url': f"https://www.twitch.tv/{user['login']}",
+            'account_id': user['id'],
+            'account_name': user['display_name'],
+            'last_count': int(followers.get('total', 0))
+        }
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        # The followers endpoint takes one broadcaster per call
+        counts = {}
+        for broadcaster_id in account_ids:
+            data = self._get("channels/followers", {'broadcaster_id': broadcaster_id, 'first': 1})
+            counts[broadcaster_id] = (int(data.get('total', 0)), None)
+        return counts
+
+class TikTokProvider(SocialProvider):
+    # TikTok has no public follower API - scrape the profile page's hydration JSON
+    name = Platform.TIKTOK
+    label = "TikTok"
+    embed_title = "🎵 TikTok Growth!"
+    color = discord.Color(0x25F4EE)
+    concurrency = 2
+    rate = 1.0
+    burst = 2
+    base_url = "https://www.tiktok.com"
+
+    def redirect(self, endpoint: str):
+        self.base_url = endpoint
+
+    def _fetch_profile(self, username: str):
+        response = self.session.get(f"{self.base_url}/@{username}", timeout=10)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        script = soup.find('script', id='__UNIVERSAL_DATA_FOR_REHYDRATION__')
+        if not script or not script.string:
+            return None
+        data = json.loads(script.string)
+        user_info = data.get('__DEFAULT_SCOPE__', {}).get('webapp.user-detail', {}).get('userInfo')
+        if not user_info:
+            return None
+        return int(user_info['stats']['followerCount']), user_info['user'].get('nickname') or username
+
+    def resolve(self, url: str) -> dict:
+        if "tiktok.com/@" not in url:
+            raise TrackerSetupError("❌ Invalid URL", "Please provide a valid TikTok profile URL")
+        username = account_slug(url, "tiktok.com/@")
+        profile = self._fetch_profile(username)
+        if profile is None:
+            raise TrackerSetupError("❌ Account Not Found", "Couldn't fetch TikTok data")
+        return {
+            'url': f"https://www.tiktok.com/@{username}",
+            'account_id': username,
+            'account_name': profile[1],
+            'last_count': profile[0]
+        }
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        counts = {}
+        for username in account_ids:
+            profile = self._fetch_profile(username)
+            if profile is not None:
+                counts[username] = profile
+        return counts
+
+class XProvider(SocialProvider):
+    name = Platform.X
+    label = "X (Twitter)"
+    embed_title = "🐦 X Growth!"
+    color = discord.Color(0x000000)
+    batch_size = 100  # users/by accepts up to 100 usernames per call
+    concurrency = 1
+    rate = 0.3  # 300 requests per 15 minutes
+    burst = 5
+    disabled_reason = "X API bearer token not configured"
+    api_url = "https://api.x.com/2"
+
+    def __init__(self):
+        super().__init__()
+        self.bearer_token = os.getenv("X_BEARER_TOKEN")
+
+    def enabled(self) -> bool:
+        return bool(self.bearer_token)
+
+    def redirect(self, endpoint: str):
+        self.api_url = f"{endpoint}/x/2"
+        self.bearer_token = "sweep-stub"
+
+    def _lookup(self, usernames: list) -> list:
+        response = self.session.get(
+            f"{self.api_url}/users/by",
+            params={'usernames': ",".join(usernames), 'user.fields': 'public_metrics'},
+            headers={'Authorization': f"Bearer {self.bearer_token}"},
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json().get('data', [])
+
+    def _username(self, url: str) -> str:
+        for marker in ("x.com/", "twitter.com/"):
+            if marker in url:
+                return account_slug(url, marker)
+        raise TrackerSetupError("❌ Invalid URL", "Please provide a valid X profile URL")
+
+    def _user_fields(self, user: dict) -> dict:
+        return {
+            'url': f"https://x.com/{user['username']}",
+            'account_id': user['username'].lower(),
+            'account_name': user['name'],
+            'last_count': int(user['public_metrics']['followers_count'])
+        }
+
+    def resolve(self, url: str) -> dict:
+        users = self._lookup([self._username(url)])
+        if not users:
+            raise TrackerSetupError("❌ Account Not Found", "Couldn't find X account")
+        return self._user_fields(users[0])
+
+    def resolve_chunks(self, urls: list) -> list:
+        return [urls[start:start + self.batch_size] for start in range(0, len(urls), self.batch_size)]
+
+    def resolve_batch(self, urls: list) -> dict:
+        results = {}
+        usernames = {}
+        for url in urls:
+            try:
+                usernames[url] = self._username(url).lower()
+            except TrackerSetupError as e:
+                results[url] = e
+        if usernames:
+            users = {user['username'].lower(): user for user in self._lookup(list(set(usernames.values())))}
+            for url, username in usernames.items():
+                results[url] = (
+                    self._user_fields(users[username]) if username in users
+                    else TrackerSetupError("❌ Account Not Found", "Couldn't find X account")
+                )
+        return results
+
+    def fetch_counts(self, account_ids: list) -> dict:
+        return {
+            user['username'].lower(): (int(user['public_metrics']['followers_count']), user['name'])
+            for user in self._lookup(account_ids)
+        }
+
+PLATFORM_PROVIDERS = {}
+
+def register_provider(provider: SocialProvider):
+    PLATFORM_PROVIDERS[provider.name] = provider
+    return provider
+
+for provider_class in (YouTubeProvider, InstagramProvider, TwitchProvider, TikTokProvider, XProvider):
+    register_provider(provider_class())
+
+class SweepReport:
+    """What one sweep fetched and found, for `python main.py sweep`"""
+
+    def __init__(self):
+        self.accounts = []  # (platform, account_id, trackers, fetch seconds, cached, count or None)
+        self.deltas = []  # (guild_id, tracker, new count)
+        self.errors = []  # (platform, batch size, error)
+        self.skipped = Counter()  # Trackers on platforms that aren't configured
+        self.deferred = {}  # Platform -> accounts left for a later sweep to save quota
+        self.wall = 0.0
+
+    def print(self, dry_run: bool):
+        print(f"{'platform':<10} {'account':<32} {'trackers':>8} {'fetch ms':>9} {'cache':>6} {'count':>14}")
+        for platform, account_id, trackers, seconds, cached, count in sorted(self.accounts, key=lambda row: -row[3]):
+            shown = f"{count:,}" if count is not None else "not found"
+            print(f"{platform:<10} {account_id[:32]:<32} {trackers:>8} {seconds * 1000:>9.1f} {'hit' if cached else 'miss':>6} {shown:>14}")
+
+        print(f"\n{len(self.deltas)} growth notifications would have been posted:" if self.deltas else "\nNo growth to post")
+        for guild_id, tracker, count in self.deltas:
+            print(
+                f"  guild {guild_id} • {tracker.platform} {tracker.account_name} • "
+                f"{tracker.last_count:,} → {count:,} (+{count - tracker.last_count:,}) in channel {tracker.post_channel}"
+            )
+
+        hits = sum(1 for row in self.accounts if row[4])
+        print(
+            f"\nSwept {len(self.accounts)} accounts ({sum(row[2] for row in self.accounts)} trackers) in "
+            f"{self.wall * 1000:.0f}ms • cache hits {hits}/{len(self.accounts)}"
+        )
+        for platform, count in self.skipped.items():
+            print(f"⚠️ Skipped {count} {platform} trackers: {PLATFORM_PROVIDERS[platform].disabled_reason if platform in PLATFORM_PROVIDERS else 'unknown platform'}")
+        for platform, count in self.deferred.items():
+            print(f"⚠️ Deferred {count} {platform} accounts to save quota (next sweep in {youtube_quota.interval / 60:.0f} min)")
+        if youtube_quota.services:
+            print(f"YouTube quota: {youtube_quota.remaining():,} units left today")
+        for platform, size, error in self.errors:
+            print(f"❌ {platform} batch of {size} failed: {error}")
+        print("Dry run: counts were not saved" if dry_run else f"✅ New counts saved to {social_trackers.path}")
+
+async def check_social_updates(report: Optional[SweepReport] = None, dry_run: bool = False):
+    """
+    One tracker sweep. With a report, per-account timings and deltas are
+    collected into it; with dry_run nothing is posted or saved.
+    """
+    # Group trackers by platform and account so each account is fetched once per sweep
+    started = time.perf_counter()
+    accounts_by_provider = {}
+    for guild_id, trackers in social_trackers.snapshot().items():
+        for tracker in trackers:
+            provider = PLATFORM_PROVIDERS.get(tracker.platform)
+            if not provider or not provider.enabled():
+                if report is not None:
+                    report.skipped[tracker.platform] += 1
+                continue
+            accounts = accounts_by_provider.setdefault(provider, {})
+            accounts.setdefault(tracker.account_id, []).append((guild_id, tracker))
+    for provider, accounts in list(accounts_by_provider.items()):
+        if not provider.due(len(accounts)):
+            del accounts_by_provider[provider]
+            if report is not None:
+                report.deferred[provider.name] = len(accounts)
+    
+    results = await asyncio.gather(*(
+        sweep_provider(provider, accounts, report, dry_run) for provider, accounts in accounts_by_provider.items()
+    ))
+    
+    # Publish every new count as one version, merged into the trackers as they are now
+    grown = {}
+    for (provider, accounts), counts in zip(accounts_by_provider.items(), results):
+        for account_id, count in counts.items():
+            for guild_id, _ in accounts[account_id]:
+                grown.setdefault(guild_id, {})[(provider.name, account_id)] = count
+    if grown and not dry_run:
+        social_trackers.update_many({
+            guild_id: functools.partial(record_counts, counts) for guild_id, counts in grown.items()
+        }, default=list)
+    tracker_log.debug(
+        "Sweep checked %d accounts", sum(len(accounts) for accounts in accounts_by_provider.values()),
+        extra={'latency_ms': round((time.perf_counter() - started) * 1000), 'count': len(grown)}
+    )
+
+def record_counts(counts: dict, trackers: list):
+    """Store new counts, keyed by (platform, account_id), in a guild's tracker list"""
+    for index, tracker in enumerate(trackers):
+        count = counts.get((tracker.platform, tracker.account_id))
+        if count is not None and count > tracker.last_count:
+            trackers[index] = dataclasses.replace(tracker, last_count=count)
+
+async def sweep_provider(provider: SocialProvider, accounts: dict, report: Optional[SweepReport] = None,
+                         dry_run: bool = False) -> dict:
+    """Check every account of one platform in parallel batches; returns {account: count} for accounts that grew"""
+    account_ids = list(accounts)
+    semaphore = asyncio.Semaphore(provider.concurrency)
+    grown = {}
+
+    async def check_batch(batch):
+        async with semaphore:
+            cached = {account_id for account_id in batch if provider.cached_count(account_id) is not None}
+            started = time.perf_counter()
+            try:
+                counts = await provider.get_counts(batch)
+            except HttpError as e:
+                tracker_log.error("YouTube API error", extra={'platform': str(provider.name), 'count': len(batch), 'error': e})
+                if report is not None:
+                    report.errors.append((provider.name, len(batch), e))
+                return
+            except Exception as e:
+                tracker_log.error("Error checking %s trackers", provider.name, extra={'platform': str(provider.name), 'count': len(batch), 'error': e})
+                if report is not None:
+                    report.errors.append((provider.name, len(batch), e))
+                return
+            if report is not None:
+                # Accounts in one batch share a request, so they share its time
+                elapsed = time.perf_counter() - started
+                for account_id in batch:
+                    count = counts.get(account_id)
+                    report.accounts.append((
+                        str(provider.name), account_id, len(accounts[account_id]), elapsed,
+                        account_id in cached, count[0] if count else None
+                    ))
+        for account_id, (current_count, name) in counts.items():
+            for guild_id, tracker in accounts.get(account_id, []):
+                try:
+                    if dry_run:
+                        posted = current_count > tracker.last_count
+                    else:
+                        posted = await notify_tracker_growth(provider, tracker, current_count, name)
+                    if posted:
+                        grown[account_id] = current_count
+                        if report is not None:
+                            report.deltas.append((guild_id, tracker, current_count))
+                except Exception as e:
+                    tracker_log.error("Error notifying %s tracker", provider.name, extra={
+                        'platform': str(provider.name), 'guild': guild_id, 'tracker': account_id, 'error': e
+                    })
+
+    await asyncio.gather(*(
+        check_batch(account_ids[i:i + provider.batch_size])
+        for i in range(0, len(account_ids), provider.batch_size)
+    ))
+    return grown
+
+async def notify_tracker_growth(provider: SocialProvider, tracker: Tracker, current_count: int, name: Optional[str]) -> bool:
+    """Post a growth notification; the caller records the new count"""
+    last_count = tracker.last_count
+    if current_count <= last_count:
+        return False
+    
+    # Send notification
+    channel = bot.get_channel(tracker.post_channel)
+    if channel:
+        embed = provider.growth_embed(tracker, name or tracker.account_name, current_count, current_count - last_count)
+        send_queue.post(channel, embed=embed)
+    return True
+
+# YouTube upload and live notifications (WebSub push with polling fallback)
+WEBSUB_CALLBACK_URL = os.getenv("WEBSUB_CALLBACK_URL")  # Public URL of the receiver, enables push
+WEBSUB_PORT = int(os.getenv("WEBSUB_PORT", os.getenv("PORT", "8080")))
+WEBSUB_HUB_URL = os.getenv("WEBSUB_HUB_URL", "https://pubsubhubbub.appspot.com/subscribe")
+WEBSUB_SECRET = os.getenv("WEBSUB_SECRET")  # Signs pushes; generated once into WEBSUB_SECRET_FILE if unset
+WEBSUB_SECRET_FILE = "websub_secret.txt"
+WEBSUB_LEASE_SECONDS = 432000  # 5 days, the hub's maximum
+YOUTUBE_TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={}"  # WebSub topic
+YOUTUBE_FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"  # Public RSS feed
+MAX_VIDEO_AGE = 6 * 3600  # Don't announce uploads older than this
+
+ATOM_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015'
+}
+
+def load_websub_secret() -> str:
+    """The secret hub subscriptions were made with, kept across restarts so their pushes still verify"""
+    try:
+        with open(WEBSUB_SECRET_FILE) as f:
+            secret = f.read().strip()
+    except FileNotFoundError:
+        secret = ""
+    if not secret:
+        secret = secrets.token_hex(16)
+        with open(os.open(WEBSUB_SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            f.write(secret)
+        websub_log.info("Generated a WebSub secret in %s", WEBSUB_SECRET_FILE)
+    return secret
+
+def parse_youtube_feed(xml_text: str) -> list:
+    """Parse a YouTube Atom feed or WebSub notification into video dicts"""
+    root = ElementTree.fromstring(xml_text)
+    videos = []
+    for entry in root.findall('atom:entry', ATOM_NS):
+        video_id = entry.findtext('yt:videoId', namespaces=ATOM_NS)
+        channel_id = entry.findtext('yt:channelId', namespaces=ATOM_NS)
+        if not video_id or not channel_id:
+            continue
+        link = entry.find('atom:link', ATOM_NS)
+        videos.append({
+            'video_id': video_id,
+            'channel_id': channel_id,
+            'title': entry.findtext('atom:title', default='', namespaces=ATOM_NS),
+            'author': entry.findtext('atom:author/atom:name', default='', namespaces=ATOM_NS),
+            'url': link.get('href') if link is not None else f"https://www.youtube.com/watch?v={video_id}",
+            'published': entry.findtext('atom:published', default='', namespaces=ATOM_NS)
+        })
+    return videos
+
+def youtube_upload_trackers() -> dict:
+    """Map channel_id -> (guild_id, tracker) pairs for YouTube trackers that want upload/live alerts"""
+    channels = {}
+    for guild_id, trackers in social_trackers.snapshot().items():
+        for tracker in trackers:
+            if tracker.platform is Platform.YOUTUBE and tracker.upload_alerts:
+                channels.setdefault(tracker.account_id, []).append((guild_id, tracker))
+    return channels
+
+def _video_age(published: str) -> float:
+    try:
+        return time.time() - datetime.fromisoformat(published).timestamp()
+    except ValueError:
+        return float('inf')
+
+async def fetch_live_status(video_id: str) -> str:
+    """Return 'live', 'upcoming' or 'none' for a video (1 quota unit)"""
+    provider = PLATFORM_PROVIDERS['youtube']
+    if not provider.enabled():
+        return 'none'
+    try:
+        response = await asyncio.to_thread(provider._execute, 'videos', interactive=True, part='snippet', id=video_id)
+        items = response.get('items')
+        return items[0]['snippet'].get('liveBroadcastContent', 'none') if items else 'none'
+    except Exception as e:
+        youtube_log.warning("Error checking live status for %s", video_id, extra={'error': e})
+        return 'none'
+
+async def handle_youtube_video(video: dict, pushed: bool) -> bool:
+    """Announce a new upload or live stream to every tracker of its channel"""
+    trackers = youtube_upload_trackers().get(video['channel_id'], [])
+    if not trackers:
+        return False
+    
+    if not pushed and not any(is_new_video(tracker, video) for _, tracker in trackers):
+        return False
+    
+    # Pushes also arrive when a scheduled stream goes live, so check status on every push
+    status = await fetch_live_status(video['video_id'])
+    recent = _video_age(video['published']) < MAX_VIDEO_AGE
+    changed_guilds = set()
+    
+    for guild_id, tracker in trackers:
+        title = None
+        # A tracker without a baseline is primed silently so old uploads and streams aren't announced
+        primed = tracker.last_video_published is not None or tracker.last_live_id is not None
+        if status == 'live' and tracker.last_live_id != video['video_id']:
+            if primed:
+                title = "🔴 We're Live on YouTube!"
+        elif is_new_video(tracker, video):
+            if primed and recent:
+                title = "📅 Upcoming YouTube Stream!" if status == 'upcoming' else "📺 New YouTube Video!"
+        else:
+            continue
+        changed_guilds.add(guild_id)
+        
+        if title:
+            channel = bot.get_channel(tracker.post_channel)
+            if channel:
+                embed = discord.Embed(
+                    title=title,
+                    description=f"**{video['author'] or tracker.account_name}**\n[{video['title']}]({video['url']})",
+                    color=discord.Color.red(),
+                    url=video['url']
+                )
+                embed.set_image(url=f"https://i.ytimg.com/vi/{video['video_id']}/hqdefault.jpg")
+                embed.set_footer(text="Nexus Esports Social Tracker")
+                send_queue.post(channel, embed=embed)
+    
+    if changed_guilds:
+        record_video = functools.partial(record_youtube_video, video, status == 'live')
+        social_trackers.update_many({guild_id: record_video for guild_id in changed_guilds}, default=list)
+    return bool(changed_guilds)
+
+def is_new_video(tracker: Tracker, video: dict) -> bool:
+    return video['published'] > (tracker.last_video_published or '')
+
+def record_youtube_video(video: dict, live: bool, trackers: list):
+    """Remember a handled video on every tracker of its channel in one guild"""
+    for index, tracker in enumerate(trackers):
+        if tracker.platform is not Platform.YOUTUBE or tracker.account_id != video['channel_id']:
+            continue
+        if live and tracker.last_live_id != video['video_id']:
+            trackers[index] = tracker = dataclasses.replace(tracker, last_live_id=video['video_id'])
+            if tracker.last_video_published is None:
+                # Priming on a live stream sets the upload baseline too
+                trackers[index] = dataclasses.replace(tracker, last_video_published=video['published'])
+        elif is_new_video(tracker, video):
+            trackers[index] = dataclasses.replace(tracker, last_video_published=video['published'])
+
+class YouTubeFeedReceiver:
+    """
+    Embedded WebSub subscriber. Subscribes every tracked channel's upload feed
+    on the hub, answers verification challenges, checks the HMAC signature of
+    pushed notifications and forwards new videos to handle_youtube_video().
+    """
+
+    def __init__(self, callback_url: str = WEBSUB_CALLBACK_URL, hub_url: str = WEBSUB_HUB_URL,
+                 port: int = WEBSUB_PORT, secret: Optional[str] = WEBSUB_SECRET):
+        self.callback_url = callback_url
+        self.hub_url = hub_url
+        self.port = port
+        self.secret = (secret or load_websub_secret()).encode()
+        self.path = urlparse(callback_url).path or "/"
+        self.leases = {}  # channel_id -> lease expiry (epoch seconds), set once the hub verifies
+        self.requested = {}  # channel_id -> ('subscribe' / 'unsubscribe', sent at) awaiting verification
+        self.notifications = 0
+        self._handlers = set()  # Running handle_youtube_video tasks, referenced until done
+        self._runner = None
+        self._session = None
+        self._task = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get(self.path, self.handle_verification)
+        app.router.add_post(self.path, self.handle_notification)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "0.0.0.0", self.port).start()
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+        self._task = asyncio.get_running_loop().create_task(self._maintain())
+        return self
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def is_subscribed(self, channel_id: str) -> bool:
+        return self.leases.get(channel_id, 0) > time.time()
+
+    async def _hub_request(self, channel_id: str, mode: str):
+        self.requested[channel_id] = (mode, time.time())
+        data = {
+            'hub.callback': self.callback_url,
+            'hub.mode': mode,
+            'hub.topic': YOUTUBE_TOPIC_URL.format(channel_id),
+            'hub.verify': 'async',
+            'hub.secret': self.secret.decode(),
+            'hub.lease_seconds': str(WEBSUB_LEASE_SECONDS)
+        }
+        try:
+            async with self._session.post(self.hub_url, data=data) as response:
+                if response.status >= 300:
+                    websub_log.warning("WebSub %s failed for %s: HTTP %d", mode, channel_id, response.status, extra={'tracker': channel_id})
+        except Exception as e:
+            websub_log.warning("WebSub %s failed for %s", mode, channel_id, extra={'tracker': channel_id, 'error': e})
+
+    async def sync_subscriptions(self):
+        """Subscribe new channels, renew leases expiring within a day, drop removed channels"""
+        wanted = set(youtube_upload_trackers())
+        now = time.time()
+        # Forget requests the hub never verified so they are retried
+        for channel_id, (mode, sent_at) in list(self.requested.items()):
+            if now - sent_at > 3600:
+                del self.requested[channel_id]
+        requests_to_send = [
+            self._hub_request(channel_id, 'subscribe')
+            for channel_id in wanted
+            if self.leases.get(channel_id, 0) < now + 86400 and channel_id not in self.requested
+        ]
+        requests_to_send += [
+            self._hub_request(channel_id, 'unsubscribe')
+            for channel_id in list(self.leases)
+            if channel_id not in wanted
+        ]
+        await asyncio.gather(*requests_to_send)
+
+    async def _maintain(self):
+        while True:
+            try:
+                await self.sync_subscriptions()
+            except Exception:
+                websub_log.exception("WebSub maintenance error")
+            await asyncio.sleep(600)
+
+    async def handle_verification(self, request):
+        query = request.query
+        topic = query.get('hub.topic', '')
+        channel_id = parse_qs(urlparse(topic).query).get('channel_id', [''])[0]
+        mode = query.get('hub.mode')
+        # Only confirm intents we actually sent, so nobody else can subscribe us to feeds
+        pending = self.requested.get(channel_id)
+        if not channel_id or mode not in ('subscribe', 'unsubscribe') or not pending or pending[0] != mode:
+            return web.Response(status=404)
+        
+        self.requested.pop(channel_id, None)
+        if mode == 'subscribe':
+            self.leases[channel_id] = time.time() + int(query.get('hub.lease_seconds', WEBSUB_LEASE_SECONDS))
+        else:
+            self.leases.pop(channel_id, None)
+        return web.Response(text=query.get('hub.challenge', ''))
+
+    async def handle_notification(self, request):
+        body = await request.read()
+        signature = request.headers.get('X-Hub-Signature', '')
+        expected = "sha1=" + hmac.new(self.secret, body, hashlib.sha1).hexdigest()
+        if not hmac.compare_digest(signature, expected):
+            # Acknowledge so the hub doesn't retry, but ignore the content
+            return web.Response(status=202)
+        
+        try:
+            videos = parse_youtube_feed(body.decode('utf-8'))
+        except ElementTree.ParseError as e:
+            websub_log.warning("Invalid WebSub payload", extra={'error': e})
+            return web.Response(status=202)
+        
+        self.notifications += 1
+        for video in videos:
+            task = asyncio.get_running_loop().create_task(handle_youtube_video(video, pushed=True))
+            self._handlers.add(task)
+            task.add_done_callback(self._handlers.discard)
+        return web.Response(status=204)
+
+async def check_youtube_uploads():
+    """Polling fallback: read the public upload feed (no API quota) for channels without a push lease"""
+    receiver = getattr(bot, 'youtube_feed', None)
+    provider = PLATFORM_PROVIDERS['youtube']
+    channel_ids = [
+        channel_id for channel_id in youtube_upload_trackers()
+        if not (receiver and receiver.is_subscribed(channel_id))
+    ]
+
+    async def poll(channel_id):
+        try:
+            await provider.limiter.acquire()
+            response = await asyncio.to_thread(provider.session.get, YOUTUBE_FEED_URL.format(channel_id), timeout=10)
+            if response.status_code != 200:
+                return
+            videos = parse_youtube_feed(response.text)
+            if videos:
+                # Feed entries are newest first
+                await handle_youtube_video(videos[0], pushed=False)
+        except Exception as e:
+            youtube_log.warning("Error polling YouTube feed for %s", channel_id, extra={'tracker': channel_id, 'error': e})
+
+    await asyncio.gather(*(poll(channel_id) for channel_id in channel_ids))
+
+# Recent message references for moderator replies
+MESSAGE_REF_CACHE_SIZE = int(os.getenv("MESSAGE_REF_CACHE_SIZE", "5000"))
+
+class MessageRefCache:
+    """
+    LRU of recent guild message IDs -> (channel_id, guild_id), fed from gateway
+    events, so a reply can reference a message without fetching it over REST.
+    Only IDs are kept, so it stays small even with discord.py's message cache off.
+    """
+
+    def __init__(self, size: int = MESSAGE_REF_CACHE_SIZE):
+        self.size = size
+        self._refs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._refs)
+
+    def add(self, message: discord.Message):
+        if self.size <= 0:
+            return
+        self._refs[message.id] = (message.channel.id, message.guild.id if message.guild else None)
+        self._refs.move_to_end(message.id)
+        if len(self._refs) > self.size:
+            self._refs.popitem(last=False)
+
+    def discard(self, message_id: int):
+        self._refs.pop(message_id, None)
+
+    def reference(self, channel, message_id: int) -> Optional[discord.MessageReference]:
+        entry = self._refs.get(message_id)
+        if entry is None or entry[0] != channel.id:
+            self.misses += 1
+            return None
+        self._refs.move_to_end(message_id)
+        self.hits += 1
+        return discord.MessageReference(
+            message_id=message_id, channel_id=entry[0], guild_id=entry[1], fail_if_not_exists=False
+        )
+
+    async def resolve(self, channel, message_id: int) -> discord.MessageReference:
+        """Reference a message in channel from the cache, fetching it only on a miss"""
+        reference = self.reference(channel, message_id)
+        if reference is None:
+            message = await channel.fetch_message(message_id)
+            self.add(message)
+            reference = message.to_reference(fail_if_not_exists=False)
+        return reference
+
+message_refs = MessageRefCache()
+
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    message_refs.discard(payload.message_id)
+
+@bot.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+    for message_id in payload.message_ids:
+        message_refs.discard(message_id)
+
+# Support tickets: DMs are relayed into a thread in the staff channel and staff replies back to the user
+TICKET_BATCH_WINDOW = float(os.getenv("TICKET_BATCH_WINDOW", "1.5"))  # Seconds to collect rapid-fire messages
+
+class TicketRelay:
+    """
+    Routes ticket messages in both directions. Open tickets are looked up by
+    user (the tickets store) or by thread (by_thread), both O(1). Messages that
+    arrive within TICKET_BATCH_WINDOW of each other are relayed as one message,
+    and each user's or thread's relays run one at a time, so a burst never
+    opens two tickets or reorders messages.
+    """
+
+    def __init__(self, window: float = TICKET_BATCH_WINDOW):
+        self.window = window
+        self.by_thread = {}
+        self._buffers = {}
+        self._tasks = {}
+        self._ticket_guilds = (None, ())
+        self.relayed = 0
+        self.batches = 0
+
+    def rebuild_index(self):
+        self.by_thread = {ticket.thread_id: ticket for ticket in tickets.values()}
+
+    def ticket_guild_ids(self) -> tuple:
+        """Guilds with a ticket channel, recomputed only when the config changes"""
+        version, guild_ids = self._ticket_guilds
+        if version != guild_configs.version:
+            guild_ids = tuple(guild_id for guild_id, config in guild_configs.items() if config.ticket_channel)
+            self._ticket_guilds = (guild_configs.version, guild_ids)
+        return guild_ids
+
+    def accepts_dm(self, user: discord.abc.User) -> bool:
+        return str(user.id) in tickets or bool(self.ticket_guild_ids())
+
+    def queue(self, key, message: discord.Message, deliver):
+        self._buffers.setdefault(key, []).append(message)
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.get_running_loop().create_task(self._run(key, deliver))
+
+    async def _run(self, key, deliver):
+        try:
+            while self._buffers.get(key):
+                await asyncio.sleep(self.window)
+                batch = self._buffers.pop(key)
+                try:
+                    await deliver(batch)
+                    self.relayed += len(batch)
+                    self.batches += 1
+                except Exception as e:
+                    tickets_log.error("Ticket relay failed", extra={'count': len(batch), 'error': e})
+        finally:
+            del self._tasks[key]
+
+    async def open_ticket(self, message: discord.Message) -> Optional[Ticket]:
+        """Open a thread in the first ticket guild the user belongs to"""
+        user = message.author
+        for guild_id in self.ticket_guild_ids():
+            guild = bot.get_guild(int(guild_id))
+            config = guild_configs.get(guild_id)
+            channel = guild.get_channel(config.ticket_channel) if guild and config else None
+            if channel is None:
+                continue
+            if guild.get_member(user.id) is None:
+                # Members aren't cached in memory-optimised mode
+                try:
+                    await guild.fetch_member(user.id)
+                except discord.NotFound:
+                    continue
+            starter = await send_queue.send(
+                channel,
+                PRIORITY_INTERACTIVE,
+                embed=create_embed(
+                    title="🎫 New Ticket",
+                    description=f"{user.mention} (`{user.id}`)\nReply in the thread to answer by DM.",
+                    color=discord.Color.blue()
+                )
+            )
+            thread = await starter.create_thread(name=f"ticket-{user.name}"[:100], auto_archive_duration=1440)
+            ticket = Ticket(
+                user_id=user.id,
+                guild_id=guild.id,
+                thread_id=thread.id,
+                dm_channel_id=message.channel.id,
+                opened_at=time.time()
+            )
+            tickets.swap(str(user.id), lambda _: ticket)
+            self.by_thread[thread.id] = ticket
+            await send_queue.send(
+                message.channel,
+                PRIORITY_INTERACTIVE,
+                embed=create_embed(
+                    title="🎫 Ticket Opened",
+                    description=f"Your message was sent to the **{guild.name}** staff. Their replies will appear here.",
+                    color=discord.Color.green()
+                )
+            )
+            return ticket
+        return None
+
+    def close(self, ticket: Ticket):
+        tickets.remove(str(ticket.user_id))
+        self.by_thread.pop(ticket.thread_id, None)
+
+    def forget(self, guild_id: str):
+        """Close every ticket in a guild the bot has left, dropping staff replies not yet relayed"""
+        for ticket in [ticket for ticket in tickets.values() if ticket.guild_id == int(guild_id)]:
+            self.close(ticket)
+            self._buffers.pop(('staff', ticket.thread_id), None)
+
+    def on_user_message(self, message: discord.Message):
+        self.queue(('user', message.author.id), message, self._deliver_to_staff)
+
+    def on_staff_message(self, ticket: Ticket, message: discord.Message):
+        self.queue(('staff', ticket.thread_id), message, functools.partial(self._deliver_to_user, ticket))
+
+    async def _deliver_to_staff(self, batch: list):
+        first = batch[0]
+        ticket = tickets.get(str(first.author.id))
+        if ticket is None:
+            ticket = await self.open_ticket(first)
+            if ticket is None:
+                return await send_queue.send(first.channel, PRIORITY_INTERACTIVE, embed=dm_auto_reply_embed())
+        thread = bot.get_partial_messageable(ticket.thread_id, guild_id=ticket.guild_id, type=discord.ChannelType.public_thread)
+        embeds = []
+        for chunk in ticket_chunks(batch):
+            embed = discord.Embed(description=chunk, color=discord.Color.blue(), timestamp=batch[-1].created_at)
+            embed.set_author(name=str(first.author), icon_url=first.author.display_avatar.url)
+            embeds.append(embed)
+        try:
+            await send_queue.send(thread, PRIORITY_INTERACTIVE, embeds=embeds)
+        except discord.NotFound:
+            # The thread was deleted; start over with a fresh ticket
+            self.close(ticket)
+            self._buffers.setdefault(('user', first.author.id), [])[:0] = batch
+
+    async def _deliver_to_user(self, ticket: Ticket, batch: list):
+        guild = bot.get_guild(ticket.guild_id)
+        dm_channel = bot.get_partial_messageable(ticket.dm_channel_id, type=discord.ChannelType.private)
+        embeds = [
+            create_embed(title=f"💬 Reply from {guild.name if guild else 'Staff'}", description=chunk)
+            for chunk in ticket_chunks(batch)
+        ]
+        await send_queue.send(dm_channel, PRIORITY_MODERATION, embeds=embeds)
+
+def ticket_chunks(batch: list, limit: int = 4000) -> list:
+    """Message text plus attachment links, split into embed-sized pieces (at most 10)"""
+    lines = []
+    for message in batch:
+        if message.content:
+            lines.append(message.content)
+        lines.extend(attachment.url for attachment in message.attachments)
+    chunks = []
+    current = ""
+    for line in lines or ["*(empty message)*"]:
+        while len(line) > limit:
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if current and len(current) + len(line) + 1 > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks[:10]
+
+ticket_relay = TicketRelay()
+ticket_relay.rebuild_index()
+
+# Auto-reply to DMs
+def dm_auto_reply_embed() -> discord.Embed:
+    # Create professional response embed
+    embed = discord.Embed(
+        title="📬 Nexus Esports Support",
+        description=(
+            "Thank you for your message!\n\n"
+            "For official support, please contact:\n"
+            "• **@acroneop** in our Official Server\n"
+            "• Join: https://discord.gg/xPGJCWpMbM\n\n"
+            "We'll assist you as soon as possible!"
+        ),
+        color=discord.Color.blue(),
+        timestamp=datetime.utcnow()
+    )
+    # Set footer with required text
+    embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+    return embed
+
+# Link and invite filter
+LINK_BLOCKLIST_FILE = os.getenv("LINK_BLOCKLIST_FILE", "link_blocklist.txt")  # One domain per line; hosts and adblock formats work too
+LINK_ALLOWLIST_FILE = os.getenv("LINK_ALLOWLIST_FILE", "link_allowlist.txt")  # Exceptions to the blocklist
+INVITE_CACHE_SIZE = 2000  # Invite code -> guild ID lookups kept
+INVITE_CACHE_TTL = 6 * 3600  # Seconds a resolved invite is trusted
+INVITE_NEGATIVE_TTL = 600  # Seconds an invalid code is remembered
+INVITE_BACKOFF = 60  # Seconds to stop looking invites up after a 429 without Retry-After
+
+# One pass finds invites and anything that looks like a domain, with or without a scheme.
+# Userinfo is skipped like urlsplit() does, so user@host and http://decoy.com@host match host.
+LINK_PATTERN = re.compile(
+    r"(?<![\w@.-])(?:https?://)?(?:[^\s/?#@]{0,64}@)?(?:"
+    r"(?:www\.)?(?:discord(?:app)?\.com/invite|discord\.gg)/(?P<invite>[\w-]+)"
+    r"|(?P<host>(?:[^\W_](?:[\w-]{0,61}[^\W_])?\.)+[^\W\d_][\w-]{0,61}[^\W_])"
+    r")",
+    re.IGNORECASE
+)
+
+def read_domain_list(path: str) -> frozenset:
+    domains = set()
+    try:
+        f = open(path, encoding='utf-8', errors='ignore')
+    except FileNotFoundError:
+        return frozenset()
+    with f:
+        for line in f:
+            parts = line.split('#', 1)[0].split()
+            if not parts:
+                continue
+            # Hosts files put an address first; adblock lists write ||domain^
+            domain = parts[-1] if len(parts) > 1 else parts[0]
+            domain = domain.strip('|^').removeprefix('*.').rstrip('.').lower()
+            if domain:
+                domains.add(domain)
+    return frozenset(domains)
+
+def normalize_host(host: str) -> str:
+    host = host.lower()
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')  # Lists use punycode
+        except UnicodeError:
+            pass
+    return host
+
+class LinkFilter:
+    """
+    Removes messages linking to blocklisted domains, or inviting to other
+    servers, in guilds that turn it on. A domain is blocked when it or any
+    parent domain is on the blocklist, unless a more specific name is on the
+    allowlist; each check is one set lookup per label. Lists are re-read in a
+    worker thread when their files change and swapped in as one reference.
+    """
+
+    def __init__(self, blocklist: str, allowlist: str):
+        self.paths = (blocklist, allowlist)
+        self.lists = (frozenset(), frozenset())  # (blocked, allowed)
+        self._stats = None
+        self._invites = OrderedDict()  # Invite code -> (expires at, guild ID or None for invalid codes)
+        self._lookups = {}  # Invite code -> fetch in flight, shared by every message waiting on it
+        self._backoff_until = 0.0
+        self.scanned = 0
+        self.removed = 0
+
+    def _read(self) -> tuple:
+        return tuple(read_domain_list(path) for path in self.paths)
+
+    def _stat(self) -> tuple:
+        stats = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def load(self):
+        self._stats = self._stat()
+        self.lists = self._read()
+
+    async def reload_if_changed(self) -> bool:
+        stats = await asyncio.to_thread(self._stat)
+        if stats == self._stats:
+            return False
+        self._stats = stats
+        self.lists = await asyncio.to_thread(self._read)
+        moderation_log.info("Loaded link lists", extra={'count': len(self.lists[0])})
+        return True
+
+    def blocked_domain(self, host: str) -> Optional[str]:
+        """The blocklist entry host falls under, or None"""
+        blocked, allowed = self.lists
+        name = host
+        while True:
+            if name in allowed:
+                return None
+            if name in blocked:
+                return name
+            dot = name.find('.')
+            if dot < 0:
+                return None
+            name = name[dot + 1:]
+
+    def scan(self, content: str) -> tuple:
+        """Return (first blocked domain or None, invite codes) for a message"""
+        invites = []
+        if self.lists[0] or 'discord' in content.casefold():
+            for match in LINK_PATTERN.finditer(content):
+                if match['invite']:
+                    invites.append(match['invite'])
+                else:
+                    blocked = self.blocked_domain(normalize_host(match['host']))
+                    if blocked:
+                        return blocked, invites
+        return None, invites
+
+    async def invite_guild(self, code: str) -> Optional[int]:
+        """The guild an invite leads to; None for invalid codes, or when it can't be looked up right now"""
+        cached = self._invites.get(code)
+        if cached is not None and cached[0] > time.monotonic():
+            self._invites.move_to_end(code)
+            return cached[1]
+        lookup = self._lookups.get(code)
+        if lookup is None:
+            if time.monotonic() < self._backoff_until:
+                return None
+            lookup = self._lookups[code] = asyncio.get_running_loop().create_task(self._fetch_invite(code))
+            lookup.add_done_callback(lambda _: self._lookups.pop(code, None))
+        return await asyncio.shield(lookup)
+
+    async def _fetch_invite(self, code: str) -> Optional[int]:
+        try:
+            invite = await bot.fetch_invite(code, with_counts=False)
+        except discord.NotFound:
+            self._remember_invite(code, None, INVITE_NEGATIVE_TTL)
+            return None
+        except discord.RateLimited as e:
+            self._back_off(e.retry_after)
+            return None
+        except discord.HTTPException as e:
+            if e.status == 429:
+                headers = getattr(e.response, 'headers', None) or {}
+                self._back_off(float(headers.get('Retry-After', INVITE_BACKOFF)))
+            else:
+                moderation_log.warning("Invite lookup failed", extra={'error': e})
+            return None
+        guild_id = invite.guild.id if invite.guild else None
+        self._remember_invite(code, guild_id, INVITE_CACHE_TTL)
+        return guild_id
+
+    def _remember_invite(self, code: str, guild_id: Optional[int], ttl: float):
+        self._invites[code] = (time.monotonic() + ttl, guild_id)
+        self._invites.move_to_end(code)
+        if len(self._invites) > INVITE_CACHE_SIZE:
+            self._invites.popitem(last=False)
+
+    def _back_off(self, retry_after: float):
+        """Skip invite checks until the rate limit resets rather than queueing lookups behind it"""
+        self._backoff_until = max(self._backoff_until, time.monotonic() + retry_after)
+        moderation_log.warning("Invite lookups rate limited for %.0fs", retry_after)
+
+    async def on_message(self, message: discord.Message) -> bool:
+        """Check a guild message; True when it was removed"""
+        config = guild_configs.get(str(message.guild.id))
+        if config is None or not config.link_filter or '.' not in message.content:
+            return False
+        permissions = getattr(message.author, 'guild_permissions', None)
+        if permissions and permissions.manage_messages:
+            return False
+        
+        self.scanned += 1
+        blocked, invites = self.scan(message.content)
+        reason = f"blocked domain `{blocked}`" if blocked else None
+        if reason is None and config.block_invites:
+            for code in invites:
+                guild_id = await self.invite_guild(code)
+                if guild_id is not None and guild_id != message.guild.id:
+                    reason = f"invite to another server (`discord.gg/{code}`)"
+                    break
+        if reason is None:
+            return False
+        await self.remove(message, config, reason)
+        return True
+
+    async def remove(self, message: discord.Message, config: GuildConfig, reason: str):
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+        except discord.Forbidden:
+            moderation_log.warning("Missing permission to delete a filtered message", extra={
+                'guild': message.guild.id, 'channel': message.channel.id
+            })
+            return
+        self.removed += 1
+        moderation_log.info("Removed message: %s", reason, extra={
+            'guild': message.guild.id, 'channel': message.channel.id, 'user': message.author.id
+        })
+        send_queue.post(
+            message.channel,
+            PRIORITY_MODERATION,
+            merge=False,
+            content=f"🚫 {message.author.mention}, your message was removed: it contained a {reason.split(' (')[0]}.",
+            delete_after=15
+        )
+        if config.link_filter == 'quarantine' and config.quarantine_channel:
+            channel = message.guild.get_channel(config.quarantine_channel)
+            if channel:
+                embed = create_embed(
+                    title="🚫 Message Quarantined",
+                    description=f"```\n{message.content[:1000].replace('```', '` ` `')}\n```",
+                    color=discord.Color.orange()
+                )
+                embed.add_field(name="Author", value=f"{message.author.mention} ({message.author.id})")
+                embed.add_field(name="Channel", value=message.channel.mention)
+                embed.add_field(name="Reason", value=reason, inline=False)
+                send_queue.post(channel, PRIORITY_MODERATION, embed=embed)
+
+link_filter = LinkFilter(LINK_BLOCKLIST_FILE, LINK_ALLOWLIST_FILE)
+link_filter.load()
+
+# Keyword auto-responder
+AUTO_RESPONSE_LIMIT = 500  # Triggers per guild
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a guild's triggers. One pass over a message
+    finds every trigger in it, however many triggers there are.
+    """
+    __slots__ = ('goto', 'fail', 'output', 'lengths')
+
+    def __init__(self, patterns: list):
+        goto = [{}]
+        output = [()]
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                child = goto[node].get(char)
+                if child is None:
+                    child = goto[node][char] = len(goto)
+                    goto.append({})
+                    output.append(())
+                node = child
+            output[node] += (index,)
+
+        # Failure links, breadth first: the longest proper suffix that is also a trie path
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in goto[node].items():
+                pending.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                output[child] += output[fail[child]]
+
+        self.goto = goto
+        self.fail = fail
+        self.output = output
+        self.lengths = [len(pattern) for pattern in patterns]
+
+    def find(self, text: str):
+        """Yield (pattern index, start, end) for every occurrence, in order of where they end"""
+        goto, fail, output, lengths = self.goto, self.fail, self.output, self.lengths
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield index, position + 1 - lengths[index], position + 1
+
+class AutoResponder:
+    """Answers guild messages that contain a configured trigger, at most once per message"""
+
+    def __init__(self):
+        self._matchers = {}  # guild_id -> (store entry the matcher was built from, matcher)
+        self._last_fired = {}  # (guild_id, trigger id, channel_id) -> monotonic time
+        self.rebuilds = 0
+        self.replies = 0
+
+    def matcher(self, guild_id: str, responses: tuple) -> KeywordMatcher:
+        # The store publishes a new tuple only when this guild's triggers change
+        cached = self._matchers.get(guild_id)
+        if cached is None or cached[0] is not responses:
+            cached = self._matchers[guild_id] = (responses, KeywordMatcher([response.trigger for response in responses]))
+            self.rebuilds += 1
+        return cached[1]
+
+    def match(self, guild_id: str, channel_id: int, content: str) -> Optional[AutoResponse]:
+        responses = auto_responses.get(guild_id)
+        if not responses:
+            return None
+        text = content.casefold()
+        now = time.monotonic()
+        for index, start, end in self.matcher(guild_id, responses).find(text):
+            response = responses[index]
+            if response.whole_word and (
+                (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum())
+            ):
+                continue
+            key = (guild_id, response.id, channel_id)
+            last = self._last_fired.get(key)
+            if last is not None and now - last < response.cooldown:
+                continue
+            self._last_fired[key] = now
+            return response
+        return None
+
+    def on_message(self, message: discord.Message):
+        response = self.match(str(message.guild.id), message.channel.id, message.content)
+        if response is None:
+            return
+        self.replies += 1
+        send_queue.post(
+            message.channel,
+            PRIORITY_INTERACTIVE,
+            merge=False,
+            embed=create_embed(description=response.response),
+            reference=message.to_reference(fail_if_not_exists=False),
+            mention_author=False
+        )
+
+    def forget(self, guild_id: str):
+        self._matchers.pop(guild_id, None)
+        for key in [key for key in self._last_fired if key[0] == guild_id]:
+            del self._last_fired[key]
+
+auto_responder = AutoResponder()
+
+# Activity leaderboard
+ACTIVITY_COOLDOWN = 60  # Seconds between messages that earn a point, so spam doesn't climb the board
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "60"))  # Seconds between saves of changed counts
+LEADERBOARD_PAGE_SIZE = 10
+
+class RankedCounter:
+    """
+    Scores kept in descending order under +1 increments.
+
+    order holds user IDs by score and start[score] is where that score's run
+    begins, so an increment swaps the user to the front of their run and moves
+    the boundary: O(1), with no re-sorting. Rank and top-N are an index and a
+    slice.
+    """
+
+    __slots__ = ('scores', 'order', 'position', 'start')
+
+    def __init__(self, scores: dict = None):
+        self.scores = dict(scores or {})
+        self.order = sorted(self.scores, key=self.scores.__getitem__, reverse=True)
+        self.position = {user_id: index for index, user_id in enumerate(self.order)}
+        self.start = {}
+        for index in range(len(self.order) - 1, -1, -1):
+            self.start[self.scores[self.order[index]]] = index
+
+    def __len__(self):
+        return len(self.order)
+
+    def increment(self, user_id: str) -> int:
+        score = self.scores.get(user_id)
+        if score is None:
+            score = self.scores[user_id] = 0
+            self.position[user_id] = len(self.order)
+            self.order.append(user_id)
+            self.start.setdefault(0, self.position[user_id])
+        # Swap to the front of this score's run, then hand that slot to the next score up
+        index = self.position[user_id]
+        front = self.start[score]
+        other = self.order[front]
+        self.order[front], self.order[index] = user_id, other
+        self.position[user_id], self.position[other] = front, index
+        if front + 1 < len(self.order) and self.scores[self.order[front + 1]] == score:
+            self.start[score] = front + 1
+        else:
+            del self.start[score]
+        self.start.setdefault(score + 1, front)
+        self.scores[user_id] = score + 1
+        return score + 1
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank; members on the same score share the best rank"""
+        score = self.scores.get(user_id)
+        return None if score is None else self.start[score] + 1
+
+    def top(self, count: int, offset: int = 0) -> list:
+        return [(user_id, self.scores[user_id]) for user_id in self.order[offset:offset + count]]
+
+class GuildActivity:
+    __slots__ = ('points', 'messages', 'last_point', 'dirty')
+
+    def __init__(self, stored: Optional[ActivityCounts]):
+        stored = stored.counts if stored else {}
+        self.points = RankedCounter({user_id: counts[0] for user_id, counts in stored.items()})
+        self.messages = {user_id: counts[1] for user_id, counts in stored.items()}
+        self.last_point = {}  # user_id -> monotonic time of the last point earned
+        self.dirty = set()
+
+class ActivityTracker:
+    """
+    Per-guild message counts and activity points, counted in memory and
+    written to the activity store in one batch every ACTIVITY_FLUSH_INTERVAL
+    rather than on every message.
+    """
+
+    def __init__(self, store: VersionedStore):
+        self.store = store
+        self.guilds = {}  # guild_id -> GuildActivity, built from the store on first use
+        self.flushes = 0
+        self._task = None
+
+    def guild(self, guild_id: str) -> GuildActivity:
+        activity = self.guilds.get(guild_id)
+        if activity is None:
+            activity = self.guilds[guild_id] = GuildActivity(self.store.get(guild_id))
+        return activity
+
+    def record(self, message: discord.Message):
+        activity = self.guild(str(message.guild.id))
+        user_id = str(message.author.id)
+        activity.messages[user_id] = activity.messages.get(user_id, 0) + 1
+        activity.dirty.add(user_id)
+        now = time.monotonic()
+        last = activity.last_point.get(user_id)
+        if last is None or now - last >= ACTIVITY_COOLDOWN:
+            activity.last_point[user_id] = now
+            activity.points.increment(user_id)
+
+    def flush(self) -> int:
+        """Publish every changed count to the store; returns how many members were written"""
+        written = 0
+        for guild_id, activity in self.guilds.items():
+            if not activity.dirty:
+                continue
+            changed, activity.dirty = activity.dirty, set()
+            written += len(changed)
+            scores, messages = activity.points.scores, activity.messages
+            def merge(stored, changed=changed, scores=scores, messages=messages):
+                counts = dict(stored.counts) if stored else {}
+                for user_id in changed:
+                    counts[user_id] = (scores.get(user_id, 0), messages[user_id])
+                return ActivityCounts(MappingProxyType(counts))
+            self.store.swap(guild_id, merge)
+        if written:
+            self.flushes += 1
+        return written
+
+    def forget(self, guild_id: str):
+        self.guilds.pop(guild_id, None)
+        self.store.remove(guild_id)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(ACTIVITY_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                storage_log.exception("Error flushing activity counts")
+
+activity = ActivityTracker(activity_store)
+
+@bot.event
+async def on_message(message):
+    if message.guild:
+        message_refs.add(message)
+        # Staff messages in a ticket thread go back to the user
+        ticket = ticket_relay.by_thread.get(message.channel.id)
+        if ticket and not message.author.bot:
+            ticket_relay.on_staff_message(ticket, message)
+        elif message.content and not message.author.bot:
+            if await link_filter.on_message(message):
+                return
+            auto_responder.on_message(message)
+        if not message.author.bot:
+            activity.record(message)
+    
+    # Check if it's a DM and not from the bot itself
+    if isinstance(message.channel, discord.DMChannel) and message.author != bot.user:
+        if ticket_relay.accepts_dm(message.author):
+            ticket_relay.on_user_message(message)
+        else:
+            # Try to send the response
+            try:
+                await send_queue.send(message.channel, PRIORITY_INTERACTIVE, embed=dm_auto_reply_embed())
+            except discord.Forbidden:
+                # Can't send message back (user blocked bot or closed DMs)
+                pass
+    
+    # Process commands (important for command functionality)
+    await bot.process_commands(message)
+
+def create_embed(title: str = None, description: str = None, color: discord.Color = discord.Color(0x3e0000)) -> discord.Embed:
+    """Helper function to create consistent embeds"""
+    embed = discord.Embed(
+        title=title,
+        description=description,
+        color=color,
+        timestamp=datetime.utcnow()
+    )
+    # Set footer with required text
+    embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+    return embed
+
+# Interaction response helpers
+handler_timings = {}  # handler name -> recent seconds from interaction creation to first response
+
+def record_first_response(name: str, interaction: discord.Interaction):
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    handler_timings.setdefault(name, deque(maxlen=500)).append(elapsed)
+
+async def send_response(interaction: discord.Interaction, **kwargs):
+    """Reply through the initial response, or as a followup once the interaction was deferred"""
+    if interaction.response.is_done():
+        await interaction.followup.send(**kwargs)
+    else:
+        await interaction.response.send_message(**kwargs)
+
+def deferred(ephemeral: bool = True):
+    """
+    Acknowledge the interaction before running a slow handler, so Discord's
+    3-second deadline is met no matter how long the work takes. The handler
+    replies through send_response(), which turns into followups.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            interaction = next(arg for arg in args if isinstance(arg, discord.Interaction))
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+            record_first_response(func.__qualname__, interaction)
+            return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Outbound message queue
+PRIORITY_MODERATION = 0    # Moderator replies and DMs
+PRIORITY_INTERACTIVE = 1   # Welcomes and DM auto-replies
+PRIORITY_ANNOUNCEMENT = 2  # Announcements, immediate or scheduled
+PRIORITY_BULK = 3          # Tracker notifications
+
+class QueuedCall:
+    """An edit or delete routed through the send queue, so it shares the channel's worker and rate limits"""
+    __slots__ = ('id', 'operation')
+
+    def __init__(self, channel_id: int, operation):
+        self.id = channel_id
+        self.operation = operation
+
+    async def send(self):
+        return await self.operation()
+
+class MessageQueue:
+    """
+    Central scheduler for outgoing messages. Each channel (or DM recipient) has
+    its own priority queue drained by one worker, paced by a per-channel token
+    bucket that mirrors Discord's message route bucket plus a global one, so a
+    burst to one channel never waits behind 429 retries for another. Pending
+    bulk embeds for the same channel are merged into one message of up to 10
+    embeds. A channel's bucket outlives its queue until it has been idle long
+    enough to refill, so emptying the queue doesn't reset it to a full burst.
+    """
+
+    def __init__(self, channel_rate: float = 1.0, channel_burst: int = 5, global_rate: float = 40.0):
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self._global = RateLimiter(global_rate, int(global_rate))
+        self._queues = {}
+        self._workers = {}
+        self._limiters = {}
+        self._swept = time.monotonic()
+        self._seq = itertools.count()
+        self.sent = 0
+        self.merged = 0
+        self.rate_limited = 0
+
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(self, destination, priority: int = PRIORITY_INTERACTIVE, merge: bool = False, **kwargs) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = destination.id
+        future = loop.create_future()
+        # merge=True is only honoured for embed-only messages
+        merge = merge and set(kwargs) == {'embed'}
+        heapq.heappush(self._queues.setdefault(key, []), (priority, next(self._seq), destination, kwargs, merge, future))
+        if key not in self._workers:
+            self._workers[key] = loop.create_task(self._drain(key))
+        return future
+
+    async def send(self, destination, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> discord.Message:
+        """Queue a message and wait until it has been sent; raises what destination.send() raised"""
+        return await self.enqueue(destination, priority, **kwargs)
+
+    async def call(self, channel, priority: int, operation):
+        """Run operation(), e.g. editing or deleting one of the channel's messages, paced like the channel's sends"""
+        return await self.enqueue(QueuedCall(channel.id, operation), priority)
+
+    def post(self, destination, priority: int = PRIORITY_BULK, merge: bool = True, **kwargs):
+        """Queue a message without waiting for it; failures are logged"""
+        future = self.enqueue(destination, priority, merge, **kwargs)
+        future.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future):
+        # Discord errors were already logged by the channel's worker
+        if not future.cancelled() and future.exception() and not isinstance(future.exception(), discord.HTTPException):
+            send_log.warning("Queued message failed", extra={'error': future.exception()})
+
+    def _take_batch(self, queue: list):
+        """Pop the next message, merging following mergeable embeds into it"""
+        _, _, destination, kwargs, merge, future = heapq.heappop(queue)
+        futures = [future]
+        if merge:
+            embeds = [kwargs['embed']]
+            size = len(embeds[0])
+            while queue and queue[0][4] and len(embeds) < 10 and size + len(queue[0][3]['embed']) <= 6000:
+                item = heapq.heappop(queue)
+                embeds.append(item[3]['embed'])
+                size += len(item[3]['embed'])
+                futures.append(item[5])
+            if len(embeds) > 1:
+                kwargs = {'embeds': embeds}
+                self.merged += len(embeds) - 1
+        return destination, kwargs, futures
+
+    async def _drain(self, key):
+        queue = self._queues[key]
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = RateLimiter(self.channel_rate, self.channel_burst)
+        try:
+            while queue:
+                destination, kwargs, futures = self._take_batch(queue)
+                futures = [future for future in futures if not future.cancelled()]
+                if not futures:
+                    continue
+                await limiter.acquire()
+                await self._global.acquire()
+                try:
+                    message = await self._send_with_retry(destination, kwargs)
+                except Exception as e:
+                    # Fail this message only; the rest of the channel's queue still goes out
+                    if isinstance(e, discord.HTTPException):
+                        send_log.warning("Send failed", extra={'channel': key, 'error_class': type(e).__name__, 'error': e})
+                    else:
+                        send_log.exception("Send failed", extra={'channel': key})
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self.sent += 1
+                for future in futures:
+                    if not future.done():
+                        future.set_result(message)
+        finally:
+            del self._workers[key]
+            if not queue:
+                self._queues.pop(key, None)
+            self._expire_limiters()
+
+    def _expire_limiters(self):
+        """Forget buckets idle for longer than a full refill, which a new bucket matches exactly"""
+        now = time.monotonic()
+        refill = self.channel_burst / self.channel_rate
+        if now - self._swept < refill:
+            return
+        self._swept = now
+        for key in [key for key, limiter in self._limiters.items() if key not in self._workers and now - limiter.updated > refill]:
+            del self._limiters[key]
+
+    async def _send_with_retry(self, destination, kwargs: dict) -> discord.Message:
+        for attempt in range(3):
+            try:
+                return await destination.send(**kwargs)
+            except discord.RateLimited as e:
+                # Only raised for waits longer than discord.py is willing to sleep; back off this channel only
+                self.rate_limited += 1
+                if attempt == 2:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+send_queue = MessageQueue()
+
+def has_announcement_permission(interaction: discord.Interaction) -> bool:
+    """Check if user has announcement permissions through role or manage_messages"""
+    if not interaction.guild:
+        return False
+    
+    guild_id = str(interaction.guild.id)
+    
+    # interaction.user is built from the interaction payload, so none of this needs the member cache
     # Check if user has manage_messages permission
     if interaction.user.guild_permissions.manage_messages:
         return True
     
-    # Check if user is server owner
-    if interaction.user.id == interaction.guild.owner_id:
-        return True
+    # Check if user is server owner
+    if interaction.user.id == interaction.guild.owner_id:
+        return True
+    
+    # Check if user has announcement role
+    config = guild_configs.get(guild_id)
+    if config:
+        role_id = config.announcement_role
+        if role_id:
+            return interaction.user.get_role(role_id) is not None
+    
+    return False
+
+@bot.tree.command(name="set-announce-role", description="Set announcement role for this server (Admin only)")
+@app_commands.describe(role="Role to use for announcement permissions")
+async def set_announce_role(interaction: discord.Interaction, role: discord.Role):
+    """Set the announcement role for the current server"""
+    if not interaction.user.guild_permissions.manage_guild:
+        embed = create_embed(
+            title="❌ Permission Denied",
+            description="You need 'Manage Server' permission to set announcement roles.",
+            color=discord.Color(0x3e0000)
+        )
+        return await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    guild_id = str(interaction.guild.id)
+    
+    # Save the role ID
+    guild_configs.swap(
+        guild_id,
+        lambda config: dataclasses.replace(config, announcement_role=role.id),
+        default=GuildConfig()
+    )
+    
+    embed = create_embed(
+        title="✅ Announcement Role Set",
+        description=f"{role.mention} is now the announcement role for this server.",
+        color=discord.Color.green()
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="sync-commands", description="Sync bot commands (Server Owner only)")
+@deferred()
+async def sync_commands(interaction: discord.Interaction):
+    """Sync commands for the current server"""
+    # Check if user is server owner or bot owner
+    app_info = await bot.application_info()
+    is_bot_owner = interaction.user.id == app_info.owner.id
+    is_server_owner = interaction.guild and interaction.user.id == interaction.guild.owner_id
+    
+    if not (is_bot_owner or is_server_owner):
+        embed = create_embed(
+            title="❌ Permission Denied",
+            description="Only server owners or bot owners can sync commands.",
+            color=discord.Color(0x3e0000)
+        )
+        return await send_response(interaction, embed=embed, ephemeral=True)
+    
+    # Generate invite URL with proper scopes for troubleshooting
+    invite_url = discord.utils.oauth_url(
+        bot.user.id,
+        permissions=discord.Permissions(
+            send_messages=True,
+            embed_links=True,
+            view_channel=True,
+            read_message_history=True,
+            mention_everyone=True,
+            manage_messages=True,
+            attach_files=True,
+            add_reactions=True,
+            manage_roles=True
+        ),
+        scopes=("bot", "applications.commands")
+    )
+    
+    try:
+        # Sync for the current guild
+        if interaction.guild:
+            await bot.tree.sync(guild=interaction.guild)
+            message = f"✅ Commands synced for {interaction.guild.name}!"
+        else:
+            await bot.tree.sync()
+            message = "✅ Global commands synced!"
+        
+        embed = create_embed(
+            title="✅ Sync Successful",
+            description=message,
+            color=discord.Color.green()
+        )
+        await send_response(interaction, embed=embed, ephemeral=True)
+    except discord.Forbidden as e:
+        # Provide detailed troubleshooting for permission issues
+        description = (
+            f"❌ **Sync Failed: Bot lacks permissions**\n"
+            f"Error: `{e}`\n\n"
+            "**Troubleshooting Steps:**\n"
+            "1. Re-invite the bot using this link with proper permissions:\n"
+            f"{invite_url}\n"
+            "2. Ensure the bot has **Manage Server** permission\n"
+            "3. Server owner must run this command\n"
+            "4. Check bot has `applications.commands` scope\n"
+            "5. Wait 1 hour after bot invite for permissions to propagate"
+        )
+        embed = create_embed(
+            title="❌ Sync Failed - Permissions Issue",
+            description=description,
+            color=discord.Color(0x3e0000)
+        )
+        await send_response(interaction, embed=embed, ephemeral=True)
+    except Exception as e:
+        # Provide detailed troubleshooting for other issues
+        description = (
+            f"❌ **Sync Failed**\n"
+            f"Error: `{e}`\n\n"
+            "**Troubleshooting Steps:**\n"
+            "1. Ensure the bot has `applications.commands` scope in invite\n"
+            "2. Re-invite the bot using this link:\n"
+            f"{invite_url}\n"
+            "3. Server owner must run this command\n"
+            "4. Try again in 5 minutes (Discord API might be slow)\n"
+            "5. Contact support if issue persists"
+        )
+        embed = create_embed(
+            title="❌ Sync Failed",
+            description=description,
+            color=discord.Color(0x3e0000)
+        )
+        await send_response(interaction, embed=embed, ephemeral=True)
+
+def build_announcement_embed(text: str, guild: Optional[discord.Guild]) -> discord.Embed:
+    """Announcement embed shared by the modals and the scheduler"""
+    # Create embed (removed "Official Announcement" text)
+    formatted_message = f"```\n{text}\n```"
+    embed = discord.Embed(
+        description=formatted_message,
+        color=discord.Color.gold(),
+        timestamp=datetime.utcnow()
+    )
+    # Set footer with required text
+    embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+    
+    if guild and guild.icon:
+        embed.set_thumbnail(url=guild.icon.url)
+    return embed
+
+def announcement_pings(ping_everyone: bool, ping_here: bool) -> str:
+    # Prepare ping string
+    ping_str = ""
+    if ping_everyone:
+        ping_str += "@everyone "
+    if ping_here:
+        ping_str += "@here "
+    return ping_str
+
+def record_announcement(guild_id: int, author_id: int, text: Optional[str], messages: list) -> Announcement:
+    """Remember where an announcement was posted; returns the entry with its ID"""
+    def add(entries):
+        entry = Announcement(
+            id=max((entry.id for entry in entries), default=0) + 1,
+            author=author_id,
+            sent_at=time.time(),
+            text=text,
+            copies=tuple((message.channel.id, message.id) for message in messages)
+        )
+        entries.append(entry)
+        del entries[:-ANNOUNCEMENT_HISTORY]
+        return entry
+    return announcements.update(str(guild_id), add, default=list)
+
+def find_announcement(guild_id: int, announcement_id: Optional[int]) -> Optional[Announcement]:
+    """The guild's announcement with this ID, or its latest one when announcement_id is None"""
+    entries = announcements.get(str(guild_id), ())
+    if announcement_id is None:
+        return entries[-1] if entries else None
+    return next((entry for entry in entries if entry.id == announcement_id), None)
+
+async def apply_to_copies(announcement: Announcement, action) -> dict:
+    """
+    Run action(message) on every copy of an announcement. Copies in different
+    channels go out together; each is paced by its channel's send queue.
+    Returns {copy: 'done', 'gone' or 'failed'}.
+    """
+    async def apply(channel_id: int, message_id: int) -> str:
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            return 'gone'
+        message = channel.get_partial_message(message_id)
+        try:
+            await send_queue.call(channel, PRIORITY_ANNOUNCEMENT, lambda: action(message))
+        except discord.NotFound:
+            return 'gone'
+        except discord.HTTPException as e:
+            send_log.warning("Couldn't update announcement copy", extra={'channel': channel_id, 'error': e})
+            return 'failed'
+        return 'done'
+    
+    outcomes = await asyncio.gather(*(apply(*copy) for copy in announcement.copies))
+    return dict(zip(announcement.copies, outcomes))
+
+def revise_announcement(guild_id: int, announcement_id: int, outcomes: dict, **changes) -> Optional[Announcement]:
+    """Drop copies that no longer exist and apply changes; the entry goes once no copies are left"""
+    def revise(entries):
+        for index, entry in enumerate(entries):
+            if entry.id == announcement_id:
+                copies = tuple(copy for copy in entry.copies if outcomes.get(copy) != 'gone')
+                if not copies:
+                    del entries[index]
+                    return None
+                entries[index] = dataclasses.replace(entry, copies=copies, **changes)
+                return entries[index]
+        return None
+    return announcements.update(str(guild_id), revise, default=list)
+
+def copy_outcome_summary(outcomes: dict, verb: str) -> str:
+    counts = Counter(outcomes.values())
+    summary = f"{verb} **{counts['done']}** of {len(outcomes)} cop{'y' if len(outcomes) == 1 else 'ies'}"
+    if counts['gone']:
+        summary += f"\n{counts['gone']} had already been deleted"
+    if counts['failed']:
+        summary += f"\n⚠️ {counts['failed']} couldn't be updated (missing permissions?)"
+    return summary
+
+# Modal for announcement text
+class AnnouncementModal(Modal, title='Create Announcement'):
+    message = TextInput(
+        label='Announcement Content',
+        style=discord.TextStyle.paragraph,
+        placeholder='Enter your announcement here...',
+        required=True
+    )
+
+    def __init__(self, channel: discord.TextChannel, ping_everyone: bool, ping_here: bool, attachment: Optional[discord.Attachment] = None):
+        super().__init__()
+        self.channel = channel
+        self.ping_everyone = ping_everyone
+        self.ping_here = ping_here
+        self.attachment = attachment
+
+    @deferred()
+    async def on_submit(self, interaction: discord.Interaction):
+        embed = build_announcement_embed(self.message.value, interaction.guild)
+        ping_str = announcement_pings(self.ping_everyone, self.ping_here)
+        
+        try:
+            # Handle attachment if present
+            files = []
+            if self.attachment:
+                file = await self.attachment.to_file()
+                files.append(file)
+            
+            # Send announcement
+            message = await send_queue.send(
+                self.channel,
+                PRIORITY_ANNOUNCEMENT,
+                content=ping_str if ping_str else None, 
+                embed=embed,
+                files=files,
+                allowed_mentions=discord.AllowedMentions(everyone=True) if (self.ping_everyone or self.ping_here) else None
+            )
+            entry = record_announcement(interaction.guild.id, interaction.user.id, self.message.value, [message])
+            
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="✅ Announcement Sent",
+                    description=(
+                        f"Announcement `#{entry.id}` posted in {self.channel.mention}!\n"
+                        f"Fix it with /announce-edit or take it down with /announce-delete"
+                    ),
+                    color=discord.Color.green()
+                ),
+                ephemeral=True
+            )
+        except Exception as e:
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="❌ Announcement Failed",
+                    description=f"Error: {e}",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+
+# Updated announce-simple command
+@bot.tree.command(name="announce-simple", description="Send a simple text announcement")
+@app_commands.describe(
+    channel="Channel to send announcement to",
+    ping_everyone="Ping @everyone with this announcement",
+    ping_here="Ping @here with this announcement"
+)
+async def announce_simple(interaction: discord.Interaction, 
+                         channel: discord.TextChannel,
+                         ping_everyone: bool = False,
+                         ping_here: bool = False):
+    if not has_announcement_permission(interaction):
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+        return
+    
+    await interaction.response.send_modal(
+        AnnouncementModal(channel, ping_everyone, ping_here)
+    )
+
+# Updated announce-attachment command
+@bot.tree.command(name="announce-attachment", description="Send announcement with text and attachment")
+@app_commands.describe(
+    channel="Channel to send announcement to",
+    attachment="File to attach to the announcement",
+    ping_everyone="Ping @everyone with this announcement",
+    ping_here="Ping @here with this announcement"
+)
+async def announce_attachment(interaction: discord.Interaction, 
+                             channel: discord.TextChannel, 
+                             attachment: discord.Attachment,
+                             ping_everyone: bool = False,
+                             ping_here: bool = False):
+    if not has_announcement_permission(interaction):
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+        return
+    
+    await interaction.response.send_modal(
+        AnnouncementModal(channel, ping_everyone, ping_here, attachment)
+    )
+
+@bot.tree.command(name="announce-only-attachment", description="Send announcement with only an attachment")
+@app_commands.describe(
+    channel="Channel to send announcement to",
+    attachment="File to attach to the announcement",
+    ping_everyone="Ping @everyone with this announcement",
+    ping_here="Ping @here with this announcement"
+)
+@deferred()
+async def announce_only_attachment(interaction: discord.Interaction, 
+                                   channel: discord.TextChannel, 
+                                   attachment: discord.Attachment,
+                                   ping_everyone: bool = False,
+                                   ping_here: bool = False):
+    """Send announcement with only an attachment"""
+    if not has_announcement_permission(interaction):
+        embed = create_embed(
+            title="❌ Permission Denied",
+            description="You need the Announcement role or 'Manage Messages' permission!",
+            color=discord.Color(0x3e0000)
+        )
+        return await send_response(interaction, embed=embed, ephemeral=True)
+    
+    try:
+        ping_str = announcement_pings(ping_everyone, ping_here)
+        
+        # Process attachment
+        file = await attachment.to_file()
+        
+        # Send announcement with only attachment
+        message = await send_queue.send(
+            channel,
+            PRIORITY_ANNOUNCEMENT,
+            content=ping_str if ping_str else None, 
+            file=file,
+            allowed_mentions=discord.AllowedMentions(everyone=True) if (ping_everyone or ping_here) else None
+        )
+        entry = record_announcement(interaction.guild.id, interaction.user.id, None, [message])
+        
+        embed = create_embed(
+            title="✅ Announcement Sent",
+            description=f"Attachment-only announcement `#{entry.id}` sent to {channel.mention}!",
+            color=discord.Color.green()
+        )
+        await send_response(interaction, embed=embed, ephemeral=True)
+    except Exception as e:
+        embed = create_embed(
+            title="❌ Announcement Failed",
+            description=f"Error: {e}",
+            color=discord.Color(0x3e0000)
+        )
+        await send_response(interaction, embed=embed, ephemeral=True)
+
+def announcement_not_found(announcement_id: Optional[int]) -> dict:
+    return dict(
+        embed=create_embed(
+            title="❌ Announcement Not Found",
+            description=(
+                f"There is no announcement `#{announcement_id}`" if announcement_id is not None
+                else "No announcements have been sent yet"
+            ) + f" (the last {ANNOUNCEMENT_HISTORY} are remembered)",
+            color=discord.Color.red()
+        ),
+        ephemeral=True
+    )
+
+class AnnouncementEditModal(Modal, title='Edit Announcement'):
+    message = TextInput(
+        label='Announcement Content',
+        style=discord.TextStyle.paragraph,
+        required=True
+    )
+
+    def __init__(self, announcement: Announcement):
+        super().__init__()
+        self.announcement = announcement
+        self.message.default = announcement.text
+
+    @deferred()
+    async def on_submit(self, interaction: discord.Interaction):
+        text = self.message.value
+        embed = build_announcement_embed(text, interaction.guild)
+        outcomes = await apply_to_copies(self.announcement, lambda message: message.edit(embed=embed))
+        revise_announcement(interaction.guild.id, self.announcement.id, outcomes, text=text)
+        await send_response(
+            interaction,
+            embed=create_embed(
+                title=f"✏️ Announcement #{self.announcement.id} Edited",
+                description=copy_outcome_summary(outcomes, "Updated"),
+                color=discord.Color.green() if 'failed' not in outcomes.values() else discord.Color.orange()
+            ),
+            ephemeral=True
+        )
+
+@bot.tree.command(name="announce-edit", description="Change the text of a sent announcement everywhere it was posted")
+@app_commands.describe(announcement_id="Number from the confirmation message (defaults to the latest announcement)")
+async def announce_edit(interaction: discord.Interaction, announcement_id: Optional[int] = None):
+    if not has_announcement_permission(interaction):
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    announcement = find_announcement(interaction.guild.id, announcement_id)
+    if announcement is None:
+        return await interaction.response.send_message(**announcement_not_found(announcement_id))
+    if announcement.text is None:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Nothing to Edit",
+                description=f"Announcement `#{announcement.id}` is attachment-only; delete it with /announce-delete and post it again",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    await interaction.response.send_modal(AnnouncementEditModal(announcement))
+
+@bot.tree.command(name="announce-delete", description="Delete a sent announcement everywhere it was posted")
+@app_commands.describe(announcement_id="Number from the confirmation message (defaults to the latest announcement)")
+@deferred()
+async def announce_delete(interaction: discord.Interaction, announcement_id: Optional[int] = None):
+    if not has_announcement_permission(interaction):
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    announcement = find_announcement(interaction.guild.id, announcement_id)
+    if announcement is None:
+        return await send_response(interaction, **announcement_not_found(announcement_id))
+    
+    outcomes = await apply_to_copies(announcement, lambda message: message.delete())
+    # Deleted copies count as gone; anything that failed stays indexed so the delete can be retried
+    revise_announcement(
+        interaction.guild.id,
+        announcement.id,
+        {copy: 'gone' if outcome != 'failed' else outcome for copy, outcome in outcomes.items()}
+    )
+    await send_response(
+        interaction,
+        embed=create_embed(
+            title=f"🗑️ Announcement #{announcement.id} Deleted",
+            description=copy_outcome_summary(outcomes, "Deleted"),
+            color=discord.Color.green() if 'failed' not in outcomes.values() else discord.Color.orange()
+        ),
+        ephemeral=True
+    )
+
+# Scheduled announcements
+SCHEDULE_RETRY_DELAY = 60  # Seconds before a failed send is tried again
+SCHEDULE_MAX_ATTEMPTS = 5
+
+class AnnouncementScheduler:
+    """
+    Fires scheduled announcements from a min-heap of (send_at, job_id) with a
+    single sleeper task. Adding an earlier job wakes the sleeper; cancelled
+    jobs are dropped lazily when they reach the top of the heap.
+
+    A job stays in the store until its message is sent or fails for good, so
+    a crash or a failed send never loses it; temporary failures are retried
+    every SCHEDULE_RETRY_DELAY seconds, up to SCHEDULE_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, store: VersionedStore):
+        self.store = store
+        self._heap = [(job.get('retry_at', job['send_at']), job_id) for job_id, job in store.items()]
+        heapq.heapify(self._heap)
+        self._firing = {}  # job_id -> sending task
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def add(self, job: dict):
+        self.store.swap(job['id'], lambda _: job)
+        self._push(job['send_at'], job['id'])
+
+    def _push(self, send_at: float, job_id: str):
+        heapq.heappush(self._heap, (send_at, job_id))
+        # Only an earlier job changes how long the sleeper should wait
+        if self._heap[0][1] == job_id:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            # Skip heap entries whose job was cancelled
+            while self._heap and self._heap[0][1] not in self.store:
+                heapq.heappop(self._heap)
+            
+            self._wakeup.clear()
+            if self._heap:
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+            else:
+                await self._wakeup.wait()
+                continue
+            
+            # Fire everything that is due in one pass
+            due = []
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, job_id = heapq.heappop(self._heap)
+                job = self.store.get(job_id)
+                if job and job_id not in self._firing:
+                    due.append(job)
+            for job in due:
+                self._firing[job['id']] = asyncio.get_running_loop().create_task(self._fire(job))
+
+    async def _fire(self, job):
+        try:
+            if await self._send(job):
+                self.store.remove(job['id'])
+                return
+            attempts = job.get('attempts', 0) + 1
+            if attempts >= SCHEDULE_MAX_ATTEMPTS:
+                scheduler_log.error("Giving up on scheduled announcement %s after %d attempts", job['id'], attempts,
+                                    extra={'channel': job['channel_id']})
+                self.store.remove(job['id'])
+                return
+            retry_at = time.time() + SCHEDULE_RETRY_DELAY
+            # Cancelled while sending: leave it cancelled
+            if job['id'] in self.store:
+                self.store.swap(job['id'], lambda current: {**current, 'attempts': attempts, 'retry_at': retry_at})
+                self._push(retry_at, job['id'])
+        finally:
+            self._firing.pop(job['id'], None)
+
+    async def _send(self, job) -> bool:
+        """Post one job; True once it is done with, sent or failed for good, False to retry later"""
+        channel = bot.get_channel(int(job['channel_id']))
+        if not channel:
+            scheduler_log.error("Dropping scheduled announcement %s: channel not found", job['id'], extra={'channel': job['channel_id']})
+            return True
+        try:
+            ping_str = announcement_pings(job.get('ping_everyone', False), job.get('ping_here', False))
+            message = await send_queue.send(
+                channel,
+                PRIORITY_ANNOUNCEMENT,
+                content=ping_str if ping_str else None,
+                embed=build_announcement_embed(job['message'], channel.guild),
+                allowed_mentions=discord.AllowedMentions(everyone=True) if ping_str else None
+            )
+        except (discord.Forbidden, discord.NotFound) as e:
+            scheduler_log.error("Dropping scheduled announcement %s", job['id'], extra={'channel': job['channel_id'], 'error': e})
+            return True
+        except Exception as e:
+            scheduler_log.warning("Scheduled announcement %s failed, will retry", job['id'], extra={'channel': job['channel_id'], 'error': e})
+            return False
+        record_announcement(channel.guild.id, int(job.get('created_by', 0)), job['message'], [message])
+        return True
+
+def parse_schedule_time(value: str) -> Optional[float]:
+    """
+    Parse when an announcement should go out: relative ("90m", "2h30m", "1d"),
+    a Unix or Discord timestamp ("1735689600", "<t:1735689600:F>") or
+    "YYYY-MM-DD HH:MM" in UTC. Returns epoch seconds or None.
+    """
+    value = value.strip()
+    discord_timestamp = re.fullmatch(r"<t:(\d+)(?::\w)?>", value)
+    if discord_timestamp:
+        return float(discord_timestamp.group(1))
+    if value.isdigit():
+        return float(value)
+    relative = re.fullmatch(r"(?:(\d+)d)?\s*(?:(\d+)h)?\s*(?:(\d+)m)?\s*(?:(\d+)s)?", value.lower())
+    if relative and any(relative.groups()):
+        days, hours, minutes, seconds = (int(part or 0) for part in relative.groups())
+        return time.time() + days * 86400 + hours * 3600 + minutes * 60 + seconds
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            pass
+    return None
+
+def schedule_announcement(job: dict):
+    scheduler = getattr(bot, 'announcement_scheduler', None)
+    if scheduler:
+        scheduler.add(job)
+    else:
+        # Picked up when the scheduler starts in on_ready
+        scheduled_announcements.swap(job['id'], lambda _: job)
+
+class ScheduleAnnouncementModal(AnnouncementModal, title='Schedule Announcement'):
+    def __init__(self, channel: discord.TextChannel, ping_everyone: bool, ping_here: bool, send_at: float):
+        super().__init__(channel, ping_everyone, ping_here)
+        self.send_at = send_at
+
+    async def on_submit(self, interaction: discord.Interaction):
+        job = {
+            'id': secrets.token_hex(4),
+            'guild_id': str(interaction.guild.id),
+            'channel_id': str(self.channel.id),
+            'message': self.message.value,
+            'ping_everyone': self.ping_everyone,
+            'ping_here': self.ping_here,
+            'send_at': self.send_at,
+            'created_by': str(interaction.user.id)
+        }
+        schedule_announcement(job)
+        
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="✅ Announcement Scheduled",
+                description=(
+                    f"Announcement `{job['id']}` will be posted in {self.channel.mention} "
+                    f"<t:{int(self.send_at)}:F> (<t:{int(self.send_at)}:R>)."
+                ),
+                color=discord.Color.green()
+            ),
+            ephemeral=True
+        )
+
+@bot.tree.command(name="announce-schedule", description="Schedule an announcement for later")
+@app_commands.describe(
+    channel="Channel to send announcement to",
+    send_at="When to post: e.g. 30m, 2h15m, 1d, 2025-06-01 18:00 (UTC) or a Discord timestamp",
+    ping_everyone="Ping @everyone with this announcement",
+    ping_here="Ping @here with this announcement"
+)
+async def announce_schedule(interaction: discord.Interaction,
+                            channel: discord.TextChannel,
+                            send_at: str,
+                            ping_everyone: bool = False,
+                            ping_here: bool = False):
+    if not has_announcement_permission(interaction):
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    timestamp = parse_schedule_time(send_at)
+    if timestamp is None or timestamp <= time.time():
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Invalid Time",
+                description="Use a future time like `30m`, `2h15m`, `1d`, `2025-06-01 18:00` (UTC) or a Discord timestamp.",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    await interaction.response.send_modal(
+        ScheduleAnnouncementModal(channel, ping_everyone, ping_here, timestamp)
+    )
+
+@bot.tree.command(name="announce-scheduled", description="List scheduled announcements for this server")
+async def announce_scheduled(interaction: discord.Interaction):
+    if not has_announcement_permission(interaction):
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    guild_id = str(interaction.guild.id)
+    jobs = sorted(
+        (job for job in scheduled_announcements.values() if job['guild_id'] == guild_id),
+        key=lambda job: job['send_at']
+    )
+    if not jobs:
+        description = "No announcements scheduled"
+    else:
+        lines = []
+        for job in jobs[:20]:
+            preview = job['message'].replace("\n", " ")
+            if len(preview) > 60:
+                preview = preview[:57] + "..."
+            lines.append(f"`{job['id']}` • <#{job['channel_id']}> • <t:{int(job['send_at'])}:f>\n> {preview}")
+        if len(jobs) > 20:
+            lines.append(f"...and {len(jobs) - 20} more")
+        description = "\n".join(lines)
+    
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="🗓️ Scheduled Announcements",
+            description=description,
+            color=discord.Color.blue()
+        ),
+        ephemeral=True
+    )
+
+@bot.tree.command(name="announce-cancel", description="Cancel a scheduled announcement")
+@app_commands.describe(job_id="ID shown by /announce-scheduled")
+async def announce_cancel(interaction: discord.Interaction, job_id: str):
+    if not has_announcement_permission(interaction):
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need announcement permissions!",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    job = scheduled_announcements.get(job_id.strip())
+    if not job or job['guild_id'] != str(interaction.guild.id):
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Not Found",
+                description="No scheduled announcement with that ID in this server",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    # A running scheduler drops the job's heap entry when it comes up
+    scheduled_announcements.remove(job['id'])
+    
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="✅ Announcement Cancelled",
+            description=f"Scheduled announcement `{job['id']}` will not be posted.",
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
+
+# Modal for DM messages
+class DMModal(Modal, title='Send Direct Message'):
+    message = TextInput(
+        label='Message Content',
+        style=discord.TextStyle.paragraph,
+        placeholder='Type your message here...',
+        required=True
+    )
+
+    def __init__(self, user: discord.User, attachment: Optional[discord.Attachment] = None):
+        super().__init__()
+        self.user = user
+        self.attachment = attachment
+
+    @deferred()
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            # Create formatted message with larger font (using code block)
+            formatted_message = (
+                f"**📩 Message from {interaction.guild.name}:**\n"
+                f"```\n{self.message.value}\n```\n\n"
+                "For any queries or further support, contact @acroneop in our Official Server:\n"
+                "https://discord.gg/xPGJCWpMbM"
+            )
+            
+            if self.attachment:
+                formatted_message += "\n\n📎 *Attachment included*"
+            
+            # Create embed with footer and timestamp
+            embed = discord.Embed(
+                description=formatted_message,
+                color=discord.Color(0x3e0000),
+                timestamp=datetime.utcnow()
+            )
+            # Set footer with required text
+            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+            
+            # Handle attachment
+            files = []
+            if self.attachment:
+                file = await self.attachment.to_file()
+                files.append(file)
+                embed.set_image(url=f"attachment://{file.filename}")
+            
+            # Send DM
+            await send_queue.send(self.user, PRIORITY_MODERATION, embed=embed, files=files)
+            
+            # Confirm to sender
+            confirm_message = f"Message sent to {self.user.mention}"
+            if self.attachment:
+                confirm_message += f" with attachment: {self.attachment.filename}"
+            
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="✅ DM Sent",
+                    description=confirm_message,
+                    color=discord.Color.green()
+                ),
+                ephemeral=True
+            )
+        except discord.Forbidden:
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="❌ Failed to Send DM",
+                    description="This user has DMs disabled or blocked the bot.",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+        except Exception as e:
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="❌ Error",
+                    description=f"An error occurred: {str(e)}",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+
+# Updated dm-user command
+@bot.tree.command(name="dm-user", description="Send a DM to a specific user (Mods only)")
+@app_commands.describe(
+    user="The user to DM",
+    attachment="(Optional) File to attach"
+)
+async def dm_user(interaction: discord.Interaction, 
+                 user: discord.User,
+                 attachment: Optional[discord.Attachment] = None):
+    if not interaction.user.guild_permissions.manage_messages:
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Messages' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+        return
+    
+    await interaction.response.send_modal(DMModal(user, attachment))
+
+# New: DM Reply Command (Context Menu)
+# Modal for the DM Reply to User context menu
+class ReplyModal(Modal, title='DM Reply to User'):
+    reply_message = TextInput(
+        label='Your reply',
+        style=discord.TextStyle.paragraph,
+        placeholder='Type your reply here...',
+        required=True
+    )
+
+    def __init__(self, message: discord.Message):
+        super().__init__()
+        self.message = message
     
-    # Check if user has announcement role
-    if guild_id in guild_configs:
-        role_id = guild_configs[guild_id].get("announcement_role")
-        if role_id:
-            return any(role.id == role_id for role in interaction.user.roles)
+    @deferred()
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            # Create the DM message with context
+            formatted_content = (
+                f"**📩 Reply from {interaction.guild.name} regarding your message:**\n"
+                f"```\n{self.message.content}\n```\n\n"
+                f"**Moderator's reply:**\n"
+                f"```\n{self.reply_message.value}\n```\n\n"
+                "For any queries or further support, contact @acroneop in our Official Server:\n"
+                "https://discord.gg/xPGJCWpMbM"
+            )
+            
+            embed = discord.Embed(
+                description=formatted_content,
+                color=discord.Color(0x3e0000),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+            
+            # Send the DM
+            await send_queue.send(self.message.author, PRIORITY_MODERATION, embed=embed)
+            
+            # Confirm to the moderator
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="✅ Reply Sent",
+                    description=f"Reply sent to {self.message.author.mention} via DM!",
+                    color=discord.Color.green()
+                ),
+                ephemeral=True
+            )
+        except discord.Forbidden:
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="❌ Failed to Send DM",
+                    description="This user has DMs disabled or blocked the bot.",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+        except Exception as e:
+            await send_response(
+                interaction,
+                embed=create_embed(
+                    title="❌ Error",
+                    description=f"An error occurred: {str(e)}",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+
+@bot.tree.context_menu(name="DM Reply to User")
+async def dm_reply_to_user(interaction: discord.Interaction, message: discord.Message):
+    """Reply to a user via DM regarding their message"""
+    # Check permissions
+    if not interaction.user.guild_permissions.manage_messages:
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Messages' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+        return
     
-    return False
+    await interaction.response.send_modal(ReplyModal(message))
 
-@bot.tree.command(name="set-announce-role", description="Set announcement role for this server (Admin only)")
-@app_commands.describe(role="Role to use for announcement permissions")
-async def set_announce_role(interaction: discord.Interaction, role: discord.Role):
-    """Set the announcement role for the current server"""
+# Modal for welcome configuration
+class WelcomeConfigModal(Modal, title='Configure Welcome'):
+    dm_message = TextInput(
+        label='Welcome DM Message',
+        style=discord.TextStyle.paragraph,
+        placeholder='Enter the welcome message for new members...',
+        required=True
+    )
+    dm_attachment_url = TextInput(
+        label='Welcome Image URL (optional)',
+        placeholder='https://example.com/image.png',
+        required=False
+    )
+
+    def __init__(self, channel: discord.TextChannel):
+        super().__init__()
+        self.channel = channel
+
+    async def on_submit(self, interaction: discord.Interaction):
+        guild_id = str(interaction.guild.id)
+        
+        # Save settings
+        settings = {'welcome_channel': self.channel.id, 'welcome_dm': self.dm_message.value}
+        if self.dm_attachment_url.value:
+            settings['dm_attachment_url'] = self.dm_attachment_url.value
+        guild_configs.swap(guild_id, lambda config: dataclasses.replace(config, **settings), default=GuildConfig())
+        
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="✅ Welcome System Configured",
+                description=(
+                    f"Welcome messages will be sent to {self.channel.mention}\n"
+                    f"DM message set to: ```\n{self.dm_message.value}\n```"
+                ),
+                color=discord.Color.green()
+            ),
+            ephemeral=True
+        )
+
+# Updated set-welcome command
+@bot.tree.command(name="set-welcome", description="Configure welcome messages (Admin only)")
+@app_commands.describe(
+    welcome_channel="Channel to send welcome messages"
+)
+async def set_welcome(interaction: discord.Interaction, welcome_channel: discord.TextChannel):
     if not interaction.user.guild_permissions.manage_guild:
-        embed = create_embed(
-            title="❌ Permission Denied",
-            description="You need 'Manage Server' permission to set announcement roles.",
-            color=discord.Color(0x3e0000)
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
         )
-        return await interaction.response.send_message(embed=embed, ephemeral=True)
-    
-    guild_id = str(interaction.guild.id)
+        return
     
-    # Initialize guild config if needed
-    if guild_id not in guild_configs:
-        guild_configs[guild_id] = {}
+    await interaction.response.send_modal(WelcomeConfigModal(welcome_channel))
+
+@bot.tree.command(name="set-ticket-channel", description="Route user DMs into ticket threads in a staff channel (Admin only)")
+@app_commands.describe(channel="Staff channel for ticket threads (leave empty to turn tickets off)")
+async def set_ticket_channel(interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
     
-    # Save the role ID
-    guild_configs[guild_id]["announcement_role"] = role.id
-    save_config()
+    guild_configs.swap(
+        str(interaction.guild.id),
+        lambda config: dataclasses.replace(config, ticket_channel=channel.id if channel else None),
+        default=GuildConfig()
+    )
     
-    embed = create_embed(
-        title="✅ Announcement Role Set",
-        description=f"{role.mention} is now the announcement role for this server.",
-        color=discord.Color.green()
+    if channel is None:
+        description = "Tickets are off. DMs get the standard auto-reply."
+    else:
+        description = f"DMs from members will open ticket threads in {channel.mention}."
+        if not bot.intents.message_content:
+            description += "\n⚠️ Staff replies in threads need the Message Content intent (MESSAGE_CONTENT_INTENT=1)."
+    await interaction.response.send_message(
+        embed=create_embed(title="✅ Ticket Channel Updated", description=description, color=discord.Color.green()),
+        ephemeral=True
     )
-    await interaction.response.send_message(embed=embed, ephemeral=True)
 
-@bot.tree.command(name="sync-commands", description="Sync bot commands (Server Owner only)")
-async def sync_commands(interaction: discord.Interaction):
-    """Sync commands for the current server"""
-    # Check if user is server owner or bot owner
-    app_info = await bot.application_info()
-    is_bot_owner = interaction.user.id == app_info.owner.id
-    is_server_owner = interaction.guild and interaction.user.id == interaction.guild.owner_id
-    
-    if not (is_bot_owner or is_server_owner):
-        embed = create_embed(
-            title="❌ Permission Denied",
-            description="Only server owners or bot owners can sync commands.",
-            color=discord.Color(0x3e0000)
+@bot.tree.command(name="set-link-filter", description="Remove scam links and other servers' invites (Admin only)")
+@app_commands.describe(
+    mode="What to do with messages containing blocked links",
+    quarantine_channel="Where quarantined messages are posted for review",
+    block_invites="Also remove invites to other Discord servers"
+)
+@app_commands.choices(mode=[
+    app_commands.Choice(name="Off", value="off"),
+    app_commands.Choice(name="Delete", value="delete"),
+    app_commands.Choice(name="Delete and quarantine for review", value="quarantine")
+])
+async def set_link_filter(interaction: discord.Interaction, mode: str,
+                          quarantine_channel: Optional[discord.TextChannel] = None,
+                          block_invites: bool = False):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    if mode == "quarantine" and quarantine_channel is None:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Quarantine Channel Needed",
+                description="Pick a channel for quarantined messages",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
         )
-        return await interaction.response.send_message(embed=embed, ephemeral=True)
     
-    # Generate invite URL with proper scopes for troubleshooting
-    invite_url = discord.utils.oauth_url(
-        bot.user.id,
-        permissions=discord.Permissions(
-            send_messages=True,
-            embed_links=True,
-            view_channel=True,
-            read_message_history=True,
-            mention_everyone=True,
-            manage_messages=True,
-            attach_files=True
+    guild_configs.swap(
+        str(interaction.guild.id),
+        lambda config: dataclasses.replace(
+            config,
+            link_filter=None if mode == "off" else mode,
+            quarantine_channel=quarantine_channel.id if quarantine_channel else None,
+            block_invites=block_invites or None
         ),
-        scopes=("bot", "applications.commands")
+        default=GuildConfig()
     )
     
-    try:
-        # Sync for the current guild
-        if interaction.guild:
-            await bot.tree.sync(guild=interaction.guild)
-            message = f"✅ Commands synced for {interaction.guild.name}!"
-        else:
-            await bot.tree.sync()
-            message = "✅ Global commands synced!"
-        
-        embed = create_embed(
-            title="✅ Sync Successful",
-            description=message,
-            color=discord.Color.green()
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    except discord.Forbidden as e:
-        # Provide detailed troubleshooting for permission issues
+    if mode == "off":
+        description = "Link filtering is off."
+    else:
         description = (
-            f"❌ **Sync Failed: Bot lacks permissions**\n"
-            f"Error: `{e}`\n\n"
-            "**Troubleshooting Steps:**\n"
-            "1. Re-invite the bot using this link with proper permissions:\n"
-            f"{invite_url}\n"
-            "2. Ensure the bot has **Manage Server** permission\n"
-            "3. Server owner must run this command\n"
-            "4. Check bot has `applications.commands` scope\n"
-            "5. Wait 1 hour after bot invite for permissions to propagate"
+            f"Messages linking to any of {len(link_filter.lists[0]):,} blocked domains are deleted"
+            f"{f' and posted to {quarantine_channel.mention}' if mode == 'quarantine' else ''}."
         )
-        embed = create_embed(
-            title="❌ Sync Failed - Permissions Issue",
-            description=description,
-            color=discord.Color(0x3e0000)
+        if block_invites:
+            description += "\nInvites to other servers are removed too."
+        description += "\nMembers with 'Manage Messages' are never filtered."
+    await interaction.response.send_message(
+        embed=create_embed(title="✅ Link Filter Updated", description=description, color=discord.Color.green()),
+        ephemeral=True
+    )
+
+@bot.tree.command(name="close-ticket", description="Close the support ticket in this thread (Mods only)")
+@deferred()
+async def close_ticket(interaction: discord.Interaction):
+    if not interaction.user.guild_permissions.manage_messages:
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Messages' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    except Exception as e:
-        # Provide detailed troubleshooting for other issues
-        description = (
-            f"❌ **Sync Failed**\n"
-            f"Error: `{e}`\n\n"
-            "**Troubleshooting Steps:**\n"
-            "1. Ensure the bot has `applications.commands` scope in invite\n"
-            "2. Re-invite the bot using this link:\n"
-            f"{invite_url}\n"
-            "3. Server owner must run this command\n"
-            "4. Try again in 5 minutes (Discord API might be slow)\n"
-            "5. Contact support if issue persists"
+    
+    ticket = ticket_relay.by_thread.get(interaction.channel.id)
+    if ticket is None:
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ Not a Ticket",
+                description="Run this inside an open ticket thread",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
         )
-        embed = create_embed(
-            title="❌ Sync Failed",
-            description=description,
-            color=discord.Color(0x3e0000)
+    
+    ticket_relay.close(ticket)
+    try:
+        dm_channel = bot.get_partial_messageable(ticket.dm_channel_id, type=discord.ChannelType.private)
+        await send_queue.send(
+            dm_channel,
+            PRIORITY_MODERATION,
+            embed=create_embed(
+                title="🎫 Ticket Closed",
+                description=f"Your ticket with **{interaction.guild.name}** was closed. Send another message to open a new one.",
+                color=discord.Color.blue()
+            )
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+    except discord.HTTPException:
+        pass
+    
+    await send_response(
+        interaction,
+        embed=create_embed(title="✅ Ticket Closed", description=f"Closed ticket for <@{ticket.user_id}>", color=discord.Color.green()),
+        ephemeral=True
+    )
+    if isinstance(interaction.channel, discord.Thread):
+        await interaction.channel.edit(archived=True, locked=True)
 
-# Modal for announcement text
-class AnnouncementModal(Modal, title='Create Announcement'):
-    message = TextInput(
-        label='Announcement Content',
-        style=discord.TextStyle.paragraph,
-        placeholder='Enter your announcement here...',
-        required=True
+# Join-rate tracking and raid mode
+RAID_WINDOW = int(os.getenv("RAID_WINDOW", "60"))  # Seconds of joins counted towards the rate
+RAID_JOIN_THRESHOLD = int(os.getenv("RAID_JOIN_THRESHOLD", "10"))  # Joins within the window that start raid mode
+RAID_COOLDOWN = float(os.getenv("RAID_COOLDOWN", "300"))  # Seconds below the threshold before raid mode ends
+RAID_BATCH_INTERVAL = float(os.getenv("RAID_BATCH_INTERVAL", "30"))  # How often batched welcomes go out
+RAID_HISTORY = 10  # Finished raids kept per guild for /join-stats
+
+# Upper bounds in seconds; anything older lands in the last bucket
+ACCOUNT_AGE_LIMITS = (3600, 86400, 7 * 86400, 30 * 86400, 365 * 86400)
+ACCOUNT_AGE_LABELS = ("< 1 hour", "< 1 day", "< 1 week", "< 1 month", "< 1 year", "1 year+")
+
+class JoinRate:
+    """Joins over the last `window` seconds, counted in a ring of one-second buckets"""
+    __slots__ = ('buckets', 'head', 'second', 'total')
+
+    def __init__(self, window: int):
+        self.buckets = [0] * window
+        self.head = 0
+        self.second = int(time.monotonic())
+        self.total = 0
+
+    def _advance(self, now: float):
+        second = int(now)
+        elapsed = second - self.second
+        if elapsed <= 0:
+            return
+        size = len(self.buckets)
+        if elapsed >= size:
+            self.buckets = [0] * size
+            self.total = 0
+        else:
+            # Bounded by the window length, however long the gap between joins
+            for _ in range(elapsed):
+                self.head = (self.head + 1) % size
+                self.total -= self.buckets[self.head]
+                self.buckets[self.head] = 0
+        self.second = second
+
+    def add(self, now: float) -> int:
+        self._advance(now)
+        self.buckets[self.head] += 1
+        self.total += 1
+        return self.total
+
+    def count(self, now: float) -> int:
+        self._advance(now)
+        return self.total
+
+def account_age_bucket(member: discord.abc.User) -> int:
+    age = (datetime.now(timezone.utc) - member.created_at).total_seconds()
+    return bisect.bisect_right(ACCOUNT_AGE_LIMITS, age)
+
+def age_distribution(counts: list) -> str:
+    total = sum(counts)
+    if not total:
+        return "No joins recorded"
+    return "\n".join(
+        f"`{label:<9}` {count:>5} ({count / total:.0%})"
+        for label, count in zip(ACCOUNT_AGE_LABELS, counts)
     )
 
-    def __init__(self, channel: discord.TextChannel, ping_everyone: bool, ping_here: bool, attachment: Optional[discord.Attachment] = None):
-        super().__init__()
-        self.channel = channel
-        self.ping_everyone = ping_everyone
-        self.ping_here = ping_here
-        self.attachment = attachment
+class GuildJoins:
+    __slots__ = ('rate', 'ages', 'total', 'raid', 'raids', 'pending', 'task')
 
-    async def on_submit(self, interaction: discord.Interaction):
-        # Create embed (removed "Official Announcement" text)
-        formatted_message = f"```\n{self.message.value}\n```"
+    def __init__(self):
+        self.rate = JoinRate(RAID_WINDOW)
+        self.ages = [0] * len(ACCOUNT_AGE_LABELS)  # Every join since startup
+        self.total = 0
+        self.raid = None  # Details of the raid in progress
+        self.raids = deque(maxlen=RAID_HISTORY)
+        self.pending = []  # Members waiting for the next batched welcome
+        self.task = None
+
+class JoinMonitor:
+    """
+    Per-guild join rates and account ages. When joins in the last RAID_WINDOW
+    seconds reach the guild's threshold the guild enters raid mode: individual
+    welcomes and DMs stop, joins are welcomed in batches, and moderators are
+    alerted. Raid mode ends after RAID_COOLDOWN seconds below the threshold.
+    """
+
+    def __init__(self):
+        self.guilds = {}
+
+    def stats(self, guild_id: int) -> GuildJoins:
+        joins = self.guilds.get(guild_id)
+        if joins is None:
+            joins = self.guilds[guild_id] = GuildJoins()
+        return joins
+
+    @staticmethod
+    def threshold(config: Optional[GuildConfig]) -> int:
+        return (config.raid_threshold if config else None) or RAID_JOIN_THRESHOLD
+
+    def record(self, member: discord.Member, config: Optional[GuildConfig]) -> bool:
+        """Count a join; True when the guild is in raid mode and the member is welcomed in a batch"""
+        joins = self.stats(member.guild.id)
+        now = time.monotonic()
+        rate = joins.rate.add(now)
+        bucket = account_age_bucket(member)
+        joins.ages[bucket] += 1
+        joins.total += 1
+
+        raid = joins.raid
+        if raid is None and rate >= self.threshold(config):
+            raid = joins.raid = {
+                'started': datetime.now(timezone.utc),
+                'joins': 0,
+                'peak': 0,
+                'ages': [0] * len(ACCOUNT_AGE_LABELS),
+                'last_busy': now
+            }
+            joins.task = asyncio.create_task(self._run_raid(member.guild, joins))
+            welcome_log.warning("Raid mode on: %d joins in %ds", rate, RAID_WINDOW, extra={'guild': member.guild.id, 'count': rate})
+        if raid is None:
+            return False
+
+        raid['joins'] += 1
+        raid['ages'][bucket] += 1
+        raid['peak'] = max(raid['peak'], rate)
+        if rate >= self.threshold(config):
+            raid['last_busy'] = now
+        joins.pending.append(member.id)
+        return True
+
+    async def _run_raid(self, guild: discord.Guild, joins: GuildJoins):
+        await self._alert(guild, joins, ended=False)
+        try:
+            while True:
+                await asyncio.sleep(RAID_BATCH_INTERVAL)
+                await self._flush_welcomes(guild, joins)
+                now = time.monotonic()
+                config = guild_configs.get(str(guild.id))
+                if joins.rate.count(now) >= self.threshold(config):
+                    joins.raid['last_busy'] = now
+                elif now - joins.raid['last_busy'] >= RAID_COOLDOWN:
+                    break
+        finally:
+            raid, joins.raid, joins.task = joins.raid, None, None
+            raid['ended'] = datetime.now(timezone.utc)
+            joins.raids.append(raid)
+        # Members who joined in the last moments of the raid are still welcomed
+        await self._flush_welcomes(guild, joins)
+        await self._alert(guild, joins, ended=True, raid=raid)
+        welcome_log.info("Raid mode off after %d joins", raid['joins'], extra={'guild': guild.id, 'count': raid['joins']})
+
+    async def _flush_welcomes(self, guild: discord.Guild, joins: GuildJoins):
+        pending, joins.pending = joins.pending, []
+        config = guild_configs.get(str(guild.id))
+        if not pending or config is None or not config.welcome_channel:
+            return
+        channel = guild.get_channel(config.welcome_channel)
+        if channel is None:
+            return
+        mentions = " ".join(f"<@{user_id}>" for user_id in pending[:100])
+        if len(pending) > 100:
+            mentions += f" and {len(pending) - 100} more"
         embed = discord.Embed(
-            description=formatted_message,
-            color=discord.Color.gold(),
-            timestamp=datetime.utcnow()
+            title=f"💕 Welcome to Nexus Esports, {len(pending)} new members! 💕",
+            description=(
+                f"{mentions}\n\n"
+                "```\nFirst click on Nexus Esports above\n"
+                "and select 'Show All Channels' so that\n"
+                "all channels become visible to you.\n```"
+            ),
+            color=discord.Color(0x3e0000)
         )
-        # Set footer with required text
-        embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-        
-        if interaction.guild.icon:
-            embed.set_thumbnail(url=interaction.guild.icon.url)
-        
-        # Prepare ping string
-        ping_str = ""
-        if self.ping_everyone:
-            ping_str += "@everyone "
-        if self.ping_here:
-            ping_str += "@here "
-        
         try:
-            # Handle attachment if present
-            files = []
-            if self.attachment:
-                file = await self.attachment.to_file()
-                files.append(file)
-            
-            # Send announcement
-            await self.channel.send(
-                content=ping_str if ping_str else None, 
-                embed=embed,
-                files=files,
-                allowed_mentions=discord.AllowedMentions(everyone=True) if (self.ping_everyone or self.ping_here) else None
+            # Mentions are listed, not pinged, so a raid can't turn into a ping flood
+            await send_queue.send(channel, PRIORITY_INTERACTIVE, embed=embed,
+                                  allowed_mentions=discord.AllowedMentions.none())
+        except Exception as e:
+            welcome_log.error("Error sending batched welcome", extra={'guild': guild.id, 'count': len(pending), 'error': e})
+
+    async def _alert(self, guild: discord.Guild, joins: GuildJoins, ended: bool, raid: Optional[dict] = None):
+        config = guild_configs.get(str(guild.id))
+        channel_id = config and (config.raid_alert_channel or config.ticket_channel)
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if channel is None:
+            return
+        raid = raid or joins.raid
+        if ended:
+            embed = create_embed(
+                title="✅ Raid Mode Ended",
+                description=(
+                    f"**{raid['joins']}** members joined during raid mode (peak {raid['peak']} joins/{RAID_WINDOW}s). "
+                    "Individual welcomes and DMs are back on."
+                ),
+                color=discord.Color.green()
             )
-            
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="✅ Announcement Sent",
-                    description=f"Announcement posted in {self.channel.mention}!",
-                    color=discord.Color.green()
+        else:
+            embed = create_embed(
+                title="🚨 Possible Raid Detected",
+                description=(
+                    f"**{joins.rate.count(time.monotonic())}** joins in the last {RAID_WINDOW}s "
+                    f"(threshold {self.threshold(config)}).\n"
+                    f"Welcome DMs are paused and channel welcomes are batched every {RAID_BATCH_INTERVAL:.0f}s. "
+                    "Use `/join-stats` to review new accounts."
                 ),
-                ephemeral=True
+                color=discord.Color.red()
             )
+        embed.add_field(name="Account Ages", value=age_distribution(raid['ages']), inline=False)
+        try:
+            await send_queue.send(channel, PRIORITY_MODERATION, embed=embed)
         except Exception as e:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Announcement Failed",
-                    description=f"Error: {e}",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
+            welcome_log.error("Error sending raid alert", extra={'guild': guild.id, 'error': e})
+
+join_monitor = JoinMonitor()
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    """Send welcome messages when a member joins"""
+    guild_id = str(member.guild.id)
+    
+    # Check if welcome is configured; this snapshot stays consistent for the whole handler
+    config = guild_configs.get(guild_id)
+    if join_monitor.record(member, config):
+        return  # Raid mode: welcomed in the next batch, and no DM
+    if config is None:
+        return
+    
+    welcome_channel_id = config.welcome_channel
+    
+    # Send channel welcome
+    if welcome_channel_id:
+        try:
+            channel = member.guild.get_channel(welcome_channel_id)
+            if channel:
+                # Create embed with proper formatting
+                welcome_text = (
+                    "First click on Nexus Esports above\n"
+                    "and select 'Show All Channels' so that\n"
+                    "all channels become visible to you.\n\n"
+                    "💕 Welcome to Nexus Esports 💕"
+                )
+                
+                embed = discord.Embed(
+                    description=(
+                        f"Bro {member.mention},\n\n"  # Mention outside the code block
+                        f"```\n{welcome_text}\n```"   # Instructions inside code block
+                    ),
+                    color=discord.Color(0x3e0000)
+                )
+                # Set GIF
+                embed.set_image(url="https://cdn.discordapp.com/attachments/1378018158010695722/1378426905585520901/standard_2.gif")
+                
+                await send_queue.send(channel, PRIORITY_INTERACTIVE, embed=embed)
+        except Exception as e:
+            welcome_log.error("Error sending channel welcome", extra={'guild': member.guild.id, 'user': member.id, 'error': e})
+    
+    # Send DM welcome
+    try:
+        welcome_dm = config.welcome_dm
+        dm_attachment_url = config.dm_attachment_url
+        
+        if welcome_dm:
+            # Use configured DM
+            embed = discord.Embed(
+                description=welcome_dm,
+                color=discord.Color(0x3e0000),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+            
+            # Add attachment if provided
+            if dm_attachment_url:
+                embed.set_image(url=dm_attachment_url)
+            
+            if member.guild.icon:
+                embed.set_thumbnail(url=member.guild.icon.url)
+            
+            await send_queue.send(member, PRIORITY_INTERACTIVE, embed=embed)
+        else:
+            # Fallback to fixed DM
+            dm_message = (
+                "🌟 Welcome to Nexus Esports! 🌟\n\n"
+                "Thank you for joining our gaming community! We're excited to have you on board.\n\n"
+                "As mentioned in our welcome channel:\n"
+                "1. Click \"Nexus Esports\" at the top of the server\n"
+                "2. Select \"Show All Channels\" to access everything\n"
+                "3. Explore our community spaces!\n\n"
+                "Quick Start:\n"
+                "• Read #rules for guidelines\n"
+                "• Introduce yourself in #introductions\n"
+                "• Check #announcements for news\n"
+                "• Join tournaments in #events\n\n"
+                "Need help? Contact @acroneop or our mod team anytime!\n\n"
+                "We're glad you're here! 🎮"
+            )
+            
+            embed = discord.Embed(
+                description=dm_message,
+                color=discord.Color(0x3e0000),
+                timestamp=datetime.utcnow()
             )
+            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
+            
+            if member.guild.icon:
+                embed.set_thumbnail(url=member.guild.icon.url)
+            
+            await send_queue.send(member, PRIORITY_INTERACTIVE, embed=embed)
+    except discord.Forbidden:
+        pass  # User has DMs disabled
+    except Exception as e:
+        welcome_log.error("Error sending welcome DM", extra={'guild': member.guild.id, 'user': member.id, 'error': e})
 
-# Updated announce-simple command
-@bot.tree.command(name="announce-simple", description="Send a simple text announcement")
+@bot.tree.command(name="set-raid-protection", description="Configure join-rate raid detection (Admin only)")
 @app_commands.describe(
-    channel="Channel to send announcement to",
-    ping_everyone="Ping @everyone with this announcement",
-    ping_here="Ping @here with this announcement"
+    alert_channel="Channel for raid alerts (defaults to the ticket channel)",
+    threshold=f"Joins within {RAID_WINDOW} seconds that start raid mode (default {RAID_JOIN_THRESHOLD})"
 )
-async def announce_simple(interaction: discord.Interaction, 
-                         channel: discord.TextChannel,
-                         ping_everyone: bool = False,
-                         ping_here: bool = False):
-    if not has_announcement_permission(interaction):
-        await interaction.response.send_message(
+async def set_raid_protection(interaction: discord.Interaction,
+                              alert_channel: Optional[discord.TextChannel] = None,
+                              threshold: Optional[app_commands.Range[int, 2, 1000]] = None):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    config = guild_configs.swap(
+        str(interaction.guild.id),
+        lambda config: dataclasses.replace(
+            config,
+            raid_alert_channel=alert_channel.id if alert_channel else None,
+            raid_threshold=threshold
+        ),
+        default=GuildConfig()
+    )
+    alerts = config.raid_alert_channel or config.ticket_channel
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="✅ Raid Protection Updated",
+            description=(
+                f"Raid mode starts at **{JoinMonitor.threshold(config)}** joins within {RAID_WINDOW} seconds.\n"
+                f"Alerts go to {f'<#{alerts}>' if alerts else 'no channel (set one to get alerts)'}."
+            ),
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
+
+@bot.tree.command(name="join-stats", description="Join rate, raid history and account ages of new members (Mods only)")
+async def join_stats(interaction: discord.Interaction):
+    if not interaction.user.guild_permissions.manage_messages:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Messages' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    
+    joins = join_monitor.stats(interaction.guild.id)
+    config = guild_configs.get(str(interaction.guild.id))
+    status = "🚨 Raid mode" if joins.raid else "✅ Normal"
+    embed = create_embed(
+        title="📊 Join Stats",
+        description=(
+            f"**Status:** {status}\n"
+            f"**Join rate:** {joins.rate.count(time.monotonic())} in the last {RAID_WINDOW}s "
+            f"(raid threshold {JoinMonitor.threshold(config)})\n"
+            f"**Joins since restart:** {joins.total}"
+        ),
+        color=discord.Color.red() if joins.raid else discord.Color.blue()
+    )
+    embed.add_field(name="Account Ages (since restart)", value=age_distribution(joins.ages), inline=False)
+    if joins.raid:
+        embed.add_field(name="Account Ages (current raid)", value=age_distribution(joins.raid['ages']), inline=False)
+    if joins.raids:
+        history = "\n".join(
+            f"<t:{int(raid['started'].timestamp())}:f> • {raid['joins']} joins • peak {raid['peak']}/{RAID_WINDOW}s"
+            for raid in reversed(joins.raids)
+        )
+        embed.add_field(name="Recent Raids", value=history, inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="ping", description="Test bot responsiveness")
+async def ping(interaction: discord.Interaction):
+    """Simple ping command with latency check"""
+    latency = round(bot.latency * 1000)
+    embed = create_embed(
+        title="🏓 Pong!",
+        description=f"Bot latency: {latency}ms",
+        color=discord.Color.green()
+    )
+    await interaction.response.send_message(embed=embed)
+
+def latency_summary(samples) -> str:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"p50 {p50:.0f}ms • p99 {p99:.0f}ms • n={len(ordered)}"
+
+@bot.tree.command(name="bot-stats", description="Show bot performance metrics (Admin only)")
+async def bot_stats(interaction: discord.Interaction):
+    """Response times and event loop health"""
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
             embed=create_embed(
                 title="❌ Permission Denied",
-                description="You need announcement permissions!",
+                description="You need 'Manage Server' permission",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
-        return
     
-    await interaction.response.send_modal(
-        AnnouncementModal(channel, ping_everyone, ping_here)
+    embed = create_embed(title="📈 Bot Stats", color=discord.Color.blue())
+    embed.add_field(name="Gateway Latency", value=f"{round(bot.latency * 1000)}ms", inline=False)
+    
+    watchdog = getattr(bot, 'loop_watchdog', None)
+    if watchdog:
+        lag = watchdog.stats()
+        embed.add_field(
+            name="Event Loop Lag",
+            value=f"p50 {lag['p50_ms']:.1f}ms • p99 {lag['p99_ms']:.1f}ms • max {lag['max_ms']:.0f}ms • stalls {lag['stalls']}",
+            inline=False
+        )
+    
+    timings = "\n".join(
+        f"`{name}`: {latency_summary(samples)}"
+        for name, samples in sorted(handler_timings.items()) if samples
+    )
+    embed.add_field(name="Time to First Response", value=timings or "No data yet", inline=False)
+    embed.add_field(
+        name="Send Queue",
+        value=(
+            f"{send_queue.pending()} pending • {send_queue.sent} sent • "
+            f"{send_queue.merged} merged • {send_queue.rate_limited} rate limited"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="Tickets",
+        value=f"{len(tickets)} open • {ticket_relay.relayed} messages relayed in {ticket_relay.batches} batches",
+        inline=False
+    )
+    if youtube_quota.services:
+        embed.add_field(name="YouTube Quota", value=youtube_quota.summary(), inline=False)
+    embed.add_field(
+        name="Auto-Responses",
+        value=f"{auto_responder.replies} replies • {auto_responder.rebuilds} matcher rebuilds",
+        inline=False
+    )
+    embed.add_field(
+        name="Activity",
+        value=(
+            f"{sum(len(counts.points) for counts in activity.guilds.values()):,} members counted in "
+            f"{len(activity.guilds)} servers • {activity.flushes} batched saves"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="Role Menus",
+        value=(
+            f"{len(role_menu_index)} bindings • {role_edits.requested} changes requested • "
+            f"{role_edits.edits} member edits"
+        ),
+        inline=False
     )
+    embed.add_field(
+        name="Link Filter",
+        value=(
+            f"{len(link_filter.lists[0]):,} blocked domains • {len(link_filter.lists[1]):,} allowed • "
+            f"{link_filter.scanned} messages scanned • {link_filter.removed} removed"
+        ),
+        inline=False
+    )
+    raiding = sum(1 for joins in join_monitor.guilds.values() if joins.raid)
+    embed.add_field(
+        name="Join Monitor",
+        value=f"{len(join_monitor.guilds)} guilds tracked • {raiding} in raid mode",
+        inline=False
+    )
+    embed.add_field(
+        name="Reply Reference Cache",
+        value=f"{len(message_refs)} messages • {message_refs.hits} hits • {message_refs.misses} misses",
+        inline=False
+    )
+    embed.add_field(
+        name="Account Resolution Cache",
+        value=(
+            f"{len(resolved_accounts)} entries • "
+            f"{sum(provider.resolve_hits for provider in PLATFORM_PROVIDERS.values())} setups served from cache"
+        ),
+        inline=False
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
-# Updated announce-attachment command
-@bot.tree.command(name="announce-attachment", description="Send announcement with text and attachment")
+@bot.tree.command(name="my-permissions", description="Check your announcement permissions")
+async def check_perms(interaction: discord.Interaction):
+    """Command for users to check why they can't use announcement commands"""
+    has_perm = has_announcement_permission(interaction)
+    perm_status = "✅ You HAVE announcement permissions!" if has_perm else "❌ You DON'T HAVE announcement permissions"
+    
+    # Get user's roles
+    roles = ", ".join([role.name for role in interaction.user.roles]) or "No roles"
+    
+    # Get current guild's announcement role
+    guild_id = str(interaction.guild.id)
+    announce_role_id = guild_configs.get(guild_id, GuildConfig()).announcement_role if interaction.guild else None
+    
+    description = (
+        f"{perm_status}\n\n"
+        f"**Your roles:** {roles}\n"
+        f"**Announcement role ID:** {announce_role_id or 'Not set'}\n"
+        f"**Manage Messages permission:** {interaction.user.guild_permissions.manage_messages}\n"
+        f"**Server Owner:** {interaction.user.id == interaction.guild.owner_id}\n\n"
+        f"Contact server admins if you should have access."
+    )
+    
+    embed = create_embed(
+        title="🔑 Your Permissions",
+        description=description,
+        color=discord.Color.blue()
+    )
+    
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="add-link", description="Add a professional formatted link")
 @app_commands.describe(
-    channel="Channel to send announcement to",
-    attachment="File to attach to the announcement",
-    ping_everyone="Ping @everyone with this announcement",
-    ping_here="Ping @here with this announcement"
+    url="The URL to add (must start with http:// or https://)",
+    title="(Optional) Title for the link",
+    description="(Optional) Description text"
 )
-async def announce_attachment(interaction: discord.Interaction, 
-                             channel: discord.TextChannel, 
-                             attachment: discord.Attachment,
-                             ping_everyone: bool = False,
-                             ping_here: bool = False):
-    if not has_announcement_permission(interaction):
-        await interaction.response.send_message(
+async def add_link(interaction: discord.Interaction, 
+                  url: str, 
+                  title: Optional[str] = None,
+                  description: Optional[str] = None):
+    """Add a professional formatted link with Nexus Esports styling"""
+    # Validate URL format
+    if not url.startswith(("http://", "https://")):
+        return await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Permission Denied",
-                description="You need announcement permissions!",
+                title="❌ Invalid URL",
+                description="URL must start with http:// or https://",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
-        return
-    
-    await interaction.response.send_modal(
-        AnnouncementModal(channel, ping_everyone, ping_here, attachment)
-    )
-
-@bot.tree.command(name="announce-only-attachment", description="Send announcement with only an attachment")
-@app_commands.describe(
-    channel="Channel to send announcement to",
-    attachment="File to attach to the announcement",
-    ping_everyone="Ping @everyone with this announcement",
-    ping_here="Ping @here with this announcement"
-)
-async def announce_only_attachment(interaction: discord.Interaction, 
-                                   channel: discord.TextChannel, 
-                                   attachment: discord.Attachment,
-                                   ping_everyone: bool = False,
-                                   ping_here: bool = False):
-    """Send announcement with only an attachment"""
-    if not has_announcement_permission(interaction):
-        embed = create_embed(
-            title="❌ Permission Denied",
-            description="You need the Announcement role or 'Manage Messages' permission!",
-            color=discord.Color(0x3e0000)
-        )
-        return await interaction.response.send_message(embed=embed, ephemeral=True)
     
     try:
-        # Prepare ping string
-        ping_str = ""
-        if ping_everyone:
-            ping_str += "@everyone "
-        if ping_here:
-            ping_str += "@here "
-        
-        # Process attachment
-        file = await attachment.to_file()
+        # Create the core link text
+        link_text = f"[Click Here]({url})"
         
-        # Send announcement with only attachment
-        await channel.send(
-            content=ping_str if ping_str else None, 
-            file=file,
-            allowed_mentions=discord.AllowedMentions(everyone=True) if (ping_everyone or ping_here) else None
-        )
+        # Build the embed description
+        embed_description = f"**➤ {link_text}**"
+        if description:
+            embed_description += f"\n\n{description}"
         
+        # Create the embed
         embed = create_embed(
-            title="✅ Announcement Sent",
-            description=f"Attachment-only announcement sent to {channel.mention}!",
-            color=discord.Color.green()
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    except Exception as e:
-        embed = create_embed(
-            title="❌ Announcement Failed",
-            description=f"Error: {e}",
+            title=title if title else "🔗 Nexus Esports Link",
+            description=embed_description,
             color=discord.Color(0x3e0000)
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-# Modal for DM messages
-class DMModal(Modal, title='Send Direct Message'):
-    message = TextInput(
-        label='Message Content',
-        style=discord.TextStyle.paragraph,
-        placeholder='Type your message here...',
-        required=True
-    )
-
-    def __init__(self, user: discord.User, attachment: Optional[discord.Attachment] = None):
-        super().__init__()
-        self.user = user
-        self.attachment = attachment
-
-    async def on_submit(self, interaction: discord.Interaction):
-        try:
-            # Create formatted message with larger font (using code block)
-            formatted_message = (
-                f"**📩 Message from {interaction.guild.name}:**\n"
-                f"```\n{self.message.value}\n```\n\n"
-                "For any queries or further support, contact @acroneop in our Official Server:\n"
-                "https://discord.gg/xPGJCWpMbM"
-            )
-            
-            if self.attachment:
-                formatted_message += "\n\n📎 *Attachment included*"
-            
-            # Create embed with footer and timestamp
-            embed = discord.Embed(
-                description=formatted_message,
-                color=discord.Color(0x3e0000),
-                timestamp=datetime.utcnow()
-            )
-            # Set footer with required text
-            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-            
-            # Handle attachment
-            files = []
-            if self.attachment:
-                file = await self.attachment.to_file()
-                files.append(file)
-                embed.set_image(url=f"attachment://{file.filename}")
-            
-            # Send DM
-            await self.user.send(embed=embed, files=files)
-            
-            # Confirm to sender
-            confirm_message = f"Message sent to {self.user.mention}"
-            if self.attachment:
-                confirm_message += f" with attachment: {self.attachment.filename}"
-            
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="✅ DM Sent",
-                    description=confirm_message,
-                    color=discord.Color.green()
-                ),
-                ephemeral=True
-            )
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Failed to Send DM",
-                    description="This user has DMs disabled or blocked the bot.",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
-        except Exception as e:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Error",
-                    description=f"An error occurred: {str(e)}",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
-
-# Updated dm-user command
-@bot.tree.command(name="dm-user", description="Send a DM to a specific user (Mods only)")
-@app_commands.describe(
-    user="The user to DM",
-    attachment="(Optional) File to attach"
-)
-async def dm_user(interaction: discord.Interaction, 
-                 user: discord.User,
-                 attachment: Optional[discord.Attachment] = None):
-    if not interaction.user.guild_permissions.manage_messages:
+        # Make the title clickable
+        embed.url = url
+        
+        # Send the formatted link
+        await interaction.response.send_message(embed=embed)
+        
+    except Exception as e:
         await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Permission Denied",
-                description="You need 'Manage Messages' permission",
+                title="❌ Error Creating Link",
+                description=f"An error occurred: {str(e)}",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
-        return
-    
-    await interaction.response.send_modal(DMModal(user, attachment))
 
-# New: DM Reply Command (Context Menu)
-@bot.tree.context_menu(name="DM Reply to User")
-async def dm_reply_to_user(interaction: discord.Interaction, message: discord.Message):
-    """Reply to a user via DM regarding their message"""
+# New: Reply in Channel Command
+@bot.tree.command(name="reply-in-channel", description="Reply to a user in this channel (Mods only)")
+@app_commands.describe(
+    user="The user you're replying to",
+    message="Your reply message content",
+    message_id="(Optional) ID of the specific message to reply to"
+)
+@deferred()
+async def reply_in_channel(interaction: discord.Interaction, 
+                         user: discord.Member,
+                         message: str,
+                         message_id: Optional[str] = None):
+    """Reply to a user in the current channel with professional formatting"""
     # Check permissions
     if not interaction.user.guild_permissions.manage_messages:
-        await interaction.response.send_message(
+        return await send_response(
+            interaction,
             embed=create_embed(
                 title="❌ Permission Denied",
-                description="You need 'Manage Messages' permission",
+                description="You need 'Manage Messages' permission to use this command",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
-        return
     
-    # Create modal for the reply
-    class ReplyModal(Modal, title='DM Reply to User'):
-        reply_message = TextInput(
-            label='Your reply',
-            style=discord.TextStyle.paragraph,
-            placeholder='Type your reply here...',
-            required=True
+    try:
+        # Create the arrow symbol and formatted message
+        arrow = "↳"
+        formatted_content = (
+            f"{arrow} **Replying to {user.mention}**\n\n"
+            f"```\n{message}\n```"
         )
         
-        async def on_submit(self, interaction: discord.Interaction):
-            try:
-                # Create the DM message with context
-                formatted_content = (
-                    f"**📩 Reply from {interaction.guild.name} regarding your message:**\n"
-                    f"```\n{message.content}\n```\n\n"
-                    f"**Moderator's reply:**\n"
-                    f"```\n{self.reply_message.value}\n```\n\n"
-                    "For any queries or further support, contact @acroneop in our Official Server:\n"
-                    "https://discord.gg/xPGJCWpMbM"
-                )
-                
-                embed = discord.Embed(
-                    description=formatted_content,
-                    color=discord.Color(0x3e0000),
-                    timestamp=datetime.utcnow()
-                )
-                embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-                
-                # Send the DM
-                await message.author.send(embed=embed)
-                
-                # Confirm to the moderator
-                await interaction.response.send_message(
-                    embed=create_embed(
-                        title="✅ Reply Sent",
-                        description=f"Reply sent to {message.author.mention} via DM!",
-                        color=discord.Color.green()
-                    ),
-                    ephemeral=True
-                )
-            except discord.Forbidden:
-                await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Failed to Send DM",
-                        description="This user has DMs disabled or blocked the bot.",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            except Exception as e:
-                await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Error",
-                        description=f"An error occurred: {str(e)}",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-    
-    await interaction.response.send_modal(ReplyModal())
-
-# Modal for welcome configuration
-class WelcomeConfigModal(Modal, title='Configure Welcome'):
-    dm_message = TextInput(
-        label='Welcome DM Message',
-        style=discord.TextStyle.paragraph,
-        placeholder='Enter the welcome message for new members...',
-        required=True
-    )
-    dm_attachment_url = TextInput(
-        label='Welcome Image URL (optional)',
-        placeholder='https://example.com/image.png',
-        required=False
-    )
-
-    def __init__(self, channel: discord.TextChannel):
-        super().__init__()
-        self.channel = channel
-
-    async def on_submit(self, interaction: discord.Interaction):
-        guild_id = str(interaction.guild.id)
+        # Create embed
+        embed = discord.Embed(
+            description=formatted_content,
+            color=discord.Color(0x3e0000),
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
         
-        # Initialize guild config if needed
-        if guild_id not in guild_configs:
-            guild_configs[guild_id] = {}
+        # Handle message reference if provided
+        reference = None
+        if message_id:
+            try:
+                # Recent messages resolve from the gateway-fed cache; older ones are fetched to verify them
+                reference = await message_refs.resolve(interaction.channel, int(message_id))
+            except (ValueError, discord.NotFound, discord.HTTPException):
+                # Send without reference if message not found
+                pass
         
-        # Save settings
-        guild_configs[guild_id]["welcome_channel"] = self.channel.id
-        guild_configs[guild_id]["welcome_dm"] = self.dm_message.value
-        if self.dm_attachment_url.value:
-            guild_configs[guild_id]["dm_attachment_url"] = self.dm_attachment_url.value
-        save_config()
+        # Send the reply
+        await send_queue.send(
+            interaction.channel,
+            PRIORITY_MODERATION,
+            embed=embed,
+            reference=reference
+        )
         
-        await interaction.response.send_message(
+        # Confirm to moderator
+        await send_response(
+            interaction,
             embed=create_embed(
-                title="✅ Welcome System Configured",
-                description=(
-                    f"Welcome messages will be sent to {self.channel.mention}\n"
-                    f"DM message set to: ```\n{self.dm_message.value}\n```"
-                ),
+                title="✅ Reply Sent",
+                description=f"Replied to {user.mention} in {interaction.channel.mention}",
                 color=discord.Color.green()
             ),
             ephemeral=True
         )
+        
+    except Exception as e:
+        await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ Reply Failed",
+                description=f"Error: {str(e)}",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
 
-# Updated set-welcome command
-@bot.tree.command(name="set-welcome", description="Configure welcome messages (Admin only)")
+@bot.tree.command(name="add-social-tracker", description="Add social media account tracking")
 @app_commands.describe(
-    welcome_channel="Channel to send welcome messages"
+    platform="Select platform to track",
+    account_url="Full URL to the account",
+    post_channel="Channel to post updates",
+    upload_alerts="YouTube only: also post new uploads and live streams"
 )
-async def set_welcome(interaction: discord.Interaction, welcome_channel: discord.TextChannel):
+@app_commands.choices(platform=[
+    app_commands.Choice(name=provider.label, value=provider.name.value)
+    for provider in PLATFORM_PROVIDERS.values()
+])
+@deferred()
+async def add_social_tracker(interaction: discord.Interaction, 
+                            platform: str, 
+                            account_url: str,
+                            post_channel: discord.TextChannel,
+                            upload_alerts: bool = False):
+    """Add social media account tracking"""
     if not interaction.user.guild_permissions.manage_guild:
-        await interaction.response.send_message(
+        return await send_response(
+            interaction,
             embed=create_embed(
                 title="❌ Permission Denied",
-                description="You need 'Manage Server' permission",
+                description="You need 'Manage Server' permission to set up trackers",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
-        return
-    
-    await interaction.response.send_modal(WelcomeConfigModal(welcome_channel))
-
-@bot.event
-async def on_member_join(member: discord.Member):
-    """Send welcome messages when a member joins"""
-    guild_id = str(member.guild.id)
-    
-    # Check if welcome is configured
-    if guild_id not in guild_configs:
-        return
     
-    welcome_channel_id = guild_configs[guild_id].get("welcome_channel")
+    guild_id = str(interaction.guild.id)
+    provider = PLATFORM_PROVIDERS[platform]
     
-    # Send channel welcome
-    if welcome_channel_id:
-        try:
-            channel = member.guild.get_channel(welcome_channel_id)
-            if channel:
-                # Create embed with proper formatting
-                welcome_text = (
-                    "First click on Nexus Esports above\n"
-                    "and select 'Show All Channels' so that\n"
-                    "all channels become visible to you.\n\n"
-                    "💕 Welcome to Nexus Esports 💕"
-                )
-                
-                embed = discord.Embed(
-                    description=(
-                        f"Bro {member.mention},\n\n"  # Mention outside the code block
-                        f"```\n{welcome_text}\n```"   # Instructions inside code block
-                    ),
-                    color=discord.Color(0x3e0000)
-                )
-                # Set GIF
-                embed.set_image(url="https://cdn.discordapp.com/attachments/1378018158010695722/1378426905585520901/standard_2.gif")
-                
-                await channel.send(embed=embed)
-        except Exception as e:
-            print(f"⚠️ Error sending channel welcome: {e}")
+    if not provider.enabled():
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title=f"❌ {provider.label} Disabled",
+                description=provider.disabled_reason,
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
     
-    # Send DM welcome
     try:
-        welcome_dm = guild_configs[guild_id].get("welcome_dm")
-        dm_attachment_url = guild_configs[guild_id].get("dm_attachment_url")
-        
-        if welcome_dm:
-            # Use configured DM
-            embed = discord.Embed(
-                description=welcome_dm,
-                color=discord.Color(0x3e0000),
-                timestamp=datetime.utcnow()
-            )
-            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-            
-            # Add attachment if provided
-            if dm_attachment_url:
-                embed.set_image(url=dm_attachment_url)
-            
-            if member.guild.icon:
-                embed.set_thumbnail(url=member.guild.icon.url)
-            
-            await member.send(embed=embed)
-        else:
-            # Fallback to fixed DM
-            dm_message = (
-                "🌟 Welcome to Nexus Esports! 🌟\n\n"
-                "Thank you for joining our gaming community! We're excited to have you on board.\n\n"
-                "As mentioned in our welcome channel:\n"
-                "1. Click \"Nexus Esports\" at the top of the server\n"
-                "2. Select \"Show All Channels\" to access everything\n"
-                "3. Explore our community spaces!\n\n"
-                "Quick Start:\n"
-                "• Read #rules for guidelines\n"
-                "• Introduce yourself in #introductions\n"
-                "• Check #announcements for news\n"
-                "• Join tournaments in #events\n\n"
-                "Need help? Contact @acroneop or our mod team anytime!\n\n"
-                "We're glad you're here! 🎮"
-            )
-            
-            embed = discord.Embed(
-                description=dm_message,
-                color=discord.Color(0x3e0000),
-                timestamp=datetime.utcnow()
-            )
-            embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-            
-            if member.guild.icon:
-                embed.set_thumbnail(url=member.guild.icon.url)
-            
-            await member.send(embed=embed)
-    except discord.Forbidden:
-        pass  # User has DMs disabled
+        resolved = await provider.resolve_account(account_url)
+    except TrackerSetupError as e:
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title=e.title,
+                description=e.description,
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+    except HttpError as e:
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ YouTube API Error",
+                description=f"YouTube API error: {str(e)}",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
     except Exception as e:
-        print(f"⚠️ Error sending welcome DM: {e}")
-
-@bot.tree.command(name="ping", description="Test bot responsiveness")
-async def ping(interaction: discord.Interaction):
-    """Simple ping command with latency check"""
-    latency = round(bot.latency * 1000)
-    embed = create_embed(
-        title="🏓 Pong!",
-        description=f"Bot latency: {latency}ms",
-        color=discord.Color.green()
-    )
-    await interaction.response.send_message(embed=embed)
-
-@bot.tree.command(name="my-permissions", description="Check your announcement permissions")
-async def check_perms(interaction: discord.Interaction):
-    """Command for users to check why they can't use announcement commands"""
-    has_perm = has_announcement_permission(interaction)
-    perm_status = "✅ You HAVE announcement permissions!" if has_perm else "❌ You DON'T HAVE announcement permissions"
+        return await send_response(
+            interaction,
+            embed=create_embed(
+                title="❌ Setup Failed",
+                description=f"Error: {str(e)}",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
     
-    # Get user's roles
-    roles = ", ".join([role.name for role in interaction.user.roles]) or "No roles"
+    tracker = Tracker.from_dict({
+        'platform': platform,
+        **resolved,
+        'post_channel': post_channel.id,
+        'upload_alerts': upload_alerts
+    })
     
-    # Get current guild's announcement role
-    guild_id = str(interaction.guild.id)
-    announce_role_id = guild_configs.get(guild_id, {}).get("announcement_role") if interaction.guild else None
+    # Add to trackers
+    tracker = social_trackers.update(guild_id, lambda trackers: add_trackers(trackers, [tracker])[0], default=list)
     
-    description = (
-        f"{perm_status}\n\n"
-        f"**Your roles:** {roles}\n"
-        f"**Announcement role ID:** {announce_role_id or 'Not set'}\n"
-        f"**Manage Messages permission:** {interaction.user.guild_permissions.manage_messages}\n"
-        f"**Server Owner:** {interaction.user.id == interaction.guild.owner_id}\n\n"
-        f"Contact server admins if you should have access."
+    # Subscribe the new channel for push notifications right away
+    receiver = getattr(bot, 'youtube_feed', None)
+    if receiver and platform == "youtube":
+        asyncio.get_running_loop().create_task(receiver.sync_subscriptions())
+    
+    await send_response(
+        interaction,
+        embed=create_embed(
+            title="✅ Tracker Added",
+            description=(
+                f"Now tracking **{tracker.account_name}** on {provider.label}!\n"
+                f"Updates will be posted in {post_channel.mention}"
+            ),
+            color=discord.Color.green()
+        ),
+        ephemeral=True
     )
+
+TRACKERS_PAGE_SIZE = 10
+
+def tracker_list_page(guild: discord.Guild, page: int, platform: Optional[str], channel_id: Optional[int]) -> tuple:
+    """Embed and navigation view for one page of the guild's trackers; only that page is rendered"""
+    trackers = [
+        tracker for tracker in social_trackers.get(str(guild.id), ())
+        if (platform is None or tracker.platform == platform) and (channel_id is None or tracker.post_channel == channel_id)
+    ]
+    pages = max(1, -(-len(trackers) // TRACKERS_PAGE_SIZE))
+    page = min(max(page, 1), pages)
     
-    embed = create_embed(
-        title="🔑 Your Permissions",
-        description=description,
-        color=discord.Color.blue()
+    filters = []
+    if platform:
+        filters.append(PLATFORM_PROVIDERS[platform].label)
+    if channel_id:
+        filters.append(f"<#{channel_id}>")
+    embed = discord.Embed(
+        title="📊 Active Social Trackers",
+        description=f"Filtered by {' and '.join(filters)}" if filters else None,
+        color=discord.Color.blue(),
+        timestamp=datetime.utcnow()
     )
+    start = (page - 1) * TRACKERS_PAGE_SIZE
+    for tracker in trackers[start:start + TRACKERS_PAGE_SIZE]:
+        channel = guild.get_channel(tracker.post_channel)
+        embed.add_field(
+            name=f"#{tracker.id} {tracker.account_name}",
+            value=(
+                f"**Platform:** {PLATFORM_PROVIDERS[tracker.platform].label}\n"
+                f"**Channel:** {channel.mention if channel else 'Not found'}\n"
+                f"**Current Count:** {tracker.last_count:,}\n"
+                f"[View Profile]({tracker.url})"
+            ),
+            inline=False
+        )
+    if not trackers:
+        embed.description = "No trackers match these filters" if filters else "No active trackers configured"
+    embed.set_footer(text=f"Page {page}/{pages} • {len(trackers)} trackers • Remove one by its #ID with /remove-social-tracker")
     
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    view = discord.ui.View(timeout=None)
+    if pages > 1:
+        view.add_item(TrackerPageButton(page - 1, platform, channel_id, "◀ Previous", disabled=page == 1))
+        view.add_item(TrackerPageButton(page + 1, platform, channel_id, "Next ▶", disabled=page == pages))
+    return embed, view
 
-@bot.tree.command(name="add-link", description="Add a professional formatted link")
-@app_commands.describe(
-    url="The URL to add (must start with http:// or https://)",
-    title="(Optional) Title for the link",
-    description="(Optional) Description text"
-)
-async def add_link(interaction: discord.Interaction, 
-                  url: str, 
-                  title: Optional[str] = None,
-                  description: Optional[str] = None):
-    """Add a professional formatted link with Nexus Esports styling"""
-    # Validate URL format
-    if not url.startswith(("http://", "https://")):
+class TrackerPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"trackers:(?P<page>\d+):(?P<platform>[a-z]*):(?P<channel>\d*)"
+):
+    """
+    Page navigation for /list-social-trackers. The target page and filters
+    live in the custom ID, so the buttons keep working after a restart
+    without the bot remembering any listing.
+    """
+
+    def __init__(self, page: int, platform: Optional[str], channel_id: Optional[int], label: str, disabled: bool = False):
+        super().__init__(discord.ui.Button(
+            label=label,
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"trackers:{page}:{platform or ''}:{channel_id or ''}",
+            disabled=disabled
+        ))
+        self.page = page
+        self.platform = platform
+        self.channel_id = channel_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(
+            int(match['page']),
+            match['platform'] or None,
+            int(match['channel']) if match['channel'] else None,
+            item.label
+        )
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.guild is None or not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message(
+                embed=create_embed(
+                    title="❌ Permission Denied",
+                    description="You need 'Manage Server' permission",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = tracker_list_page(interaction.guild, self.page, self.platform, self.channel_id)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+bot.add_dynamic_items(TrackerPageButton)
+
+@bot.tree.command(name="list-social-trackers", description="Show active social media trackers")
+@app_commands.describe(platform="Only show this platform", channel="Only show trackers posting here")
+@app_commands.choices(platform=[
+    app_commands.Choice(name=provider.label, value=provider.name.value)
+    for provider in PLATFORM_PROVIDERS.values()
+])
+async def list_social_trackers(interaction: discord.Interaction, platform: Optional[str] = None,
+                               channel: Optional[discord.TextChannel] = None):
+    """List active social trackers"""
+    if not interaction.user.guild_permissions.manage_guild:
         return await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Invalid URL",
-                description="URL must start with http:// or https://",
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
     
-    try:
-        # Create the core link text
-        link_text = f"[Click Here]({url})"
-        
-        # Build the embed description
-        embed_description = f"**➤ {link_text}**"
-        if description:
-            embed_description += f"\n\n{description}"
-        
-        # Create the embed
-        embed = create_embed(
-            title=title if title else "🔗 Nexus Esports Link",
-            description=embed_description,
-            color=discord.Color(0x3e0000)
+    embed, view = tracker_list_page(interaction.guild, 1, platform, channel.id if channel else None)
+    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+@bot.tree.command(name="remove-social-tracker", description="Remove a social media tracker")
+@app_commands.describe(tracker_id="Tracker ID shown as #ID by /list-social-trackers")
+async def remove_social_tracker(interaction: discord.Interaction, tracker_id: int):
+    """Remove social tracker"""
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
+            embed=create_embed(
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
         )
-        # Make the title clickable
-        embed.url = url
-        
-        # Send the formatted link
-        await interaction.response.send_message(embed=embed)
-        
-    except Exception as e:
-        await interaction.response.send_message(
+    
+    def remove(trackers):
+        for index, tracker in enumerate(trackers):
+            if tracker.id == tracker_id:
+                return trackers.pop(index)
+        return None
+    removed = social_trackers.update(str(interaction.guild.id), remove, default=list)
+    
+    if removed is None:
+        return await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Error Creating Link",
-                description=f"An error occurred: {str(e)}",
+                title="❌ Tracker Not Found",
+                description=f"There is no tracker #{tracker_id}. See /list-social-trackers",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
+    
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="✅ Tracker Removed",
+            description=f"No longer tracking **{removed.account_name}** (#{removed.id})",
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
 
-# New: Reply in Channel Command
-@bot.tree.command(name="reply-in-channel", description="Reply to a user in this channel (Mods only)")
+# Bulk tracker import and export
+IMPORT_MAX_ROWS = 500
+IMPORT_MAX_BYTES = 1024 * 1024
+EXPORT_COLUMNS = ('platform', 'url', 'channel', 'upload_alerts', 'account_name', 'last_count')
+
+PLATFORM_URL_MARKERS = (
+    ("youtube.com/", Platform.YOUTUBE),
+    ("instagram.com/", Platform.INSTAGRAM),
+    ("twitch.tv/", Platform.TWITCH),
+    ("tiktok.com/", Platform.TIKTOK),
+    ("x.com/", Platform.X),
+    ("twitter.com/", Platform.X)
+)
+
+def platform_for_url(url: str) -> Optional[Platform]:
+    host_and_path = url.split("://", 1)[-1].lower().removeprefix("www.").removeprefix("m.")
+    for marker, platform in PLATFORM_URL_MARKERS:
+        if host_and_path.startswith(marker):
+            return platform
+    return None
+
+def parse_tracker_file(data: bytes, filename: str) -> list:
+    """Rows of a CSV or JSON tracker file as dicts with lowercase keys; raises ValueError when unreadable"""
+    text = data.decode('utf-8-sig')
+    if filename.lower().endswith('.json') or text.lstrip().startswith(('[', '{')):
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if isinstance(rows, dict):
+            rows = rows.get('trackers')
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("JSON must be a list of tracker objects")
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    return [
+        {str(key).strip().lower(): str(value).strip() for key, value in row.items() if key is not None and value is not None}
+        for row in rows
+    ]
+
+def parse_flag(value: str, default: bool) -> bool:
+    value = value.lower()
+    if value in ('1', 'true', 'yes', 'y', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'n', 'off'):
+        return False
+    return default
+
+def import_error_text(error: Exception) -> str:
+    if isinstance(error, TrackerSetupError):
+        return error.description
+    if isinstance(error, HttpError):
+        return f"YouTube API error: {error}"
+    return f"Error: {error}"
+
+@bot.tree.command(name="import-trackers", description="Add many social trackers from a CSV or JSON file (Admin only)")
 @app_commands.describe(
-    user="The user you're replying to",
-    message="Your reply message content",
-    message_id="(Optional) ID of the specific message to reply to"
+    file="CSV or JSON with platform, url, channel and optionally upload_alerts (the /export-trackers format)",
+    default_channel="Channel for rows that don't name one"
 )
-async def reply_in_channel(interaction: discord.Interaction, 
-                         user: discord.Member,
-                         message: str,
-                         message_id: Optional[str] = None):
-    """Reply to a user in the current channel with professional formatting"""
-    # Check permissions
-    if not interaction.user.guild_permissions.manage_messages:
-        return await interaction.response.send_message(
+@deferred()
+async def import_trackers(interaction: discord.Interaction, file: discord.Attachment,
+                          default_channel: Optional[discord.TextChannel] = None):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await send_response(
+            interaction,
             embed=create_embed(
                 title="❌ Permission Denied",
-                description="You need 'Manage Messages' permission to use this command",
+                description="You need 'Manage Server' permission to set up trackers",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
     
     try:
-        # Create the arrow symbol and formatted message
-        arrow = "↳"
-        formatted_content = (
-            f"{arrow} **Replying to {user.mention}**\n\n"
-            f"```\n{message}\n```"
-        )
-        
-        # Create embed
-        embed = discord.Embed(
-            description=formatted_content,
-            color=discord.Color(0x3e0000),
-            timestamp=datetime.utcnow()
-        )
-        embed.set_footer(text="Nexus Esports Official | DM Moderators or Officials for any Query!")
-        
-        # Handle message reference if provided
-        reference = None
-        if message_id:
-            try:
-                message_id_int = int(message_id)
-                # Fetch the message to verify it exists
-                ref_message = await interaction.channel.fetch_message(message_id_int)
-                reference = ref_message.to_reference(fail_if_not_exists=False)
-            except (ValueError, discord.NotFound, discord.HTTPException):
-                # Send without reference if message not found
-                pass
-        
-        # Send the reply
-        await interaction.channel.send(
-            embed=embed,
-            reference=reference
-        )
-        
-        # Confirm to moderator
-        await interaction.response.send_message(
-            embed=create_embed(
-                title="✅ Reply Sent",
-                description=f"Replied to {user.mention} in {interaction.channel.mention}",
-                color=discord.Color.green()
-            ),
+        if file.size > IMPORT_MAX_BYTES:
+            raise ValueError(f"Files can be at most {IMPORT_MAX_BYTES // 1024} KB")
+        rows = parse_tracker_file(await file.read(), file.filename)
+        if len(rows) > IMPORT_MAX_ROWS:
+            raise ValueError(f"Import at most {IMPORT_MAX_ROWS} trackers at a time (this file has {len(rows)})")
+    except (ValueError, UnicodeDecodeError, csv.Error, discord.HTTPException) as e:
+        return await send_response(
+            interaction,
+            embed=create_embed(title="❌ Can't Read File", description=str(e), color=discord.Color.red()),
             ephemeral=True
         )
-        
-    except Exception as e:
-        await interaction.response.send_message(
+    
+    guild = interaction.guild
+    channels_by_name = {channel.name.lower(): channel for channel in guild.text_channels}
+    results = [None] * len(rows)  # Row index -> (status, detail)
+    pending = {}  # Platform -> [(row index, url, channel, upload_alerts)]
+    for index, row in enumerate(rows):
+        url = row.get('url') or row.get('account_url', '')
+        platform = row.get('platform', '').lower() or platform_for_url(url)
+        channel_ref = (row.get('channel') or row.get('post_channel') or '').strip('<#>')
+        if channel_ref.isdigit():
+            channel = guild.get_channel(int(channel_ref))
+        elif channel_ref:
+            channel = channels_by_name.get(channel_ref.lower())
+        else:
+            channel = default_channel
+        if not url:
+            results[index] = ("error", "Missing url")
+        elif platform not in PLATFORM_PROVIDERS:
+            results[index] = ("error", f"Unknown platform '{platform or '?'}'")
+        elif not PLATFORM_PROVIDERS[platform].enabled():
+            results[index] = ("error", PLATFORM_PROVIDERS[platform].disabled_reason)
+        elif not isinstance(channel, discord.TextChannel):
+            results[index] = ("error", f"Channel '{channel_ref}' not found" if channel_ref else "No channel given")
+        else:
+            upload_alerts = parse_flag(row.get('upload_alerts', ''), False)
+            pending.setdefault(PLATFORM_PROVIDERS[platform], []).append((index, url, channel, upload_alerts))
+    
+    # Every platform resolves at once; each provider batches and pools its own lookups
+    started = time.perf_counter()
+    resolved = await asyncio.gather(*(
+        provider.resolve_accounts([url for _, url, _, _ in entries])
+        for provider, entries in pending.items()
+    ))
+    
+    existing = {
+        (tracker.platform, tracker.account_id, tracker.post_channel)
+        for tracker in social_trackers.get(str(guild.id), ())
+    }
+    new_trackers = []
+    for (provider, entries), fields_by_url in zip(pending.items(), resolved):
+        for index, url, channel, upload_alerts in entries:
+            fields = fields_by_url[url]
+            if isinstance(fields, Exception):
+                results[index] = ("error", import_error_text(fields))
+                continue
+            tracker = Tracker.from_dict({
+                'platform': provider.name,
+                **fields,
+                'post_channel': channel.id,
+                'upload_alerts': upload_alerts
+            })
+            key = (tracker.platform, tracker.account_id, tracker.post_channel)
+            if key in existing:
+                results[index] = ("skipped", f"Already tracked in #{channel.name}")
+                continue
+            existing.add(key)
+            new_trackers.append(tracker)
+            results[index] = ("added", f"{tracker.account_name} ({tracker.last_count:,} {provider.unit}) in #{channel.name}")
+    
+    # One write for the whole import
+    if new_trackers:
+        new_trackers = social_trackers.update(str(guild.id), lambda trackers: add_trackers(trackers, new_trackers), default=list)
+        receiver = getattr(bot, 'youtube_feed', None)
+        if receiver and any(tracker.platform is Platform.YOUTUBE for tracker in new_trackers):
+            asyncio.get_running_loop().create_task(receiver.sync_subscriptions())
+    tracker_log.info("Imported %d of %d trackers", len(new_trackers), len(rows), extra={
+        'guild': guild.id, 'count': len(new_trackers), 'latency_ms': (time.perf_counter() - started) * 1000
+    })
+    
+    report = io.StringIO()
+    writer = csv.writer(report)
+    writer.writerow(('row', 'url', 'status', 'detail'))
+    for index, (row, (status, detail)) in enumerate(zip(rows, results), 2):  # Row 1 is the CSV header
+        writer.writerow((index, row.get('url') or row.get('account_url', ''), status, detail))
+    
+    counts = Counter(status for status, _ in results)
+    failures = [f"Row {index}: {detail}" for index, (status, detail) in enumerate(results, 2) if status == "error"]
+    description = (
+        f"✅ **{counts['added']}** added • ⏭️ **{counts['skipped']}** already tracked • "
+        f"❌ **{counts['error']}** failed"
+    )
+    if failures:
+        description += "\n\n" + "\n".join(failures[:10])
+        if len(failures) > 10:
+            description += f"\n…and {len(failures) - 10} more in the attached report"
+    await send_response(
+        interaction,
+        embed=create_embed(
+            title="📥 Tracker Import",
+            description=description[:4000],
+            color=discord.Color.green() if not failures else discord.Color.orange()
+        ),
+        file=discord.File(io.BytesIO(report.getvalue().encode()), filename="import-report.csv"),
+        ephemeral=True
+    )
+
+@bot.tree.command(name="export-trackers", description="Download this server's social trackers (Admin only)")
+@app_commands.describe(format="File format; both can be imported again with /import-trackers")
+@app_commands.choices(format=[
+    app_commands.Choice(name="CSV", value="csv"),
+    app_commands.Choice(name="JSON", value="json")
+])
+async def export_trackers(interaction: discord.Interaction, format: str = "csv"):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Reply Failed",
-                description=f"Error: {str(e)}",
+                title="❌ Permission Denied",
+                description="You need 'Manage Server' permission",
                 color=discord.Color.red()
             ),
             ephemeral=True
         )
+    
+    trackers = social_trackers.get(str(interaction.guild.id), ())
+    rows = [
+        {
+            'platform': tracker.platform.value,
+            'url': tracker.url,
+            'channel': str(tracker.post_channel),
+            'upload_alerts': tracker.upload_alerts,
+            'account_name': tracker.account_name,
+            'last_count': tracker.last_count
+        }
+        for tracker in trackers
+    ]
+    if format == "json":
+        data = json.dumps(rows, indent=2)
+    else:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+        data = buffer.getvalue()
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="📤 Tracker Export",
+            description=f"{len(rows)} tracker{'s' if len(rows) != 1 else ''} from **{interaction.guild.name}**",
+            color=discord.Color.blue()
+        ),
+        file=discord.File(io.BytesIO(data.encode()), filename=f"trackers-{interaction.guild.id}.{format}"),
+        ephemeral=True
+    )
+
+# Tournament brackets
+BRACKET_MAX_ROWS = 64  # Larger early rounds are left out of the image; /tournament matches lists them
+
+def seed_order(size: int) -> list:
+    """Bracket positions for seeds 1..size: 1 meets the lowest seed, and 1 and 2 can only meet in the final"""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+def build_bracket(players: list, double_elimination: bool) -> list:
+    """
+    Lay out every match up front with direct links to where its winner (and
+    loser) goes next, so recording a result never searches the bracket.
+    Missing seeds become byes and are advanced straight away. Double
+    elimination ends in a single grand final without a bracket reset.
+    """
+    size = 1 << max(1, (len(players) - 1).bit_length())
+    rounds = size.bit_length() - 1
+    matches = []
+
+    def add_round(bracket, round_number, count):
+        start = len(matches)
+        matches.extend(Match(start + index, bracket, round_number) for index in range(count))
+        return start
+
+    winners = [add_round('W', round_number, size >> round_number) for round_number in range(1, rounds + 1)]
+    winner_to = {}
+    loser_to = {}
+    for round_number in range(1, rounds):
+        for index in range(size >> round_number):
+            winner_to[winners[round_number - 1] + index] = (winners[round_number] + index // 2, index % 2)
+
+    if double_elimination:
+        # Losers rounds come in pairs: survivors play each other, then meet the next winners round's losers
+        losers = [add_round('L', round_number, size >> ((round_number + 3) // 2)) for round_number in range(1, 2 * rounds - 1)]
+        final = add_round('F', 1, 1)
+        winner_to[winners[-1]] = (final, 0)
+        if rounds == 1:
+            loser_to[winners[0]] = (final, 1)
+        else:
+            for index in range(size >> 1):
+                loser_to[winners[0] + index] = (losers[0] + index // 2, index % 2)
+            for round_number in range(1, rounds):
+                minor, major = losers[2 * round_number - 2], losers[2 * round_number - 1]
+                count = size >> (round_number + 1)
+                for index in range(count):
+                    winner_to[minor + index] = (major + index, 0)
+                    # Dropped players enter in reverse order to put off rematches
+                    loser_to[winners[round_number] + index] = (major + count - 1 - index, 1)
+                for index in range(count):
+                    if round_number < rounds - 1:
+                        winner_to[major + index] = (losers[2 * round_number] + index // 2, index % 2)
+                    else:
+                        winner_to[major] = (final, 1)
+
+    matches = [
+        dataclasses.replace(match, winner_to=winner_to.get(match.id), loser_to=loser_to.get(match.id))
+        for match in matches
+    ]
+    slots = [players[seed - 1] if seed <= len(players) else BYE for seed in seed_order(size)]
+    for index in range(size >> 1):
+        place_player(matches, (winners[0] + index, 0), slots[2 * index])
+        place_player(matches, (winners[0] + index, 1), slots[2 * index + 1])
+    return matches
+
+def place_player(matches: list, target: tuple, player: int):
+    match_id, slot = target
+    match = matches[match_id]
+    players = list(match.players)
+    players[slot] = player
+    match = matches[match_id] = dataclasses.replace(match, players=tuple(players))
+    if BYE in match.players and None not in match.players:
+        # Nobody to play: the other player (or another bye) goes through
+        decide_match(matches, match_id, match.players[1] if match.players[0] == BYE else match.players[0])
+
+def decide_match(matches: list, match_id: int, winner: int):
+    """
+    Record a result and move both players on. Following the links touches
+    O(1) matches apart from chains of byes, but callers pass a copy of the
+    tournament's match list, so recording a result costs O(matches) overall.
+    """
+    match = matches[match_id]
+    loser = match.players[1] if match.players[0] == winner else match.players[0]
+    matches[match_id] = dataclasses.replace(match, winner=winner)
+    if match.winner_to:
+        place_player(matches, match.winner_to, winner)
+    if match.loser_to:
+        place_player(matches, match.loser_to, loser)
+
+def match_label(match: Match) -> str:
+    names = {'W': "Winners", 'L': "Losers", 'F': "Grand Final"}
+    return names['F'] if match.bracket == 'F' else f"{names[match.bracket]} R{match.round}"
+
+def render_bracket(tournament: Tournament) -> bytes:
+    """Draw the bracket as a PNG. Blocking, so it runs in a worker thread"""
+    box_width, box_height, column_gap, row_height, margin = 190, 40, 40, 56, 20
+    font = ImageFont.load_default()
+
+    def player_name(player):
+        if player is None:
+            return "TBD"
+        if player == BYE:
+            return "BYE"
+        return tournament.participants.get(player, str(player))[:22]
+
+    # One section per bracket; each starts at its first round small enough to draw
+    sections = []
+    for bracket in ('W', 'L', 'F'):
+        columns = {}
+        for match in tournament.matches:
+            if match.bracket == bracket:
+                columns.setdefault(match.round, []).append(match)
+        drawable = [columns[round_number] for round_number in sorted(columns) if len(columns[round_number]) <= BRACKET_MAX_ROWS]
+        if drawable:
+            sections.append(drawable)
+
+    column_count = max((len(section) for section in sections), default=1)
+    section_heights = [len(section[0]) * row_height for section in sections]
+    width = margin * 2 + column_count * (box_width + column_gap)
+    height = margin * 2 + sum(section_heights) + 30 * len(sections)
+    image = Image.new("RGB", (width, height), (30, 33, 36))
+    draw = ImageDraw.Draw(image)
+
+    positions = {}
+    top = margin
+    for section, section_height in zip(sections, section_heights):
+        draw.text((margin, top), match_label(section[0][0]).rsplit(" R", 1)[0], fill=(200, 200, 200), font=font)
+        top += 20
+        for column, matches in enumerate(section):
+            x = margin + column * (box_width + column_gap)
+            for index, match in enumerate(matches):
+                y = top + (index + 0.5) * section_height / len(matches) - box_height / 2
+                positions[match.id] = (x, y)
+                draw.rectangle((x, y, x + box_width, y + box_height), outline=(90, 90, 90), fill=(47, 49, 54))
+                for slot, player in enumerate(match.players):
+                    won = match.winner is not None and player == match.winner
+                    color = (255, 215, 0) if won else (220, 220, 220)
+                    draw.text((x + 6, y + 4 + slot * 18), player_name(player), fill=color, font=font)
+                draw.text((x + box_width - 28, y + 2), f"#{match.id}", fill=(120, 120, 120), font=font)
+        top += section_height + 10
+
+    # Connect each match to the one its winner moves to, when both are drawn
+    for match in tournament.matches:
+        if match.id in positions and match.winner_to and match.winner_to[0] in positions:
+            x, y = positions[match.id]
+            target_x, target_y = positions[match.winner_to[0]]
+            if target_x > x:
+                start = (x + box_width, y + box_height / 2)
+                end = (target_x, target_y + box_height / 2)
+                middle = (start[0] + end[0]) / 2
+                draw.line((start, (middle, start[1]), (middle, end[1]), end), fill=(90, 90, 90))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
+
+class BracketRenderer:
+    """Renders brackets off the event loop; an image is reused until the tournament's revision changes"""
+
+    def __init__(self):
+        self._renders = {}  # guild_id -> ((tournament id, revision), task)
+
+    async def render(self, guild_id: str, tournament: Tournament) -> bytes:
+        key = (tournament.id, tournament.revision)
+        cached = self._renders.get(guild_id)
+        if cached is None or cached[0] != key:
+            # Concurrent requests for the same revision share one render
+            task = asyncio.get_running_loop().create_task(asyncio.to_thread(render_bracket, tournament))
+            cached = self._renders[guild_id] = (key, task)
+        try:
+            return await cached[1]
+        except Exception:
+            if self._renders.get(guild_id) is cached:
+                del self._renders[guild_id]
+            raise
+
+bracket_renderer = BracketRenderer()
+
+async def send_bracket(interaction: discord.Interaction, tournament: Tournament, title: str, description: str):
+    image = await bracket_renderer.render(str(interaction.guild.id), tournament)
+    embed = create_embed(title=title, description=description, color=discord.Color.gold())
+    embed.set_image(url="attachment://bracket.png")
+    await send_response(interaction, embed=embed, file=discord.File(io.BytesIO(image), filename="bracket.png"))
+
+tournament_group = app_commands.Group(name="tournament", description="Tournament registration and brackets")
+
+def tournament_error(title: str, description: str) -> dict:
+    return {'embed': create_embed(title=title, description=description, color=discord.Color.red()), 'ephemeral': True}
+
+@tournament_group.command(name="create", description="Open registration for a new tournament (Admin only)")
+@app_commands.describe(
+    name="Tournament name",
+    capacity="Maximum number of players",
+    format="Bracket format"
+)
+@app_commands.choices(format=[
+    app_commands.Choice(name="Single elimination", value="single"),
+    app_commands.Choice(name="Double elimination", value="double")
+])
+async def tournament_create(interaction: discord.Interaction, name: str,
+                            capacity: app_commands.Range[int, 2, 4096], format: str = "single"):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(**tournament_error("❌ Permission Denied", "You need 'Manage Server' permission"))
+
+    guild_id = str(interaction.guild.id)
+    current = tournaments.get(guild_id)
+    if current and current.status != 'finished':
+        return await interaction.response.send_message(**tournament_error(
+            "❌ Tournament Already Running",
+            f"**{current.name}** is still {current.status}. Finish it or use `/tournament cancel` first."
+        ))
+
+    tournament = Tournament(
+        id=secrets.token_hex(4),
+        name=name,
+        capacity=capacity,
+        double_elimination=format == "double",
+        created_by=interaction.user.id
+    )
+    tournaments.swap(guild_id, lambda _: tournament)
+    await interaction.response.send_message(embed=create_embed(
+        title=f"🏆 {name}",
+        description=(
+            f"Registration is open for **{capacity}** players "
+            f"({'double' if tournament.double_elimination else 'single'} elimination).\n"
+            "Use `/tournament join` to sign up!"
+        ),
+        color=discord.Color.gold()
+    ))
+
+@tournament_group.command(name="join", description="Register for the current tournament")
+async def tournament_join(interaction: discord.Interaction):
+    guild_id = str(interaction.guild.id)
+    tournament = tournaments.get(guild_id)
+    if tournament is None or tournament.status != 'registration':
+        return await interaction.response.send_message(**tournament_error("❌ Registration Closed", "There is no tournament open for registration"))
+    if interaction.user.id in tournament.participants:
+        return await interaction.response.send_message(**tournament_error("❌ Already Registered", f"You're already in **{tournament.name}**"))
+    if len(tournament.participants) >= tournament.capacity:
+        return await interaction.response.send_message(**tournament_error("❌ Tournament Full", f"**{tournament.name}** has reached {tournament.capacity} players"))
+
+    tournament = tournaments.swap(guild_id, lambda current: dataclasses.replace(
+        current,
+        participants=MappingProxyType({**current.participants, interaction.user.id: interaction.user.display_name}),
+        revision=current.revision + 1
+    ))
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="✅ Registered",
+            description=f"You're in **{tournament.name}** ({len(tournament.participants)}/{tournament.capacity})",
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
+
+@tournament_group.command(name="leave", description="Withdraw from the current tournament before it starts")
+async def tournament_leave(interaction: discord.Interaction):
+    guild_id = str(interaction.guild.id)
+    tournament = tournaments.get(guild_id)
+    if tournament is None or tournament.status != 'registration' or interaction.user.id not in tournament.participants:
+        return await interaction.response.send_message(**tournament_error("❌ Not Registered", "You aren't registered for a tournament that hasn't started"))
+
+    def withdraw(current):
+        participants = dict(current.participants)
+        participants.pop(interaction.user.id, None)
+        return dataclasses.replace(current, participants=MappingProxyType(participants), revision=current.revision + 1)
+    tournaments.swap(guild_id, withdraw)
+    await interaction.response.send_message(
+        embed=create_embed(title="✅ Withdrawn", description=f"You left **{tournament.name}**", color=discord.Color.green()),
+        ephemeral=True
+    )
+
+@tournament_group.command(name="start", description="Close registration and generate the bracket (Admin only)")
+@app_commands.describe(shuffle="Seed players randomly instead of by registration order")
+@deferred(ephemeral=False)
+async def tournament_start(interaction: discord.Interaction, shuffle: bool = False):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await send_response(interaction, **tournament_error("❌ Permission Denied", "You need 'Manage Server' permission"))
+
+    guild_id = str(interaction.guild.id)
+    tournament = tournaments.get(guild_id)
+    if tournament is None or tournament.status != 'registration':
+        return await send_response(interaction, **tournament_error("❌ Nothing to Start", "There is no tournament in registration"))
+    if len(tournament.participants) < 2:
+        return await send_response(interaction, **tournament_error("❌ Not Enough Players", "At least 2 players must register"))
+
+    seeds = list(tournament.participants.items())
+    if shuffle:
+        random.shuffle(seeds)
+    matches = build_bracket([user_id for user_id, _ in seeds], tournament.double_elimination)
+    tournament = tournaments.swap(guild_id, lambda current: dataclasses.replace(
+        current,
+        status='running',
+        participants=MappingProxyType(dict(seeds)),
+        matches=tuple(matches),
+        revision=current.revision + 1
+    ))
+    ready = sum(1 for match in tournament.matches if match.ready)
+    await send_bracket(
+        interaction,
+        tournament,
+        f"🏆 {tournament.name} Has Started!",
+        f"**{len(seeds)}** players • **{ready}** matches ready to play. Check yours with `/tournament matches`."
+    )
+
+@tournament_group.command(name="report", description="Record a match result (Admin only)")
+@app_commands.describe(winner="Player who won", match="Match number (defaults to the winner's open match)")
+async def tournament_report(interaction: discord.Interaction, winner: discord.Member, match: Optional[int] = None):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(**tournament_error("❌ Permission Denied", "You need 'Manage Server' permission"))
+
+    guild_id = str(interaction.guild.id)
+    tournament = tournaments.get(guild_id)
+    if tournament is None or tournament.status != 'running':
+        return await interaction.response.send_message(**tournament_error("❌ No Running Tournament", "Start a tournament first"))
+
+    if match is None:
+        match = next((m.id for m in tournament.matches if m.ready and winner.id in m.players), None)
+    if match is None or not 0 <= match < len(tournament.matches):
+        return await interaction.response.send_message(**tournament_error("❌ Match Not Found", f"{winner.mention} has no open match"))
+    played = tournament.matches[match]
+    if not played.ready or winner.id not in played.players:
+        return await interaction.response.send_message(**tournament_error(
+            "❌ Invalid Result", f"Match #{match} isn't open or {winner.mention} isn't playing in it"
+        ))
+
+    def record(current):
+        # Copy-on-write: the published tuple is shared with readers, so this copy is O(matches)
+        matches = list(current.matches)
+        decide_match(matches, match, winner.id)
+        champion = matches[-1].winner
+        return dataclasses.replace(
+            current,
+            matches=tuple(matches),
+            status='finished' if champion is not None else current.status,
+            champion=champion,
+            revision=current.revision + 1
+        )
+    tournament = tournaments.swap(guild_id, record)
+    loser = played.players[1] if played.players[0] == winner.id else played.players[0]
 
-@bot.tree.command(name="add-social-tracker", description="Add social media account tracking")
+    if tournament.champion is not None:
+        description = f"🥇 <@{tournament.champion}> wins **{tournament.name}**!"
+        title = "🏆 Tournament Champion!"
+    else:
+        title = f"✅ Match #{match} ({match_label(played)})"
+        description = f"<@{winner.id}> defeated <@{loser}>"
+        for player in (winner.id, loser):
+            upcoming = next((m for m in tournament.matches if m.winner is None and player in m.players), None)
+            if upcoming:
+                opponent = next((p for p in upcoming.players if p != player), None)
+                versus = f"<@{opponent}>" if opponent not in (None, BYE) else "TBD"
+                description += f"\n<@{player}> plays {versus} next in match #{upcoming.id} ({match_label(upcoming)})"
+            elif player == loser:
+                description += f"\n<@{loser}> is eliminated"
+    await interaction.response.send_message(embed=create_embed(title=title, description=description, color=discord.Color.gold()))
+
+@tournament_group.command(name="bracket", description="Show the current bracket")
+@deferred(ephemeral=False)
+async def tournament_bracket(interaction: discord.Interaction):
+    tournament = tournaments.get(str(interaction.guild.id))
+    if tournament is None or not tournament.matches:
+        return await send_response(interaction, **tournament_error("❌ No Bracket", "The bracket is generated when the tournament starts"))
+
+    decided = sum(1 for match in tournament.matches if match.winner is not None)
+    description = f"{decided}/{len(tournament.matches)} matches decided"
+    if tournament.champion is not None:
+        description = f"🥇 Champion: <@{tournament.champion}>\n" + description
+    await send_bracket(interaction, tournament, f"🏆 {tournament.name}", description)
+
+@tournament_group.command(name="matches", description="List matches that are ready to be played")
+async def tournament_matches(interaction: discord.Interaction):
+    tournament = tournaments.get(str(interaction.guild.id))
+    if tournament is None or tournament.status != 'running':
+        return await interaction.response.send_message(**tournament_error("❌ No Running Tournament", "There are no matches to play"))
+
+    ready = [match for match in tournament.matches if match.ready]
+    lines = [f"`#{match.id}` {match_label(match)}: <@{match.players[0]}> vs <@{match.players[1]}>" for match in ready[:20]]
+    if len(ready) > 20:
+        lines.append(f"…and {len(ready) - 20} more")
+    await interaction.response.send_message(
+        embed=create_embed(
+            title=f"⚔️ {tournament.name}: Open Matches",
+            description="\n".join(lines) or "Waiting on results",
+            color=discord.Color.gold()
+        ),
+        ephemeral=True
+    )
+
+@tournament_group.command(name="cancel", description="Delete the current tournament (Admin only)")
+async def tournament_cancel(interaction: discord.Interaction):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(**tournament_error("❌ Permission Denied", "You need 'Manage Server' permission"))
+
+    tournament = tournaments.get(str(interaction.guild.id))
+    if tournament is None:
+        return await interaction.response.send_message(**tournament_error("❌ No Tournament", "There is nothing to cancel"))
+    tournaments.remove(str(interaction.guild.id))
+    await interaction.response.send_message(
+        embed=create_embed(title="✅ Tournament Cancelled", description=f"**{tournament.name}** was deleted", color=discord.Color.green()),
+        ephemeral=True
+    )
+
+bot.tree.add_command(tournament_group)
+
+auto_response_group = app_commands.Group(name="autoresponse", description="Keyword auto-responses")
+
+def manage_guild_denied() -> dict:
+    return {
+        'embed': create_embed(title="❌ Permission Denied", description="You need 'Manage Server' permission", color=discord.Color.red()),
+        'ephemeral': True
+    }
+
+@auto_response_group.command(name="add", description="Reply automatically when a message contains a trigger (Admin only)")
 @app_commands.describe(
-    platform="Select platform to track",
-    account_url="Full URL to the account",
-    post_channel="Channel to post updates"
+    trigger="Word or phrase to look for (case-insensitive)",
+    response="What the bot replies with",
+    cooldown="Seconds before this trigger answers again in the same channel",
+    whole_word="Only match whole words (off matches inside other words too)"
 )
-@app_commands.choices(platform=[
-    app_commands.Choice(name="YouTube", value="youtube"),
-    app_commands.Choice(name="Instagram", value="instagram")
-])
-async def add_social_tracker(interaction: discord.Interaction, 
-                            platform: str, 
-                            account_url: str,
-                            post_channel: discord.TextChannel):
-    """Add social media account tracking"""
+async def auto_response_add(interaction: discord.Interaction,
+                            trigger: app_commands.Range[str, 2, 100],
+                            response: app_commands.Range[str, 1, 2000],
+                            cooldown: app_commands.Range[int, 0, 86400] = 60,
+                            whole_word: bool = True):
     if not interaction.user.guild_permissions.manage_guild:
-        return await interaction.response.send_message(
-            embed=create_embed(
-                title="❌ Permission Denied",
-                description="You need 'Manage Server' permission to set up trackers",
-                color=discord.Color.red()
-            ),
-            ephemeral=True
-        )
-    
+        return await interaction.response.send_message(**manage_guild_denied())
+
     guild_id = str(interaction.guild.id)
-    
-    # Initialize guild storage
-    if guild_id not in social_trackers:
-        social_trackers[guild_id] = []
-    
-    account_info = {}
-    try:
-        if platform == "youtube":
-            if not YOUTUBE_API_KEY:
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ YouTube Disabled",
-                        description="YouTube API key not configured",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            channel_id = None
-            
-            # Extract channel ID from URL
-            if "youtube.com/channel/" in account_url:
-                channel_id = account_url.split("youtube.com/channel/")[1].split("/")[0].split("?")[0]
-            elif "youtube.com/@" in account_url:
-                handle = account_url.split("youtube.com/@")[1].split("/")[0].split("?")[0]
-                
-                # Use channels().list with forHandle parameter
-                request = youtube_service.channels().list(
-                    part="id,snippet",
-                    forHandle=handle
-                )
-                response = request.execute()
-                
-                if not response.get('items'):
-                    return await interaction.response.send_message(
-                        embed=create_embed(
-                            title="❌ Channel Not Found",
-                            description="Couldn't find YouTube channel with that handle",
-                            color=discord.Color.red()
-                        ),
-                        ephemeral=True
-                    )
-                    
-                channel_id = response['items'][0]['id']  # Exact match
-            else:
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Invalid URL",
-                        description="Please provide a valid YouTube channel URL",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            # Get initial stats with valid channel_id
-            request = youtube_service.channels().list(
-                part='statistics,snippet',
-                id=channel_id
-            )
-            response = request.execute()
-            
-            if not response.get('items'):
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Channel Not Found",
-                        description="Couldn't find YouTube channel",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            stats = response['items'][0]['statistics']
-            account_info = {
-                'platform': platform,
-                'url': f"https://www.youtube.com/channel/{channel_id}",
-                'channel_id': channel_id,
-                'account_name': response['items'][0]['snippet']['title'],
-                'last_count': int(stats['subscriberCount']),
-                'post_channel': str(post_channel.id)
-            }
-        
-        elif platform == "instagram":
-            # Extract username from URL
-            if "instagram.com/" not in account_url:
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Invalid URL",
-                        description="Please provide a valid Instagram profile URL",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            username = account_url.split("instagram.com/")[1].split("/")[0].split("?")[0]
-            clean_url = f"https://www.instagram.com/{username}/"
-            
-            # Get initial follower count (approximate)
-            response = requests.get(clean_url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            meta_tag = soup.find('meta', property='og:description')
-            
-            if not meta_tag:
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Account Not Found",
-                        description="Couldn't fetch Instagram data",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            content = meta_tag.get('content', '')
-            if 'Followers' not in content:
-                return await interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Data Extraction Failed",
-                        description="Couldn't find follower count in page",
-                        color=discord.Color.red()
-                    ),
-                    ephemeral=True
-                )
-            
-            followers_str = content.split(' Followers')[0].split(' ')[-1]
-            
-            account_info = {
-                'platform': platform,
-                'url': clean_url,
-                'account_name': username,
-                'post_channel': str(post_channel.id)
-            }
-            
-            # Try to parse follower count
-            try:
-                if 'K' in followers_str:
-                    account_info['last_count'] = int(float(followers_str.replace('K', ''))) * 1000
-                elif 'M' in followers_str:
-                    account_info['last_count'] = int(float(followers_str.replace('M', ''))) * 1000000
-                else:
-                    account_info['last_count'] = int(followers_str.replace(',', ''))
-            except Exception as e:
-                print(f"Instagram follower parse error: {e}")
-                account_info['last_count'] = 0
-    
-    except HttpError as e:
+    trigger = " ".join(trigger.casefold().split())
+    existing = auto_responses.get(guild_id, ())
+    if any(entry.trigger == trigger for entry in existing):
         return await interaction.response.send_message(
-            embed=create_embed(
-                title="❌ YouTube API Error",
-                description=f"YouTube API error: {str(e)}",
-                color=discord.Color.red()
-            ),
+            embed=create_embed(title="❌ Duplicate Trigger", description=f"`{trigger}` already has a response", color=discord.Color.red()),
             ephemeral=True
         )
-    except Exception as e:
+    if len(existing) >= AUTO_RESPONSE_LIMIT:
         return await interaction.response.send_message(
-            embed=create_embed(
-                title="❌ Setup Failed",
-                description=f"Error: {str(e)}",
-                color=discord.Color.red()
-            ),
+            embed=create_embed(title="❌ Limit Reached", description=f"Servers can have up to {AUTO_RESPONSE_LIMIT} triggers", color=discord.Color.red()),
             ephemeral=True
         )
-    
-    # Add to trackers
-    social_trackers[guild_id].append(account_info)
-    save_social_trackers()
-    
+
+    def add(entries):
+        entry = AutoResponse(
+            id=max((entry.id for entry in entries), default=0) + 1,
+            trigger=trigger,
+            response=response,
+            cooldown=cooldown,
+            whole_word=whole_word
+        )
+        entries.append(entry)
+        return entry
+    entry = auto_responses.update(guild_id, add, default=list)
     await interaction.response.send_message(
         embed=create_embed(
-            title="✅ Tracker Added",
-            description=(
-                f"Now tracking **{account_info['account_name']}** on {platform.capitalize()}!\n"
-                f"Updates will be posted in {post_channel.mention}"
-            ),
+            title="✅ Auto-Response Added",
+            description=f"`#{entry.id}` Messages containing **{trigger}** get this reply:\n\n{response}",
             color=discord.Color.green()
         ),
         ephemeral=True
     )
 
-@bot.tree.command(name="list-social-trackers", description="Show active social media trackers")
-async def list_social_trackers(interaction: discord.Interaction):
-    """List active social trackers"""
+@auto_response_group.command(name="remove", description="Delete an auto-response (Admin only)")
+@app_commands.describe(trigger_id="Number shown by /autoresponse list")
+async def auto_response_remove(interaction: discord.Interaction, trigger_id: int):
     if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message(**manage_guild_denied())
+
+    def remove(entries):
+        for index, entry in enumerate(entries):
+            if entry.id == trigger_id:
+                return entries.pop(index)
+        return None
+    removed = auto_responses.update(str(interaction.guild.id), remove, default=list)
+    if removed is None:
         return await interaction.response.send_message(
-            embed=create_embed(
-                title="❌ Permission Denied",
-                description="You need 'Manage Server' permission",
-                color=discord.Color.red()
-            ),
+            embed=create_embed(title="❌ Not Found", description=f"There is no trigger #{trigger_id}", color=discord.Color.red()),
             ephemeral=True
         )
-    
-    guild_id = str(interaction.guild.id)
-    trackers = social_trackers.get(guild_id, [])
-    
-    if not trackers:
+    await interaction.response.send_message(
+        embed=create_embed(title="✅ Auto-Response Removed", description=f"`#{removed.id}` **{removed.trigger}**", color=discord.Color.green()),
+        ephemeral=True
+    )
+
+@auto_response_group.command(name="list", description="Show this server's auto-responses")
+async def auto_response_list(interaction: discord.Interaction):
+    entries = auto_responses.get(str(interaction.guild.id), ())
+    lines = [
+        f"`#{entry.id}` **{entry.trigger}**{'' if entry.whole_word else ' (anywhere)'} • {entry.cooldown}s • "
+        f"{entry.response[:60]}{'…' if len(entry.response) > 60 else ''}"
+        for entry in entries[:25]
+    ]
+    if len(entries) > 25:
+        lines.append(f"…and {len(entries) - 25} more")
+    await interaction.response.send_message(
+        embed=create_embed(
+            title=f"💬 Auto-Responses ({len(entries)}/{AUTO_RESPONSE_LIMIT})",
+            description="\n".join(lines) or "None yet. Add one with `/autoresponse add`.",
+            color=discord.Color.blue()
+        ),
+        ephemeral=True
+    )
+
+bot.tree.add_command(auto_response_group)
+
+@bot.tree.command(name="leaderboard", description="Most active members of this server")
+@app_commands.describe(page="Page of the leaderboard")
+async def leaderboard(interaction: discord.Interaction, page: app_commands.Range[int, 1, None] = 1):
+    guild_activity = activity.guild(str(interaction.guild.id))
+    points, messages = guild_activity.points, guild_activity.messages
+    pages = max(1, -(-len(points) // LEADERBOARD_PAGE_SIZE))
+    page = min(page, pages)
+    offset = (page - 1) * LEADERBOARD_PAGE_SIZE
+    # Mentions render client-side, so no member lookups are needed
+    lines = [
+        f"**{points.rank(user_id)}.** <@{user_id}> • {score:,} points • {messages.get(user_id, 0):,} messages"
+        for user_id, score in points.top(LEADERBOARD_PAGE_SIZE, offset)
+    ]
+    embed = create_embed(
+        title=f"🏆 {interaction.guild.name} Leaderboard",
+        description="\n".join(lines) or "No activity yet. Start chatting!",
+        color=discord.Color.gold()
+    )
+    embed.set_footer(text=f"Page {page}/{pages} • {len(points):,} members • 1 point per active minute")
+    await interaction.response.send_message(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+
+@bot.tree.command(name="rank", description="Show a member's activity rank")
+@app_commands.describe(member="Member to look up (defaults to you)")
+async def rank(interaction: discord.Interaction, member: Optional[discord.Member] = None):
+    member = member or interaction.user
+    guild_activity = activity.guild(str(interaction.guild.id))
+    user_id = str(member.id)
+    position = guild_activity.points.rank(user_id)
+    if position is None:
         return await interaction.response.send_message(
             embed=create_embed(
-                title="📊 Social Trackers",
-                description="No active trackers configured",
+                title="📊 No Activity Yet",
+                description=f"{member.mention} hasn't sent any messages since tracking started.",
                 color=discord.Color.blue()
             ),
             ephemeral=True
         )
-    
-    embed = discord.Embed(
-        title="📊 Active Social Trackers",
-        color=discord.Color.blue(),
-        timestamp=datetime.utcnow()
-    )
-    
-    for i, tracker in enumerate(trackers, 1):
-        channel = interaction.guild.get_channel(int(tracker['post_channel']))
-        count = tracker.get('last_count', 'N/A')
-        if isinstance(count, int):
-            count = f"{count:,}"
-            
-        embed.add_field(
-            name=f"{i}. {tracker['account_name']}",
-            value=(
-                f"**Platform:** {tracker['platform'].capitalize()}\n"
-                f"**Channel:** {channel.mention if channel else 'Not found'}\n"
-                f"**Current Count:** {count}\n"
-                f"[View Profile]({tracker['url']})"
-            ),
-            inline=False
+    embed = create_embed(title=f"📊 {member.display_name}", color=discord.Color.blue())
+    embed.add_field(name="Rank", value=f"#{position:,} of {len(guild_activity.points):,}")
+    embed.add_field(name="Points", value=f"{guild_activity.points.scores[user_id]:,}")
+    embed.add_field(name="Messages", value=f"{guild_activity.messages.get(user_id, 0):,}")
+    embed.set_thumbnail(url=member.display_avatar.url)
+    await interaction.response.send_message(embed=embed)
+
+# Reaction and button roles
+ROLE_EDIT_MERGE_WINDOW = 1.0  # Seconds a guild's role changes wait, so quick toggles collapse into one edit
+ROLE_EDIT_RATE = 5.0  # Member edits per second per guild
+ROLE_EDIT_OVERLAY_TTL = 30  # Seconds our own edit is trusted over a cache the gateway hasn't updated
+ROLE_BUTTONS_PER_MESSAGE = 25
+
+def emoji_key(emoji) -> str:
+    """Custom emojis by ID, so renaming one doesn't break its binding; unicode emojis as themselves"""
+    if isinstance(emoji, str):
+        emoji = discord.PartialEmoji.from_str(emoji)
+    return str(emoji.id) if emoji.id else emoji.name
+
+class RoleMenuIndex:
+    """
+    (message_id, emoji key or 'button:<role_id>') -> (guild_id, role_id) for
+    every binding, so a reaction or button press is one dict lookup. Rebuilt
+    only when the role_menus store publishes a new version.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._version = None
+        self.rebuilds = 0
+
+    def _current(self) -> dict:
+        if self._version != role_menus.version:
+            index = {}
+            for guild_id, bindings in role_menus.items():
+                for binding in bindings:
+                    key = binding_key(binding)
+                    index[(binding.message_id, key)] = (int(guild_id), binding.role_id)
+            self._index = index
+            self._version = role_menus.version
+            self.rebuilds += 1
+        return self._index
+
+    def lookup(self, message_id: int, key: str) -> Optional[tuple]:
+        return self._current().get((message_id, key))
+
+    def __len__(self):
+        return len(self._current())
+
+def binding_key(binding: RoleBinding) -> str:
+    return f"button:{binding.role_id}" if binding.style == "button" else emoji_key(binding.emoji)
+
+class RoleEditQueue:
+    """
+    Applies self-assigned role changes one member edit at a time per guild.
+
+    Changes wait ROLE_EDIT_MERGE_WINDOW seconds in a per-member map of
+    role_id -> wanted before each batch, so a user toggling a role on and off
+    again costs nothing and several roles picked together cost one edit. Each
+    guild's worker is paced by its own token bucket.
+
+    An edit sends the member's whole role list, built from their roles at
+    apply time. Until the gateway's member update for an edit reaches the
+    cache, the roles that edit set stand in for the cached ones, so a second
+    edit right behind it doesn't undo it; the first update clears them, so
+    changes made by anyone else are never overwritten.
+    """
+
+    def __init__(self):
+        self._pending = {}  # guild_id -> {member_id: {role_id: wanted}}, waiting for the next batch
+        self._batches = {}  # guild_id -> the batch being applied
+        self._applied = {}  # (guild_id, member_id) -> (monotonic time, role IDs our last edit set)
+        self._workers = {}
+        self._limiters = {}
+        self.requested = 0
+        self.edits = 0
+
+    def wanted(self, guild_id: int, member_id: int, role_id: int) -> Optional[bool]:
+        """A change still waiting for this member and role, if any"""
+        for changes in (self._pending.get(guild_id, {}), self._batches.get(guild_id, {})):
+            wanted = changes.get(member_id, {}).get(role_id)
+            if wanted is not None:
+                return wanted
+        return None
+
+    def request(self, guild: discord.Guild, member_id: int, role_id: int, wanted: bool):
+        self.requested += 1
+        self._pending.setdefault(guild.id, {}).setdefault(member_id, {})[role_id] = wanted
+        if guild.id not in self._workers:
+            self._workers[guild.id] = asyncio.get_running_loop().create_task(self._drain(guild))
+
+    def member_updated(self, member: discord.Member):
+        """The cache now reflects our edits to this member"""
+        self._applied.pop((member.guild.id, member.id), None)
+
+    async def _drain(self, guild: discord.Guild):
+        limiter = self._limiters.get(guild.id)
+        if limiter is None:
+            limiter = self._limiters[guild.id] = RateLimiter(ROLE_EDIT_RATE, int(ROLE_EDIT_RATE))
+        try:
+            while guild.id in self._pending:
+                await asyncio.sleep(ROLE_EDIT_MERGE_WINDOW)
+                batch = self._batches[guild.id] = self._pending.pop(guild.id)
+                while batch:
+                    member_id = next(iter(batch))
+                    changes = batch[member_id]
+                    try:
+                        await self._apply(guild, member_id, changes, limiter)
+                    except discord.HTTPException as e:
+                        moderation_log.warning("Role menu edit failed", extra={'guild': guild.id, 'user': member_id, 'error': e})
+                    except Exception:
+                        moderation_log.exception("Role menu edit failed", extra={'guild': guild.id, 'user': member_id})
+                    del batch[member_id]
+        finally:
+            del self._workers[guild.id]
+            self._batches.pop(guild.id, None)
+            self._limiters.pop(guild.id, None)
+            now = time.monotonic()
+            for key in [key for key, (applied_at, _) in self._applied.items() if now - applied_at > ROLE_EDIT_OVERLAY_TTL]:
+                del self._applied[key]
+
+    async def _apply(self, guild: discord.Guild, member_id: int, changes: dict, limiter: RateLimiter):
+        member = guild.get_member(member_id)
+        key = (guild.id, member_id)
+        if member is None:
+            self._applied.pop(key, None)  # Fetched members are current
+            try:
+                member = await guild.fetch_member(member_id)
+            except discord.NotFound:
+                return
+        applied = self._applied.get(key)
+        if applied is not None and time.monotonic() - applied[0] <= ROLE_EDIT_OVERLAY_TTL:
+            current = applied[1]
+        else:
+            current = {role.id for role in member.roles}
+        roles = (current | {role_id for role_id, wanted in changes.items() if wanted}) - {
+            role_id for role_id, wanted in changes.items() if not wanted
+        }
+        if roles == current:
+            return
+        await limiter.acquire()
+        # One PATCH with the full role list, instead of one request per role
+        await member.edit(
+            roles=[discord.Object(role_id) for role_id in roles if role_id != guild.id],
+            reason="Self-assigned role menu"
         )
-    
-    embed.set_footer(text="Nexus Esports Social Tracker")
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+        self._applied[key] = (time.monotonic(), roles)
+        self.edits += 1
 
-@bot.tree.command(name="remove-social-tracker", description="Remove a social media tracker")
-@app_commands.describe(index="Tracker number to remove (see /list-social-trackers)")
-async def remove_social_tracker(interaction: discord.Interaction, index: int):
-    """Remove social tracker"""
-    if not interaction.user.guild_permissions.manage_guild:
-        return await interaction.response.send_message(
+role_menu_index = RoleMenuIndex()
+role_edits = RoleEditQueue()
+
+async def on_role_reaction(payload: discord.RawReactionActionEvent, wanted: bool):
+    if payload.guild_id is None or payload.user_id == bot.user.id:
+        return
+    binding = role_menu_index.lookup(payload.message_id, emoji_key(payload.emoji))
+    if binding is None:
+        return
+    guild = bot.get_guild(payload.guild_id)
+    if guild is not None and binding[0] == guild.id:
+        role_edits.request(guild, payload.user_id, binding[1], wanted)
+
+@bot.event
+async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
+    await on_role_reaction(payload, True)
+
+@bot.event
+async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
+    await on_role_reaction(payload, False)
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    role_edits.member_updated(after)
+
+class RoleButton(discord.ui.DynamicItem[discord.ui.Button], template=r"rolemenu:(?P<role>\d+)"):
+    """Toggles a role; the role ID is in the custom ID, so buttons keep working after a restart"""
+
+    def __init__(self, role_id: int, label: Optional[str] = None, emoji: Optional[str] = None):
+        super().__init__(discord.ui.Button(
+            label=label,
+            emoji=emoji,
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"rolemenu:{role_id}"
+        ))
+        self.role_id = role_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['role']), item.label, item.emoji)
+
+    async def callback(self, interaction: discord.Interaction):
+        binding = role_menu_index.lookup(interaction.message.id, f"button:{self.role_id}")
+        role = interaction.guild.get_role(self.role_id) if interaction.guild else None
+        if binding is None or role is None:
+            return await interaction.response.send_message(
+                embed=create_embed(
+                    title="❌ Role Unavailable",
+                    description="This role menu entry was removed",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+        pending = role_edits.wanted(interaction.guild.id, interaction.user.id, role.id)
+        has_role = pending if pending is not None else interaction.user.get_role(role.id) is not None
+        role_edits.request(interaction.guild, interaction.user.id, role.id, not has_role)
+        await interaction.response.send_message(
             embed=create_embed(
-                title="❌ Permission Denied",
-                description="You need 'Manage Server' permission",
-                color=discord.Color.red()
+                title="✅ Role Removed" if has_role else "✅ Role Added",
+                description=f"{'Removing' if has_role else 'Giving you'} {role.mention}",
+                color=discord.Color.green()
             ),
             ephemeral=True
         )
+
+bot.add_dynamic_items(RoleButton)
+
+def role_buttons_view(bindings) -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    for binding in bindings:
+        if binding.style == "button":
+            view.add_item(RoleButton(binding.role_id, binding.label, binding.emoji))
+    return view
+
+async def refresh_role_buttons(channel, message_id: int):
+    """Re-render a bot-owned menu message's buttons from its bindings"""
+    bindings = [
+        binding for binding in role_menus.get(str(channel.guild.id), ())
+        if binding.message_id == message_id
+    ]
+    await send_queue.call(
+        channel,
+        PRIORITY_MODERATION,
+        lambda: channel.get_partial_message(message_id).edit(view=role_buttons_view(bindings))
+    )
+
+role_menu_group = app_commands.Group(name="rolemenu", description="Self-assign roles with reactions or buttons")
+
+def manage_roles_denied() -> dict:
+    return dict(
+        embed=create_embed(
+            title="❌ Permission Denied",
+            description="You need 'Manage Roles' permission",
+            color=discord.Color.red()
+        ),
+        ephemeral=True
+    )
+
+def role_menu_error(title: str, description: str) -> dict:
+    return dict(embed=create_embed(title=f"❌ {title}", description=description, color=discord.Color.red()), ephemeral=True)
+
+@role_menu_group.command(name="post", description="Post a role menu message to add buttons to (Mods only)")
+@app_commands.describe(channel="Where to post the menu", title="Menu title", description="Text above the buttons")
+async def role_menu_post(interaction: discord.Interaction, channel: discord.TextChannel,
+                         title: app_commands.Range[str, 1, 256],
+                         description: Optional[app_commands.Range[str, 1, 2000]] = None):
+    if not interaction.user.guild_permissions.manage_roles:
+        return await interaction.response.send_message(**manage_roles_denied())
+    message = await send_queue.send(
+        channel,
+        PRIORITY_MODERATION,
+        embed=create_embed(title=f"🎭 {title}", description=description or "Pick your roles below", color=discord.Color.blurple())
+    )
+    await interaction.response.send_message(
+        embed=create_embed(
+            title="✅ Role Menu Posted",
+            description=f"[Menu]({message.jump_url}) posted in {channel.mention}.\nAdd roles with `/rolemenu add message_id:{message.id}`",
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
+
+@role_menu_group.command(name="add", description="Let members assign a role from a message (Mods only)")
+@app_commands.describe(
+    message_id="Message to attach the role to (reactions work on any message, buttons only on the bot's)",
+    role="Role to hand out",
+    style="React with an emoji, or click a button",
+    emoji="Emoji to react with (required for reactions, optional on buttons)",
+    label="Button text",
+    channel="Channel of the message (defaults to this one)"
+)
+@app_commands.choices(style=[
+    app_commands.Choice(name="Button", value="button"),
+    app_commands.Choice(name="Reaction", value="reaction")
+])
+@deferred()
+async def role_menu_add(interaction: discord.Interaction, message_id: str, role: discord.Role, style: str = "button",
+                        emoji: Optional[str] = None, label: Optional[app_commands.Range[str, 1, 80]] = None,
+                        channel: Optional[discord.TextChannel] = None):
+    if not interaction.user.guild_permissions.manage_roles:
+        return await send_response(interaction, **manage_roles_denied())
+    if role.is_default() or role.managed or not role.is_assignable():
+        return await send_response(interaction, **role_menu_error(
+            "Role Not Assignable", f"{role.mention} is managed by an integration or above the bot's highest role"
+        ))
+    if role >= interaction.user.top_role and interaction.user != interaction.guild.owner:
+        return await send_response(interaction, **role_menu_error(
+            "Role Too High", "You can only hand out roles below your highest role"
+        ))
+    if style == "reaction" and not emoji:
+        return await send_response(interaction, **role_menu_error("Emoji Needed", "Reaction roles need an emoji"))
+    
+    channel = channel or interaction.channel
+    try:
+        message = await channel.fetch_message(int(message_id))
+    except (ValueError, discord.NotFound):
+        return await send_response(interaction, **role_menu_error("Message Not Found", f"No message `{message_id}` in {channel.mention}"))
+    except discord.Forbidden:
+        return await send_response(interaction, **role_menu_error(
+            "Can't Read Channel", f"The bot needs View Channel and Read Message History in {channel.mention}"
+        ))
+    except discord.HTTPException as e:
+        return await send_response(interaction, **role_menu_error("Couldn't Fetch Message", f"Error: {e}"))
     
     guild_id = str(interaction.guild.id)
-    trackers = social_trackers.get(guild_id, [])
+    bindings = [binding for binding in role_menus.get(guild_id, ()) if binding.message_id == message.id]
+    if style == "button" and not (label or emoji):
+        label = role.name[:80]
+    binding = RoleBinding(role.id, channel.id, message.id, style, emoji, label if style == "button" else None)
+    if any(binding_key(existing) == binding_key(binding) for existing in bindings):
+        return await send_response(interaction, **role_menu_error(
+            "Already Bound", "That emoji or role already has a binding on this message"
+        ))
+    if style == "button":
+        if message.author != bot.user:
+            return await send_response(interaction, **role_menu_error(
+                "Not the Bot's Message", "Buttons can only go on the bot's own messages; post one with `/rolemenu post`"
+            ))
+        if sum(existing.style == "button" for existing in bindings) >= ROLE_BUTTONS_PER_MESSAGE:
+            return await send_response(interaction, **role_menu_error(
+                "Menu Full", f"A message holds at most {ROLE_BUTTONS_PER_MESSAGE} buttons"
+            ))
     
-    if index < 1 or index > len(trackers):
-        return await interaction.response.send_message(
-            embed=create_embed(
-                title="❌ Invalid Index",
-                description="Please use a valid tracker number",
-                color=discord.Color.red()
+    try:
+        if style == "reaction":
+            await message.add_reaction(emoji)
+        role_menus.update(guild_id, lambda entries: entries.append(binding), default=list)
+        if style == "button":
+            await refresh_role_buttons(channel, message.id)
+    except discord.HTTPException as e:
+        role_menus.update(guild_id, lambda entries: entries.remove(binding) if binding in entries else None, default=list)
+        return await send_response(interaction, **role_menu_error("Couldn't Add Role", f"Error: {e}"))
+    
+    await send_response(
+        interaction,
+        embed=create_embed(
+            title="✅ Role Menu Updated",
+            description=(
+                f"{'Reacting with ' + emoji if style == 'reaction' else 'Clicking the button'} on "
+                f"[this message]({message.jump_url}) now toggles {role.mention}"
             ),
-            ephemeral=True
-        )
+            color=discord.Color.green()
+        ),
+        ephemeral=True
+    )
+
+@role_menu_group.command(name="remove", description="Stop handing out a role from a message (Mods only)")
+@app_commands.describe(message_id="Message the role is attached to", role="Role to remove from the menu")
+@deferred()
+async def role_menu_remove(interaction: discord.Interaction, message_id: str, role: discord.Role):
+    if not interaction.user.guild_permissions.manage_roles:
+        return await send_response(interaction, **manage_roles_denied())
     
-    removed = trackers.pop(index-1)
-    if trackers:
-        social_trackers[guild_id] = trackers
-    else:
-        del social_trackers[guild_id]
-    save_social_trackers()
+    def remove(entries):
+        removed = [entry for entry in entries if str(entry.message_id) == message_id and entry.role_id == role.id]
+        entries[:] = [entry for entry in entries if entry not in removed]
+        return removed
+    removed = role_menus.update(str(interaction.guild.id), remove, default=list)
+    if not removed:
+        return await send_response(interaction, **role_menu_error(
+            "Not Found", f"{role.mention} isn't on message `{message_id}`"
+        ))
     
+    channel = interaction.guild.get_channel(removed[0].channel_id)
+    if channel:
+        try:
+            if any(binding.style == "button" for binding in removed):
+                await refresh_role_buttons(channel, removed[0].message_id)
+            for binding in removed:
+                if binding.style == "reaction":
+                    await channel.get_partial_message(binding.message_id).clear_reaction(binding.emoji)
+        except discord.HTTPException:
+            pass  # The binding is gone either way; a stale button answers "removed"
+    await send_response(
+        interaction,
+        embed=create_embed(title="✅ Role Menu Updated", description=f"{role.mention} removed from the menu", color=discord.Color.green()),
+        ephemeral=True
+    )
+
+@role_menu_group.command(name="list", description="Show this server's self-assign roles")
+async def role_menu_list(interaction: discord.Interaction):
+    bindings = role_menus.get(str(interaction.guild.id), ())
+    lines = [
+        f"<@&{binding.role_id}> • {binding.emoji + ' ' if binding.emoji else ''}{binding.style} on "
+        f"https://discord.com/channels/{interaction.guild.id}/{binding.channel_id}/{binding.message_id}"
+        for binding in bindings[:25]
+    ]
+    if len(bindings) > 25:
+        lines.append(f"…and {len(bindings) - 25} more")
     await interaction.response.send_message(
         embed=create_embed(
-            title="✅ Tracker Removed",
-            description=f"No longer tracking **{removed['account_name']}**",
-            color=discord.Color.green()
+            title=f"🎭 Role Menus ({len(bindings)})",
+            description="\n".join(lines) or "None yet. Start with `/rolemenu post` or `/rolemenu add`.",
+            color=discord.Color.blue()
         ),
         ephemeral=True
     )
 
+bot.tree.add_command(role_menu_group)
+
 @bot.event
 async def on_guild_join(guild):
     """Handle joining new servers"""
-    print(f"✅ Joined new server: {guild.name} (ID: {guild.id})")
-    # Initialize default config for new server
-    guild_id = str(guild.id)
-    if guild_id not in guild_configs:
-        guild_configs[guild_id] = {}
-        save_config()
-    
+    log.info("Joined new server: %s", guild.name, extra={'guild': guild.id})
     # Sync commands for this new server
     try:
         await bot.tree.sync(guild=guild)
-        print(f"✅ Synced commands for {guild.name}")
+        log.info("Synced commands for %s", guild.name, extra={'guild': guild.id})
     except Exception as e:
-        print(f"❌ Failed to sync commands for {guild.name}: {e}")
+        log.error("Failed to sync commands for %s", guild.name, extra={'guild': guild.id, 'error': e})
 
 
 @bot.event
 async def on_guild_remove(guild):
     """Handle leaving servers"""
-    print(f"❌ Left server: {guild.name} (ID: {guild.id})")
+    log.info("Left server: %s", guild.name, extra={'guild': guild.id})
     # Clean up config
     guild_id = str(guild.id)
-    if guild_id in guild_configs:
-        del guild_configs[guild_id]
-        save_config()
+    guild_configs.remove(guild_id)
     # Clean up social trackers
-    if guild_id in social_trackers:
-        del social_trackers[guild_id]
-        save_social_trackers()
+    social_trackers.remove(guild_id)
+    tournaments.remove(guild_id)
+    auto_responses.remove(guild_id)
+    announcements.remove(guild_id)
+    role_menus.remove(guild_id)
+    # The scheduler skips heap entries whose job is gone
+    for job in [job for job in scheduled_announcements.values() if job['guild_id'] == guild_id]:
+        scheduled_announcements.remove(job['id'])
+    ticket_relay.forget(guild_id)
+    auto_responder.forget(guild_id)
+    activity.forget(guild_id)
 
-try:
-    bot.run(token)
-except discord.PrivilegedIntentsRequired:
-    print("\n❌ PRIVILEGED INTENTS REQUIRED ❌")
-    print("1. Go to https://discord.com/developers/applications")
-    print("2. Select your application")
-    print("3. Navigate to Bot > Privileged Gateway Intents")
-    print("4. ENABLE 'MESSAGE CONTENT INTENT' and 'SERVER MEMBERS INTENT'")
-    print("5. Save changes and restart your bot\n")
-except discord.LoginFailure:
-    print("❌ Invalid token. Check your DISCORD_TOKEN")
-except Exception as e:
-    print(f"❌ Unexpected error: {e}")
+def profiled(func, profiles: list):
+    """Profile each call of func in whichever thread runs it"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        return profile.runcall(func, *args, **kwargs)
+    return wrapper
+
+SWEEP_STUB_ENDPOINT = "http://127.0.0.1:8765"  # benchmarks/stubs.py's default address
+
+def sweep_cli(argv: list) -> int:
+    """`python main.py sweep`: run one tracker sweep from the trackers file without connecting to Discord"""
+    parser = argparse.ArgumentParser(
+        prog="main.py sweep",
+        description="Run one social tracker sweep without a Discord connection. Nothing is posted to Discord."
+    )
+    parser.add_argument("--dry-run", action="store_true",
+                        help=f"don't save anything, and poll the stub at {SWEEP_STUB_ENDPOINT} unless --live is given")
+    parser.add_argument("--file", default=SOCIAL_FILE, help=f"trackers file to sweep (default {SOCIAL_FILE})")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--endpoint", metavar="URL",
+                        help="poll a stub server instead of YouTube and the scraped platforms, e.g. benchmarks/stubs.py")
+    target.add_argument("--live", action="store_true",
+                        help="with --dry-run, poll the real platforms and spend real YouTube quota")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="PATH",
+                        help="profile the sweep with cProfile; prints the top functions, or saves pstats to PATH")
+    parser.add_argument("--top", type=int, default=25, help="functions to print with --profile (default 25)")
+    args = parser.parse_args(argv)
+
+    if args.file != social_trackers.path:
+        social_trackers.path = args.file
+        social_trackers.load()
+    if args.dry_run and not (args.endpoint or args.live):
+        args.endpoint = SWEEP_STUB_ENDPOINT
+        print(f"Dry run: polling the stub at {SWEEP_STUB_ENDPOINT} (python benchmarks/stubs.py); pass --live for the real platforms")
+    if args.dry_run or args.endpoint:
+        # Count the units spent without writing them to the quota file
+        youtube_quota.usage.path = None
+    if args.endpoint:
+        for provider in PLATFORM_PROVIDERS.values():
+            provider.redirect(args.endpoint.rstrip("/"))
+
+    report = SweepReport()
+    profiler = cProfile.Profile() if args.profile else None
+    thread_profiles = []
+    if profiler:
+        # Fetches run in worker threads, which the main thread's profiler doesn't see
+        for provider in PLATFORM_PROVIDERS.values():
+            provider.fetch_counts = profiled(provider.fetch_counts, thread_profiles)
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    asyncio.run(check_social_updates(report=report, dry_run=args.dry_run))
+    if profiler:
+        profiler.disable()
+    report.wall = time.perf_counter() - started
+    if not args.dry_run:
+        social_trackers.flush()
+    report.print(args.dry_run)
+
+    if profiler:
+        stats = pstats.Stats(profiler)
+        for profile in thread_profiles:
+            stats.add(profile)
+        if args.profile == "-":
+            stats.strip_dirs().sort_stats("cumulative").print_stats(args.top)
+        else:
+            stats.dump_stats(args.profile)
+            print(f"✅ Profile saved to {args.profile} (python -m pstats {args.profile})")
+    return 1 if report.errors else 0
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["sweep"]:
+        sys.exit(sweep_cli(sys.argv[2:]))
+
+    if not token:
+        print("❌ CRITICAL ERROR: Missing DISCORD_TOKEN")
+        exit(1)
+
+    try:
+        bot.run(token, log_handler=None)  # discord.py logs through setup_logging()
+    except discord.PrivilegedIntentsRequired:
+        print("\n❌ PRIVILEGED INTENTS REQUIRED ❌")
+        print("1. Go to https://discord.com/developers/applications")
+        print("2. Select your application")
+        print("3. Navigate to Bot > Privileged Gateway Intents")
+        print("4. ENABLE 'MESSAGE CONTENT INTENT' and 'SERVER MEMBERS INTENT'")
+        print("5. Save changes and restart your bot\n")
+    except discord.LoginFailure:
+        print("❌ Invalid token. Check your DISCORD_TOKEN")
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+    finally:
+        if hasattr(bot, 'loop_watchdog'):
+            bot.loop_watchdog.stop()
+        # Counts since the last periodic flush
+        activity.flush()
+        activity_store.flush()
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main keeps its JSON stores in the working directory, so import it somewhere disposable
+os.chdir(tempfile.mkdtemp(prefix="nexus-tests-"))
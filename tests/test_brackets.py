@@ -0,0 +1,80 @@
+from collections import Counter
+
+import pytest
+
+import main
+
+
+def play(matches):
+    """Decide every playable match in favour of the better seed; returns losses per player"""
+    losses = Counter()
+    while True:
+        playable = [
+            match for match in matches
+            if match.winner is None and None not in match.players and main.BYE not in match.players
+        ]
+        if not playable:
+            return losses
+        match = playable[0]
+        winner, loser = sorted(match.players)
+        losses[loser] += 1
+        main.decide_match(matches, match.id, winner)
+
+
+def test_seed_order():
+    assert main.seed_order(2) == [1, 2]
+    assert main.seed_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+    for size in (4, 16, 32):
+        order = main.seed_order(size)
+        assert sorted(order) == list(range(1, size + 1))
+        # Every first-round pairing adds up to size + 1
+        assert {order[index] + order[index + 1] for index in range(0, size, 2)} == {size + 1}
+
+
+@pytest.mark.parametrize("count", [2, 3, 5, 8, 13])
+def test_single_elimination(count):
+    players = list(range(1, count + 1))
+    matches = main.build_bracket(players, double_elimination=False)
+    size = 1 << (count - 1).bit_length()
+    assert len(matches) == size - 1
+
+    losses = play(matches)
+    final = matches[-1]
+    assert final.winner_to is None
+    assert final.winner == 1
+    assert set(losses) == set(players) - {1}
+    assert set(losses.values()) == {1}
+    assert all(match.winner is not None for match in matches)
+
+
+def test_byes_advance_top_seeds():
+    matches = main.build_bracket([1, 2, 3, 4, 5], double_elimination=False)
+    first_round = [match for match in matches if match.round == 1]
+    byes = [match for match in first_round if main.BYE in match.players]
+    assert len(byes) == 3
+    assert {match.winner for match in byes} == {1, 2, 3}
+    assert {match.players for match in first_round if match not in byes} == {(4, 5)}
+
+
+@pytest.mark.parametrize("count", [2, 4, 6, 8, 16])
+def test_double_elimination(count):
+    players = list(range(1, count + 1))
+    matches = main.build_bracket(players, double_elimination=True)
+    assert matches[-1].bracket == "F"
+
+    losses = play(matches)
+    assert matches[-1].winner == 1
+    assert 1 not in losses
+    # Everyone else is knocked out on their second loss
+    assert {player: losses[player] for player in players[1:]} == dict.fromkeys(players[1:], 2)
+
+
+def test_decide_match_moves_winner_and_loser():
+    matches = main.build_bracket([1, 2, 3, 4], double_elimination=True)
+    match = matches[0]
+    assert match.players == (1, 4)
+    main.decide_match(matches, match.id, 4)
+    winner_match, winner_slot = match.winner_to
+    loser_match, loser_slot = match.loser_to
+    assert matches[winner_match].players[winner_slot] == 4
+    assert matches[loser_match].players[loser_slot] == 1
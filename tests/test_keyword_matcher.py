@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+import main
+
+
+def naive_find(patterns, text):
+    return {
+        (index, start, start + len(pattern))
+        for index, pattern in enumerate(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    }
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_naive_search(seed):
+    rng = random.Random(seed)
+    alphabet = "abc "
+    patterns = ["".join(rng.choices(alphabet, k=rng.randint(1, 5))) for _ in range(rng.randint(1, 30))]
+    text = "".join(rng.choices(alphabet, k=300))
+    found = list(main.KeywordMatcher(patterns).find(text))
+    assert len(found) == len(set(found))
+    assert set(found) == naive_find(patterns, text)
+    assert [end for _, _, end in found] == sorted(end for _, _, end in found)
+
+
+def test_overlapping_and_duplicate_patterns():
+    patterns = ["he", "she", "his", "hers", "he"]
+    found = set(main.KeywordMatcher(patterns).find("ushers"))
+    assert found == {(1, 1, 4), (0, 2, 4), (4, 2, 4), (3, 2, 6)}
+
+
+def test_no_patterns():
+    assert list(main.KeywordMatcher([]).find("anything")) == []
@@ -0,0 +1,43 @@
+import random
+
+import main
+
+
+def check(counter):
+    scores = [score for _, score in counter.top(len(counter))]
+    assert scores == sorted(scores, reverse=True)
+    for user_id, score in counter.scores.items():
+        assert counter.rank(user_id) == 1 + sum(other > score for other in counter.scores.values())
+        assert counter.order[counter.position[user_id]] == user_id
+
+
+def test_initial_scores_are_ranked():
+    counter = main.RankedCounter({"a": 3, "b": 7, "c": 3, "d": 1})
+    assert counter.top(1) == [("b", 7)]
+    assert counter.rank("b") == 1
+    assert counter.rank("a") == counter.rank("c") == 2
+    assert counter.rank("d") == 4
+    assert counter.rank("missing") is None
+    check(counter)
+
+
+def test_increments_keep_order():
+    rng = random.Random(7)
+    counter = main.RankedCounter({str(user): rng.randint(0, 5) for user in range(20)})
+    expected = dict(counter.scores)
+    for _ in range(2000):
+        user_id = str(rng.randint(0, 40))
+        expected[user_id] = expected.get(user_id, 0) + 1
+        assert counter.increment(user_id) == expected[user_id]
+    assert counter.scores == expected
+    check(counter)
+
+
+def test_new_user_joins_at_the_bottom():
+    counter = main.RankedCounter({"a": 2})
+    assert counter.increment("b") == 1
+    assert counter.top(5) == [("a", 2), ("b", 1)]
+    counter.increment("b")
+    counter.increment("b")
+    assert counter.top(5) == [("b", 3), ("a", 2)]
+    assert counter.top(1, offset=1) == [("a", 2)]
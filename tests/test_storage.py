@@ -0,0 +1,102 @@
+import json
+
+import main
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "store.json")
+    store = main.VersionedStore(path, "test")
+    store.update("1", lambda entry: entry.update(name="alpha", tags=["a", "b"]))
+    store.swap("2", lambda _: {"name": "beta"})
+    store.flush()
+
+    reloaded = main.VersionedStore(path, "test")
+    reloaded.load()
+    assert reloaded.get("1") == {"name": "alpha", "tags": ("a", "b")}
+    assert reloaded.get("2") == {"name": "beta"}
+    assert json.loads((tmp_path / "store.json").read_text()) == {
+        "1": {"name": "alpha", "tags": ["a", "b"]},
+        "2": {"name": "beta"},
+    }
+
+
+def test_removing_entries(tmp_path):
+    path = str(tmp_path / "store.json")
+    store = main.VersionedStore(path, "test")
+    store.replace({"1": {"a": 1}, "2": {"b": 2}, "3": {"c": 3}})
+    store.swap("1", lambda _: None)
+    store.update("2", lambda entry: entry.clear())
+    assert store.remove("3")
+    assert not store.remove("3")
+    store.flush()
+
+    reloaded = main.VersionedStore(path, "test")
+    reloaded.load()
+    assert len(reloaded) == 0
+
+
+def test_snapshots_are_immutable(tmp_path):
+    store = main.VersionedStore(str(tmp_path / "store.json"), "test")
+    store.replace({"1": {"a": [1]}})
+    snapshot = store.snapshot()
+    version = store.version
+    store.update("1", lambda entry: entry["a"].append(2))
+    assert snapshot["1"]["a"] == (1,)
+    assert store.get("1")["a"] == (1, 2)
+    assert store.version == version + 1
+
+
+def test_reload_if_changed_picks_up_hand_edits(tmp_path):
+    path = tmp_path / "store.json"
+    store = main.VersionedStore(str(path), "test")
+    store.replace({"1": {"a": 1}})
+    store.flush()
+    assert not store.reload_if_changed()
+
+    path.write_text(json.dumps({"1": {"a": 2}, "extra": {}}))
+    assert store.reload_if_changed()
+    assert store.get("1") == {"a": 2}
+
+
+def test_memory_only_store_never_writes(tmp_path):
+    store = main.VersionedStore(None, "test")
+    store.update("1", lambda entry: entry.update(a=1))
+    store.flush()
+    assert store.get("1") == {"a": 1}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_legacy_trackers_get_ids(tmp_path):
+    path = tmp_path / "social_trackers.json"
+    legacy = {"platform": "youtube", "url": "https://youtube.com/channel/UCa", "channel_id": "UCa",
+              "account_name": "a", "last_count": 10, "post_channel": "5"}
+    path.write_text(json.dumps({
+        "1": [legacy, dict(legacy, id=4, channel_id="UCb"), dict(legacy, channel_id="UCc")],
+        "2": [{"platform": "instagram", "url": "https://instagram.com/b/", "account_name": "b", "post_channel": "6"}],
+    }))
+    store = main.VersionedStore(str(path), "social trackers", decode=main.decode_trackers, encode=main.encode_trackers)
+    store.load()
+
+    trackers = store.get("1")
+    assert [tracker.id for tracker in trackers] == [5, 4, 6]
+    assert [tracker.account_id for tracker in trackers] == ["UCa", "UCb", "UCc"]
+    assert trackers[0].platform is main.Platform.YOUTUBE
+    assert trackers[0].post_channel == 5
+    assert not trackers[0].upload_alerts
+    instagram = store.get("2")[0]
+    assert (instagram.id, instagram.account_id, instagram.last_count) == (1, "b", 0)
+
+    store.update("1", lambda trackers: None)  # Write the migrated form back
+    store.flush()
+    saved = json.loads(path.read_text())
+    assert [tracker["id"] for tracker in saved["1"]] == [5, 4, 6]
+    assert saved["1"][0]["upload_alerts"] is False
+
+
+def test_tracker_dict_round_trip():
+    tracker = main.Tracker(
+        id=3, platform=main.Platform.YOUTUBE, account_id="UCx", account_name="x", url="https://youtube.com/@x",
+        post_channel=7, last_count=42, upload_alerts=True, last_video_published="2024-01-01T00:00:00+00:00",
+        last_live_id="abc"
+    )
+    assert main.Tracker.from_dict(tracker.to_dict()) == tracker